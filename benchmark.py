@@ -0,0 +1,173 @@
+# Libraries
+import os
+import sys
+import time
+import random
+import datetime
+import tempfile
+import tracemalloc
+
+from storage import Event, TextStorage, JournaledStorage, BinaryStorage, SQLiteStorage
+from core import ScheduleStore, TaskStore
+
+class Benchmark:
+    """
+    Class for the benchmark of the storage backends
+
+    Generates synthetic schedules and reports the time to save, load in full or for a window of days, record a change, and query each, and the memory and disk space used
+    """
+    def __init__(self, sizes, seed=0):
+        """
+        Initializes the Benchmark class
+
+        sizes: Numbers of event series to generate, list of ints
+        seed: Seed of the generated schedules, int
+        """
+        self._sizes = sizes
+        self._seed = seed
+
+        # Schedule whose calendar gives the occurrences of the generated series, as monthly and yearly series follow the calendar
+        self._calendar = ScheduleStore()
+
+        # Number of changes recorded and week queries made for each backend
+        self._number_changes = 100
+        self._number_queries = 1000
+
+    def run(self):
+        """
+        Runs the benchmark for each size and backend, printing one line per backend
+        """
+        print('events'.rjust(9) + 'backend'.rjust(11) + 'save (s)'.rjust(10) + 'load (s)'.rjust(10) + 'window (s)'.rjust(12) + 'change (ms)'.rjust(13) + 'query (ms)'.rjust(12) + 'memory (MB)'.rjust(13) + 'disk (MB)'.rjust(11))
+
+        for size in self._sizes:
+            events, tasks = self._generate(size)
+
+            for backend in ('text', 'journaled', 'binary', 'sqlite'):
+                with tempfile.TemporaryDirectory() as directory:
+                    results = self._measure(backend, directory, events, tasks)
+
+                print(str(size).rjust(9) + backend.rjust(11) + ''.join(format(result, '.3f').rjust(width) for result, width in zip(results, (10, 10, 12, 13, 12, 13, 11))))
+
+    def _generate(self, size):
+        """
+        Generates a synthetic schedule and to-do list
+
+        size: Number of event series, int
+        return: Tuple, (event series, list of Event, tasks, list of tuples, (completion, description))
+        """
+        generator = random.Random(self._seed)
+        first_day = datetime.date(2024, 1, 1).toordinal()
+        events = []
+
+        for i in range(size):
+            frequency = generator.choices(('none', 'daily', 'weekly', 'monthly', 'yearly'), weights=(80, 5, 8, 4, 3))[0]
+            amount = 1 if frequency == 'none' else generator.randrange(1, 11)
+            date = first_day + generator.randrange(10 * 365)
+            skips_occurrence = amount > 2 and generator.random() < 0.2
+            event = Event(str(i + 1), date, generator.randrange(0, 24 * 60, 5), generator.randrange(0, 180, 15), generator.getrandbits(24), 'event ' + str(i), frequency=frequency, amount=amount)
+
+            # Some series skip their second occurrence
+            if skips_occurrence:
+                event.exceptions.update(self._calendar.occurrences(event, date + 1, datetime.date.max.toordinal() + 1)[:1])
+
+            events.append(event)
+
+        tasks = [(str(generator.randrange(2)), 'task ' + str(i)) for i in range(max(1, size // 100))]
+
+        return (events, tasks)
+
+    def _open(self, backend, directory):
+        """
+        Opens a backend storing its files in the given directory
+
+        backend: Either the strings 'text', 'journaled', 'binary', or 'sqlite'
+        directory: Directory of the files, string
+        return: Storage
+        """
+        if backend == 'text':
+            return TextStorage(os.path.join(directory, 'schedule.txt'), os.path.join(directory, 'tasks.txt'), os.path.join(directory, 'schedule_index.bin'))
+        elif backend == 'journaled':
+            return JournaledStorage(os.path.join(directory, 'schedule.txt'), os.path.join(directory, 'tasks.txt'), os.path.join(directory, 'schedule_journal.txt'), os.path.join(directory, 'tasks_journal.txt'), os.path.join(directory, 'schedule_index.bin'))
+        elif backend == 'binary':
+            return BinaryStorage(os.path.join(directory, 'schedule.bin'), os.path.join(directory, 'tasks.bin'))
+        else:
+            return SQLiteStorage(os.path.join(directory, 'hourglass.db'))
+
+    def _measure(self, backend, directory, events, tasks):
+        """
+        Measures a backend
+
+        backend: Either the strings 'text', 'journaled', 'binary', or 'sqlite'
+        directory: Empty directory for the files of the backend, string
+        events: Event series, list of Event
+        tasks: Tasks, list of tuples, (completion, description)
+        return: Tuple of floats, (save seconds, load seconds, window load seconds, milliseconds per change, milliseconds per query, memory MB, disk MB)
+        """
+        storage = self._open(backend, directory)
+
+        start = time.perf_counter()
+        storage.write_schedule(events)
+        storage.write_tasks(tasks)
+        save = time.perf_counter() - start
+        storage.close()
+
+        # Load into a new storage, as the application does on startup
+        storage = self._open(backend, directory)
+        schedule = ScheduleStore()
+        to_do = TaskStore()
+        start = time.perf_counter()
+        schedule.read(storage)
+        to_do.read(storage)
+        load = time.perf_counter() - start
+        loaded = schedule.series()
+
+        # Backends not recording changes write everything for each change
+        changed = events[:self._number_changes]
+        start = time.perf_counter()
+
+        if storage.records_changes:
+            for event in changed:
+                event = event.copy()
+                event.description = event.description + ' (edited)'
+                storage.write_event(event)
+        else:
+            for event in changed[:3]:
+                storage.write_schedule(loaded)
+
+        change = (time.perf_counter() - start) * 1000 / (len(changed) if storage.records_changes else min(3, len(changed)))
+        storage.close()
+
+        # Load the events of half a year only, as the application does on startup when the backend supports it
+        storage = self._open(backend, directory)
+        start = time.perf_counter()
+        first_day = datetime.date(2024, 1, 1).toordinal() + 5 * 365
+        ScheduleStore().read(storage, first_day, first_day + 183)
+        window = time.perf_counter() - start
+        storage.close()
+
+        # Occurrences within weeks of the loaded schedule
+        generator = random.Random(self._seed)
+        start = time.perf_counter()
+
+        for _ in range(self._number_queries):
+            week_start = (datetime.date(2024, 1, 1).toordinal() + generator.randrange(10 * 365)) * 24 * 60
+            schedule.overlapping(week_start, week_start + 7 * 24 * 60)
+
+        query = (time.perf_counter() - start) * 1000 / self._number_queries
+
+        # Memory allocated while loading
+        storage = self._open(backend, directory)
+        tracemalloc.start()
+        ScheduleStore().read(storage)
+        TaskStore().read(storage)
+        memory = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+        storage.close()
+
+        disk = sum(entry.stat().st_size for entry in os.scandir(directory)) / 1e6
+
+        return (save, load, window, change, query, memory, disk)
+
+if __name__ == '__main__':
+    # Numbers of event series to benchmark, by default 10 thousand to 1 million
+    Benchmark([int(size) for size in sys.argv[1:]] or [10000, 100000, 1000000]).run()
@@ -0,0 +1,623 @@
+# Libraries
+import os
+import sys
+import shlex
+import argparse
+import datetime
+
+from storage import StorageError, TextStorage, BinaryStorage, StorageFiles
+from core import ScheduleStore, TaskStore
+from ical import ICalendar
+from snapshot import Snapshots
+
+class CommandLine:
+    """
+    Class for the command line interface of the Hourglass application
+
+    Adds, lists, queries, removes, and exports events and tasks without starting the GUI; the schedule and to-do list files are read once and written once per run
+    """
+    def __init__(self, file_location='', backend=None):
+        """
+        Initializes the CommandLine class
+
+        file_location: Directory of the schedule and to-do list files, string
+        backend: Storage of the schedule and to-do list, either the strings 'text', 'journaled', 'binary', or 'sqlite', or None for the one of the GUI
+        """
+        # Constants for time units
+        self._NUMBER_MINUTES_IN_HOUR = 60
+        self._NUMBER_DAYS_IN_WEEK = 7
+
+        # Largest number of occurrences of an event series, which schedule files store in three digits
+        self._MAXIMUM_AMOUNT = 999
+
+        # Location of the schedule and tasks files, and of the snapshots, opened the same way as by the GUI
+        self._file_location = file_location
+        self._storage_files = StorageFiles(file_location, backend)
+        self._snapshot_directory_name = 'snapshots'
+
+        self._parser = self._parser_setup()
+
+    def run(self, arguments, stdin=sys.stdin, stdout=sys.stdout):
+        """
+        Runs a command, or each command read from stdin for the batch command
+
+        arguments: Command line arguments, excluding the program name, list of strings
+        stdin: Input of the batch command, file
+        stdout: Output of the commands, file
+        return: Exit status, 0 on success, int
+        """
+        command = self._parser.parse_args(arguments)
+
+        if command.command == 'batch':
+            # Parse every line before changing anything, so that a batch is applied entirely or not at all
+            commands = []
+
+            for number, line in enumerate(stdin, 1):
+                if not line.strip() or line.lstrip().startswith('#'):
+                    continue
+
+                try:
+                    commands.append(self._parser.parse_args(shlex.split(line)))
+                except SystemExit:
+                    sys.stderr.write('hourglass: invalid command on line ' + str(number) + ' of batch.\n')
+                    return 2
+                except ValueError as error:
+                    sys.stderr.write('hourglass: invalid command on line ' + str(number) + ' of batch: ' + str(error) + '.\n')
+                    return 2
+
+                if commands[-1].command == 'batch':
+                    sys.stderr.write('hourglass: batches cannot be nested, line ' + str(number) + '.\n')
+                    return 2
+        else:
+            commands = [command]
+
+        try:
+            new = self._storage_files.new()
+            storage = self._storage_files.open()
+
+            # Changes are made in memory only, then written at once
+            schedule = ScheduleStore()
+            to_do = TaskStore()
+            self._storage_files.read(storage, schedule, to_do, new)
+            changed = False
+
+            for command in commands:
+                changed = command.function(schedule, to_do, command, stdout) or changed
+
+            if changed:
+                storage.write_schedule(schedule.series())
+                storage.write_tasks(to_do.tasks())
+
+            storage.close()
+        except StorageError as error:
+            sys.stderr.write('hourglass: ' + str(error) + '\n')
+            return 1
+        except LookupError as error:
+            sys.stderr.write('hourglass: ' + str(error.args[0]) + '\n')
+            return 1
+        except (OSError, ValueError) as error:
+            sys.stderr.write('hourglass: ' + str(error) + '\n')
+            return 1
+
+        return 0
+
+    def _parser_setup(self):
+        """
+        Sets up the parser of the commands
+
+        return: argparse.ArgumentParser
+        """
+        parser = argparse.ArgumentParser(prog='hourglass', description='calendar and to-do list; starts the GUI when no command is given.')
+        commands = parser.add_subparsers(dest='command', required=True)
+
+        # Events
+        add = commands.add_parser('add', help='add an event.')
+        add.add_argument('date', type=self._parse_date, help='date of the first occurrence, yyyy-mm-dd.')
+        add.add_argument('time', type=self._parse_time, help='start time, hh:mm.')
+        add.add_argument('duration', type=self._parse_time, help='duration, hh:mm.')
+        add.add_argument('description', help='event description.')
+        add.add_argument('--color', type=self._parse_color, default=0x808080, help='event color, #rrggbb.')
+        add.add_argument('--frequency', choices=['none', 'daily', 'weekly', 'monthly', 'yearly'], default='none', help='recurrence frequency.')
+        add.add_argument('--amount', type=self._parse_amount, default=1, help='number of occurrences, up to ' + str(self._MAXIMUM_AMOUNT) + ', 0 if not limited.')
+        add.add_argument('--until', type=self._parse_date, help='last day of the occurrences, yyyy-mm-dd.')
+        add.add_argument('--no-leap-years', dest='leap_years', action='store_false', help='space yearly occurrences 365 days apart.')
+        add.add_argument('--month-day', choices=['date', 'weekday', 'last_weekday', 'last_day'], default='date', help='day of the month of monthly and yearly occurrences: the date, weekday of the same week of the month, or last weekday of the first occurrence, or the last day of the month.')
+        add.set_defaults(function=self._add)
+
+        listing = commands.add_parser('list', help='list event series.')
+        listing.set_defaults(function=self._list)
+
+        query = commands.add_parser('query', help='list the occurrences of events within a range of days.')
+        query.add_argument('date', nargs='?', type=self._parse_date, default=datetime.date.today().toordinal(), help='first day, yyyy-mm-dd, today by default.')
+        query.add_argument('--days', type=self._parse_number, default=self._NUMBER_DAYS_IN_WEEK, help='number of days.')
+        query.set_defaults(function=self._query)
+
+        edit = commands.add_parser('edit', help='edit an event series, or one of its occurrences.')
+        edit.add_argument('recurrence_id', help='identifier of the event series, as listed.')
+        edit.add_argument('--date', type=self._parse_date, help='day of the occurrence to edit, yyyy-mm-dd; the edited occurrence is added as an event replacing it.')
+        edit.add_argument('--time', type=self._parse_time, help='start time, hh:mm.')
+        edit.add_argument('--duration', type=self._parse_time, help='duration, hh:mm.')
+        edit.add_argument('--color', type=self._parse_color, help='event color, #rrggbb.')
+        edit.add_argument('--description', help='event description.')
+        edit.set_defaults(function=self._edit)
+
+        remove = commands.add_parser('remove', help='remove an event series, or one of its occurrences.')
+        remove.add_argument('recurrence_id', help='identifier of the event series, as listed.')
+        remove.add_argument('--date', type=self._parse_date, help='day of the occurrence to remove, yyyy-mm-dd.')
+        remove.set_defaults(function=self._remove)
+
+        # Tasks
+        task_add = commands.add_parser('task-add', help='add a task.')
+        task_add.add_argument('description', help='task description.')
+        task_add.add_argument('--done', action='store_true', help='add the task as completed.')
+        task_add.set_defaults(function=self._task_add)
+
+        task_list = commands.add_parser('task-list', help='list tasks.')
+        task_list.set_defaults(function=self._task_list)
+
+        task_toggle = commands.add_parser('task-toggle', help='toggle the completion of a task.')
+        task_toggle.add_argument('index', type=int, help='number of the task, as listed.')
+        task_toggle.set_defaults(function=self._task_toggle)
+
+        task_remove = commands.add_parser('task-remove', help='remove a task.')
+        task_remove.add_argument('index', type=int, help='number of the task, as listed.')
+        task_remove.set_defaults(function=self._task_remove)
+
+        # Schedule and to-do list
+        import_ = commands.add_parser('import', help='import the events and tasks of an iCalendar file.')
+        import_.add_argument('file', help='location of the .ics file, - for stdin.')
+        import_.set_defaults(function=self._import)
+
+        export = commands.add_parser('export', help='export the schedule and to-do list as an iCalendar file, or as text files.')
+        export.add_argument('schedule_file', help='location of the exported schedule, with events and tasks if it ends with .ics, - for stdout.')
+        export.add_argument('tasks_file', nargs='?', help='location of the exported to-do list, for text files.')
+        export.set_defaults(function=self._export)
+
+        snapshot = commands.add_parser('snapshot', help='take a snapshot of the schedule and to-do list, removing the snapshots no longer kept.')
+        snapshot.add_argument('--recent', type=int, default=10, help='number of most recent snapshots kept, 10 by default.')
+        snapshot.add_argument('--daily', type=int, default=7, help='number of most recent days whose last snapshot is kept, 7 by default.')
+        snapshot.add_argument('--weekly', type=int, default=5, help='number of most recent weeks whose last snapshot is kept, 5 by default.')
+        snapshot.add_argument('--monthly', type=int, default=12, help='number of most recent months whose last snapshot is kept, 12 by default.')
+        snapshot.set_defaults(function=self._snapshot)
+
+        snapshots = commands.add_parser('snapshots', help='list snapshots, oldest first.')
+        snapshots.set_defaults(function=self._snapshots)
+
+        restore = commands.add_parser('restore', help='replace the schedule and to-do list by a snapshot, after taking a snapshot of them.')
+        restore.add_argument('name', help='name of the snapshot, as listed.')
+        restore.set_defaults(function=self._restore)
+
+        convert = commands.add_parser('convert', help='convert a schedule and to-do list between text files and binary files, chosen by the .bin extension.')
+        convert.add_argument('schedule_file', help='location of the schedule to convert.')
+        convert.add_argument('tasks_file', help='location of the to-do list to convert.')
+        convert.add_argument('converted_schedule_file', help='location of the converted schedule.')
+        convert.add_argument('converted_tasks_file', help='location of the converted to-do list.')
+        convert.set_defaults(function=self._convert)
+
+        batch = commands.add_parser('batch', help='run the commands read from stdin, one per line, with one read and one write of the files.')
+        batch.set_defaults(function=None)
+
+        return parser
+
+    def _add(self, schedule, to_do, command, stdout):
+        """
+        Adds an event, printing the identifier of its series
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        event = schedule.add(command.date, command.time, command.duration, command.color, command.description, frequency=command.frequency, amount=command.amount, until=command.until, leap_years=command.leap_years, month_day=command.month_day)
+        stdout.write(event.recurrence_id + '\n')
+
+        return True
+
+    def _list(self, schedule, to_do, command, stdout):
+        """
+        Lists the event series by date of their first occurrence
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        for event in sorted(schedule.series(), key=lambda event: (event.date, event.start)):
+            recurrence = ('' if event.series_id is None else '  replaces ' + event.series_id) if event.frequency == 'none' else '  ' + event.frequency + (' ' + event.month_day if event.frequency in ('monthly', 'yearly') and event.month_day != 'date' else '') + (' x' + str(event.amount) if event.amount != 0 else '') + (' until ' + self._format_date(event.until) if event.until is not None else '') + (' unlimited' if event.amount == 0 and event.until is None else '')
+            stdout.write(event.recurrence_id + '  ' + self._format_date(event.date) + ' ' + self._format_time(event.start) + '  ' + self._format_time(event.duration) + '  ' + event.hex_color() + recurrence + '  ' + event.description + '\n')
+
+        return False
+
+    def _query(self, schedule, to_do, command, stdout):
+        """
+        Lists the occurrences of events starting within a range of days
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        start = command.date * 24 * self._NUMBER_MINUTES_IN_HOUR
+        end = start + command.days * 24 * self._NUMBER_MINUTES_IN_HOUR
+
+        for occurrence_start, occurrence_end, ordinal, recurrence_id, event in schedule.overlapping(start, end):
+            if occurrence_start >= start:
+                stdout.write(self._format_date(ordinal) + ' ' + self._format_time(event.start) + '-' + self._format_time((event.start + event.duration) % (24 * self._NUMBER_MINUTES_IN_HOUR)) + '  ' + recurrence_id + '  ' + event.description + '\n')
+
+        return False
+
+    def _edit(self, schedule, to_do, command, stdout):
+        """
+        Edits an event series, or one of its occurrences
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        event = schedule.get(command.recurrence_id)
+
+        if event is None:
+            raise LookupError('no such scheduled event: ' + command.recurrence_id + '.')
+
+        if command.date is not None and command.date not in schedule.occurrences(event, command.date, command.date + 1):
+            raise LookupError('no occurrence of ' + command.recurrence_id + ' on ' + self._format_date(command.date) + '.')
+
+        edited = event.copy()
+        edited.start = command.time if command.time is not None else edited.start
+        edited.duration = command.duration if command.duration is not None else edited.duration
+        edited.color = command.color if command.color is not None else edited.color
+        edited.description = command.description if command.description is not None else edited.description
+
+        # Editing one occurrence of a series adds the edited occurrence, replacing that occurrence of the series
+        if command.date is None or event.frequency == 'none':
+            schedule.replace(edited)
+        else:
+            stdout.write(schedule.override(command.recurrence_id, command.date, edited).recurrence_id + '\n')
+
+        return True
+
+    def _remove(self, schedule, to_do, command, stdout):
+        """
+        Removes an event series, or one of its occurrences
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        event = schedule.get(command.recurrence_id)
+
+        if event is None:
+            raise LookupError('no such scheduled event: ' + command.recurrence_id + '.')
+
+        if command.date is None:
+            schedule.remove(command.recurrence_id)
+        elif command.date in schedule.occurrences(event, command.date, command.date + 1):
+            schedule.exclude(command.recurrence_id, command.date)
+        else:
+            raise LookupError('no occurrence of ' + command.recurrence_id + ' on ' + self._format_date(command.date) + '.')
+
+        return True
+
+    def _task_add(self, schedule, to_do, command, stdout):
+        """
+        Adds a task
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        to_do.add(command.description, '1' if command.done else '0')
+
+        return True
+
+    def _task_list(self, schedule, to_do, command, stdout):
+        """
+        Lists the tasks, numbered from 1
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        for number, (completion, description) in enumerate(to_do.tasks(), 1):
+            stdout.write(str(number) + '  [' + ('x' if completion == '1' else ' ') + ']  ' + description + '\n')
+
+        return False
+
+    def _task_toggle(self, schedule, to_do, command, stdout):
+        """
+        Toggles the completion of a task
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        to_do.toggle(self._task_index(to_do, command.index))
+
+        return True
+
+    def _task_remove(self, schedule, to_do, command, stdout):
+        """
+        Removes a task
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        to_do.remove(self._task_index(to_do, command.index))
+
+        return True
+
+    def _import(self, schedule, to_do, command, stdout):
+        """
+        Imports the events and tasks of an iCalendar file, reading one line at a time
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        calendar = ICalendar()
+
+        if command.file == '-':
+            number_events, number_tasks = calendar.import_into(sys.stdin, schedule, to_do)
+        else:
+            with open(command.file, encoding='utf-8', newline='') as file:
+                number_events, number_tasks = calendar.import_into(file, schedule, to_do)
+
+        stdout.write('imported ' + str(number_events) + ' events and ' + str(number_tasks) + ' tasks.\n')
+
+        if calendar.simplified:
+            stdout.write(str(calendar.simplified) + ' recurrence rules were simplified to the frequencies supported.\n')
+
+        if calendar.truncated:
+            stdout.write(str(calendar.truncated) + ' events longer than one day were shortened to one day.\n')
+
+        return number_events > 0 or number_tasks > 0
+
+    def _export(self, schedule, to_do, command, stdout):
+        """
+        Exports the schedule and to-do list as an iCalendar file, or as text files
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        if command.schedule_file == '-' or command.schedule_file.lower().endswith('.ics'):
+            if command.schedule_file == '-':
+                ICalendar().write(stdout, schedule.series(), to_do.tasks())
+            else:
+                with open(command.schedule_file, 'w', encoding='utf-8', newline='') as file:
+                    ICalendar().write(file, schedule.series(), to_do.tasks())
+
+        elif command.tasks_file is None:
+            raise ValueError('exporting text files requires the location of the exported to-do list.')
+        else:
+            storage = TextStorage(command.schedule_file, command.tasks_file)
+            storage.write_schedule(schedule.series())
+            storage.write_tasks(to_do.tasks())
+
+        return False
+
+    def _snapshot(self, schedule, to_do, command, stdout):
+        """
+        Takes a snapshot of the schedule and to-do list, printing its name
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        snapshots = Snapshots(os.path.join(self._file_location, self._snapshot_directory_name), command.recent, command.daily, command.weekly, command.monthly)
+        stdout.write(snapshots.take(schedule.series(), to_do.tasks()) + '\n')
+
+        return False
+
+    def _snapshots(self, schedule, to_do, command, stdout):
+        """
+        Lists the snapshots, oldest first, and the space they use
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        snapshots = Snapshots(os.path.join(self._file_location, self._snapshot_directory_name))
+        names = snapshots.names()
+
+        for name in names:
+            stdout.write(name + '\n')
+
+        stdout.write(str(len(names)) + ' snapshots using ' + format(snapshots.size() / 1000, '.1f') + ' kB.\n')
+
+        return False
+
+    def _restore(self, schedule, to_do, command, stdout):
+        """
+        Replaces the schedule and to-do list by a snapshot, after taking a snapshot of them so that restoring can be undone
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        snapshots = Snapshots(os.path.join(self._file_location, self._snapshot_directory_name))
+
+        if command.name not in snapshots.names():
+            raise LookupError('no such snapshot: ' + command.name + '.')
+
+        snapshot = snapshots.open(command.name)
+        stdout.write('took snapshot ' + snapshots.take(schedule.series(), to_do.tasks()) + ' before restoring.\n')
+
+        # Identifiers allocated since the snapshot stay allocated
+        schedule.read(snapshot, write_back=False)
+        to_do.read(snapshot)
+
+        return True
+
+    def _convert(self, schedule, to_do, command, stdout):
+        """
+        Converts a schedule and to-do list between text files and binary files, leaving the files of the application unchanged
+
+        schedule: ScheduleStore
+        to_do: TaskStore
+        command: Parsed command, argparse.Namespace
+        stdout: Output of the command, file
+        return: Whether the schedule or to-do list changed, boolean
+        """
+        source = self._open_files(command.schedule_file, command.tasks_file)
+        destination = self._open_files(command.converted_schedule_file, command.converted_tasks_file)
+
+        # Schedules stored in older formats are migrated as they are read, as by the application, but only the converted files are written
+        converted_schedule = ScheduleStore()
+        converted_to_do = TaskStore()
+        converted_schedule.read(source, write_back=False)
+        converted_to_do.read(source)
+        events = converted_schedule.series()
+        tasks = converted_to_do.tasks()
+        destination.write_schedule(events)
+        destination.write_tasks(tasks)
+
+        stdout.write('converted ' + str(len(events)) + ' event series and ' + str(len(tasks)) + ' tasks.\n')
+
+        return False
+
+    def _open_files(self, schedule_file, tasks_file):
+        """
+        Opens a schedule and to-do list stored as binary files if the schedule file ends with .bin, or as text files otherwise
+
+        schedule_file: Location of the schedule file, string
+        tasks_file: Location of the to-do list file, string
+        return: Storage
+        """
+        if schedule_file.lower().endswith('.bin'):
+            return BinaryStorage(schedule_file, tasks_file)
+
+        return TextStorage(schedule_file, tasks_file)
+
+    def _task_index(self, to_do, number):
+        """
+        Returns the index of a task from its number as listed
+
+        to_do: TaskStore
+        number: Number of the task, from 1, int
+        return: Index of the task, int
+        """
+        if not 1 <= number <= len(to_do.items):
+            raise LookupError('no such to-do list task: ' + str(number) + '.')
+
+        return number - 1
+
+    def _parse_date(self, text):
+        """
+        Parses a date
+
+        text: Date, yyyy-mm-dd, string
+        return: Date ordinal, int
+        """
+        try:
+            return datetime.date.fromisoformat(text).toordinal()
+        except ValueError:
+            raise argparse.ArgumentTypeError('invalid date, expected yyyy-mm-dd: ' + text)
+
+    def _parse_time(self, text):
+        """
+        Parses a time of day or duration
+
+        text: Time, hh:mm, string
+        return: Minutes, int
+        """
+        try:
+            hour, minute = text.split(':')
+
+            if not (0 <= int(hour) < 24 and 0 <= int(minute) < self._NUMBER_MINUTES_IN_HOUR):
+                raise ValueError
+
+            return int(hour) * self._NUMBER_MINUTES_IN_HOUR + int(minute)
+        except ValueError:
+            raise argparse.ArgumentTypeError('invalid time, expected hh:mm: ' + text)
+
+    def _parse_color(self, text):
+        """
+        Parses a color
+
+        text: Hex color, #rrggbb, string
+        return: Color packed as 0xrrggbb, int
+        """
+        try:
+            if len(text) != 7 or text[0] != '#':
+                raise ValueError
+
+            return int(text[1:], 16)
+        except ValueError:
+            raise argparse.ArgumentTypeError('invalid color, expected #rrggbb: ' + text)
+
+    def _parse_number(self, text):
+        """
+        Parses a number that is not negative
+
+        text: Number, string
+        return: int
+        """
+        try:
+            if int(text) < 0:
+                raise ValueError
+
+            return int(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError('invalid number: ' + text)
+
+    def _parse_amount(self, text):
+        """
+        Parses a number of occurrences of an event series
+
+        text: Number of occurrences, string
+        return: int
+        """
+        amount = self._parse_number(text)
+
+        if amount > self._MAXIMUM_AMOUNT:
+            raise argparse.ArgumentTypeError('invalid number of occurrences, expected at most ' + str(self._MAXIMUM_AMOUNT) + ': ' + text)
+
+        return amount
+
+    def _format_date(self, ordinal):
+        """
+        Formats a date
+
+        ordinal: Date ordinal, int
+        return: Date, yyyy-mm-dd, string
+        """
+        return datetime.date.fromordinal(ordinal).isoformat()
+
+    def _format_time(self, minutes):
+        """
+        Formats a time of day or duration
+
+        minutes: Minutes, int
+        return: Time, hh:mm, string
+        """
+        return str(minutes // self._NUMBER_MINUTES_IN_HOUR).zfill(2) + ':' + str(minutes % self._NUMBER_MINUTES_IN_HOUR).zfill(2)
+
+if __name__ == '__main__':
+    sys.exit(CommandLine().run(sys.argv[1:]))
@@ -0,0 +1,827 @@
+# Libraries
+import array
+import bisect
+import datetime
+import collections
+
+from storage import Event
+
+class ScheduleStore:
+    """
+    Class for the schedule of the Hourglass application
+
+    Holds one entry per event series and expands occurrences only for the ranges queried; changes are recorded in storage once it is attached
+    May read only the events of a range of days at first, reading the events of other days as they are queried
+    """
+    def __init__(self, cache_size=16, on_change=None):
+        """
+        Initializes the ScheduleStore class
+
+        cache_size: Number of expanded windows of event occurrences to keep cached, int
+        on_change: Function called with the recurrence_id of each event series added, edited, or removed, or None
+        """
+        # Number of minutes in a day, used for times measured in minutes since the start of the calendar
+        self._NUMBER_MINUTES_IN_DAY = 60 * 24
+
+        # Number of years ahead searched for upcoming occurrences
+        self._NUMBER_YEARS = 10
+
+        # Number of days between occurrences of series recurring a fixed number of days apart, which include yearly series not keeping their date
+        self._FREQUENCY_DAYS = {'daily': 1, 'weekly': 7, 'yearly': 365}
+
+        # Number of months between occurrences of series following the calendar
+        self._FREQUENCY_MONTHS = {'monthly': 1, 'yearly': 12}
+
+        # Months are counted from January of year 1; the calendar repeats every 400 years, which are 4800 months and 146097 days
+        self._NUMBER_MONTHS_IN_CYCLE = 4800
+        self._NUMBER_DAYS_IN_CYCLE = 146097
+        self._NUMBER_MONTHS = datetime.MAXYEAR * 12
+
+        # Days from the start of a 400 year cycle to the start of each of its months, followed by the length of the cycle
+        days_in_month = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+        self._MONTH_STARTS = array.array('i', [0])
+
+        for month in range(self._NUMBER_MONTHS_IN_CYCLE):
+            year = month // 12 + 1
+            leap_day = month % 12 == 1 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            self._MONTH_STARTS.append(self._MONTH_STARTS[-1] + days_in_month[month % 12] + leap_day)
+
+        self._cache_size = cache_size
+        self._on_change = on_change
+
+        # Storage in which changes are recorded, None while the schedule is read
+        self.storage = None
+
+        # Schedule dictionary, one entry per event series; occurrences are expanded by window
+        # {recurrence_id: Event,
+        #  recurrence_id: Event, ... }
+        self._events = {}
+
+        # Storage from which events are read as they are queried, and range of days whose events were read, or None once every event series was read
+        self._source = None
+        self._loaded = None
+
+        # Event series removed since the schedule was read, which are not read again
+        self._removed = set()
+
+        # Next identifier of the counter allocating event series identifiers, continuing the counter of the storage read
+        self._next_id = 1
+
+        # Index of the time spanned by each event series
+        self._index = IntervalIndex()
+
+        # Cache of expanded windows of event occurrences
+        self._cache = collections.OrderedDict()
+
+        # Index of the cached occurrences of each event series
+        # {recurrence_id: {cache_key: {date ordinal, ... }, ... }, ... }
+        self._cache_index = {}
+
+    def read(self, storage, first_day=None, last_day=None, write_back=True):
+        """
+        Reads the schedule from storage, replacing the current schedule; migrated schedules are written back
+
+        storage: Storage
+        first_day: First day of the range of days whose events are read, date ordinal, or None to read every event series, int
+        last_day: Day after the last day of the range, date ordinal, int
+        write_back: Whether schedules stored in an older format are written back to storage once migrated, boolean
+        """
+        self._events = {}
+        self._index = IntervalIndex()
+        self._cache.clear()
+        self._cache_index = {}
+        self._source = None
+        self._loaded = None
+        self._removed = set()
+
+        if first_day is not None and storage.reads_windows():
+            # Recurring series may occur on any day, so they are all read; other events are read for the range only
+            self._source = storage
+            self._loaded = (first_day, last_day)
+            self._insert(storage.read_series() + storage.read_events(first_day, last_day))
+            self._next_id = max(self._next_id, storage.next_id)
+            return
+
+        events = storage.read_schedule()
+        self._next_id = max(self._next_id, storage.next_id)
+
+        # Older schedules identify event series by UUIDs, which are replaced once by identifiers allocated from the counter
+        # {UUID: recurrence_id, ... }
+        identifiers = {}
+
+        for event in events:
+            if not event.recurrence_id.isdecimal():
+                if event.recurrence_id not in identifiers:
+                    identifiers[event.recurrence_id] = self._new_id()
+
+                event.recurrence_id = identifiers[event.recurrence_id]
+
+        if storage.needs_migration:
+            # Older schedule files store one event for every occurrence of a series
+            self._migrate(events)
+        else:
+            for event in events:
+                self._events[event.recurrence_id] = event
+                self._index.add(event.recurrence_id, *self.span(event))
+
+        if write_back and (storage.needs_migration or identifiers):
+            storage.write_schedule(self.series())
+
+    def get(self, recurrence_id):
+        """
+        Returns an event series that was read or added
+
+        recurrence_id: Unique identifier of the event series, string
+        return: Event, or None if not scheduled
+        """
+        return self._events.get(recurrence_id)
+
+    def series(self):
+        """
+        Returns every event series, reading those not read yet
+
+        return: Event series, list of Event
+        """
+        # The events of the days not read yet are read as ranges of days, which does not write to storage
+        if self._loaded is not None:
+            self._load(1, datetime.date.max.toordinal() + 1)
+            self._loaded = None
+
+        return list(self._events.values())
+
+    def add(self, date, start, duration, color, description, frequency='none', amount=1, interval=1, until=None, leap_years=True, month_day='date', exceptions=None, series_id=None):
+        """
+        Adds an event series to the schedule
+
+        date: Day of the first occurrence, date ordinal, int
+        start: Start time in minutes since midnight, int
+        duration: Duration in minutes, int
+        color: Color packed as 0xrrggbb, int
+        description: Event description, string
+        frequency: Recurrence frequency, either the strings 'none', 'daily', 'weekly', 'monthly', or 'yearly'
+        amount: Number of occurrences, or 0 if not limited, int
+        interval: Number of frequency periods between occurrences, int
+        until: Last day on which the series may occur, date ordinal, or None if not limited, int
+        leap_years: Whether yearly recurrences keep the same date, skipping years in which it does not exist, rather than recurring every 365 days, boolean
+        month_day: Day of the month on which monthly and yearly series occur, either the strings 'date', 'weekday', 'last_weekday', or 'last_day'
+        exceptions: Days on which the series does not occur, set of date ordinals
+        series_id: Unique identifier of the event series whose occurrence on the same day the event replaces, or None, string
+        return: The added event series, Event
+        """
+        # Events that do not recur occur once, and only they may replace an occurrence of a series
+        if frequency not in self._FREQUENCY_DAYS and frequency not in self._FREQUENCY_MONTHS:
+            frequency, amount, until, exceptions = 'none', 1, None, None
+        else:
+            series_id = None
+
+        event = Event('', date, start, duration, color, description, frequency=frequency, amount=amount, interval=interval, until=until, leap_years=leap_years, month_day=month_day, exceptions=exceptions, series_id=series_id)
+
+        # Series occurring on the last weekday or last day of the month first occur on that day of the month of the given date
+        if self._months(event) is not None and month_day in ('last_weekday', 'last_day'):
+            event.date = self._month_days(event, range(self._month(date), self._month(date) + 1))[0]
+
+        # Series ending before their first occurrence would never occur
+        if event.until is not None and event.until < event.date:
+            raise ValueError('the last day of the event series is before its first occurrence.')
+
+        # Identifiers are only allocated to series that are added
+        event.recurrence_id = self._new_id()
+        self._events[event.recurrence_id] = event
+        self._refresh(event.recurrence_id)
+
+        return event
+
+    def replace(self, event):
+        """
+        Replaces an event series by an edited copy with the same recurrence_id
+
+        event: Edited event series, Event
+        """
+        self._events[event.recurrence_id] = event
+        self._refresh(event.recurrence_id)
+
+    def remove(self, recurrence_id):
+        """
+        Removes an event series and all of its occurrences, including the events replacing its occurrences
+
+        recurrence_id: Unique identifier of the event series, string
+        """
+        # Events replacing occurrences are on the days the series lists as exceptions, so only those days are read first
+        event = self._events[recurrence_id]
+
+        if event.frequency != 'none':
+            self._load_days(event.exceptions)
+
+            for replacing in [replacing for replacing in self._events.values() if replacing.series_id == recurrence_id]:
+                del self._events[replacing.recurrence_id]
+                self._refresh(replacing.recurrence_id)
+
+        del self._events[recurrence_id]
+        self._refresh(recurrence_id)
+
+    def override(self, recurrence_id, ordinal, event):
+        """
+        Replaces one occurrence of an event series by an edited copy, which only adds the day as an exception of the series and one event replacing the occurrence
+
+        recurrence_id: Unique identifier of the event series, string
+        ordinal: Day of the occurrence, date ordinal, int
+        event: Edited occurrence, Event
+        return: The added event, Event
+        """
+        self.exclude(recurrence_id, ordinal)
+
+        # Series without occurrences remaining are removed, so the edited occurrence no longer replaces any
+        return self.add(ordinal, event.start, event.duration, event.color, event.description, series_id=recurrence_id if recurrence_id in self._events else None)
+
+    def exclude(self, recurrence_id, ordinal):
+        """
+        Excludes an occurrence from an event series, removing the series if no occurrences remain
+
+        recurrence_id: Unique identifier of the event series, string
+        ordinal: Day of the occurrence, date ordinal, int
+        """
+        # Event series are replaced rather than changed, as those recorded may not be written yet
+        event = self._events[recurrence_id].copy()
+        event.exceptions.add(ordinal)
+        self._events[recurrence_id] = event
+
+        # Series without an end always have occurrences remaining
+        if event.amount != 0 or event.until is not None:
+            if not self.occurrences(event, event.date, datetime.date.max.toordinal()):
+                del self._events[recurrence_id]
+
+        self._refresh(recurrence_id)
+
+    def occurrences(self, event, first_day, last_day):
+        """
+        Returns the days on which an event series occurs within the given range
+
+        event: Event series, Event
+        first_day: First day of the range, date ordinal, int
+        last_day: Day after the last day of the range, date ordinal, int
+        return: Days of the occurrences, list of date ordinals
+        """
+        months = self._months(event)
+
+        # Series may end at a given date in addition to, or instead of, a number of occurrences
+        if event.until is not None:
+            last_day = min(last_day, event.until + 1)
+
+        if event.frequency == 'none':
+            days = [event.date] if first_day <= event.date < last_day else []
+
+        elif months is not None:
+            # One occurrence in every few months from the month of the first occurrence; only the months spanned by the range are computed
+            first_month = self._month(event.date)
+            first_index = max(0, -((first_month - self._month(max(first_day, 1))) // months))
+            last_index = (self._month(last_day - 1) - first_month) // months + 1 if last_day > first_day else first_index
+
+            if event.amount != 0:
+                last_index = min(last_index, event.amount)
+
+            days = [ordinal for ordinal in self._month_days(event, range(first_month + first_index * months, first_month + max(first_index, last_index) * months, months)) if first_day <= ordinal < last_day]
+        else:
+            # Fixed number of days between occurrences; only the occurrences inside the range are computed
+            step = self._FREQUENCY_DAYS[event.frequency] * event.interval
+            first_index = max(0, -((event.date - first_day) // step))
+            last_index = -((event.date - last_day) // step)
+
+            if event.amount != 0:
+                last_index = min(last_index, event.amount)
+
+            days = list(range(event.date + first_index * step, event.date + max(first_index, last_index) * step, step))
+
+        if event.exceptions:
+            days = [ordinal for ordinal in days if ordinal not in event.exceptions]
+
+        return days
+
+    def span(self, event):
+        """
+        Returns the time from the start of the first occurrence to the end of the last occurrence of an event series
+
+        event: Event series, Event
+        return: Tuple of ints in minutes since the start of the calendar, (start, end); end is None if the series has no end
+        """
+        months = self._months(event)
+
+        # Last day on which the series may occur
+        if event.frequency == 'none':
+            last_day = event.date
+        elif event.amount == 0 and event.until is None:
+            last_day = None
+        else:
+            last_day = datetime.date.max.toordinal()
+
+            if event.amount != 0 and months is not None:
+                # Last day of the month of the last occurrence
+                last_month = min(self._month(event.date) + (event.amount - 1) * months, self._NUMBER_MONTHS - 1)
+                last_day = last_month // self._NUMBER_MONTHS_IN_CYCLE * self._NUMBER_DAYS_IN_CYCLE + self._MONTH_STARTS[last_month % self._NUMBER_MONTHS_IN_CYCLE + 1]
+            elif event.amount != 0:
+                last_day = min(event.date + (event.amount - 1) * self._FREQUENCY_DAYS[event.frequency] * event.interval, last_day)
+
+            if event.until is not None:
+                last_day = min(last_day, event.until)
+
+        start = event.date * self._NUMBER_MINUTES_IN_DAY + event.start
+
+        if last_day is None:
+            return (start, None)
+
+        return (start, last_day * self._NUMBER_MINUTES_IN_DAY + event.start + max(1, event.duration))
+
+    def overlapping(self, start, end):
+        """
+        Returns the occurrences of scheduled events overlapping the given range of time
+
+        start: Start of the range in minutes since the start of the calendar, int
+        end: End of the range in minutes since the start of the calendar, exclusive, int
+        return: Occurrences sorted by start, list of tuples, (start, end, date ordinal, recurrence_id, Event)
+        """
+        # Events that do not recur last at most a day, so those of the previous day may last into the range
+        self._load(start // self._NUMBER_MINUTES_IN_DAY - 1, (end - 1) // self._NUMBER_MINUTES_IN_DAY + 1)
+
+        occurrences = []
+
+        # Only the event series spanning the range are expanded
+        for recurrence_id in self._index.overlapping(start, end):
+            event = self._events[recurrence_id]
+            duration = max(1, event.duration)
+
+            # Occurrences starting on earlier days may last into the range
+            first_day = max(1, (start - event.start - duration) // self._NUMBER_MINUTES_IN_DAY + 1)
+            last_day = -((event.start - end) // self._NUMBER_MINUTES_IN_DAY)
+
+            for ordinal in self.occurrences(event, first_day, last_day):
+                occurrence_start = ordinal * self._NUMBER_MINUTES_IN_DAY + event.start
+                occurrences.append((occurrence_start, occurrence_start + duration, ordinal, recurrence_id, event))
+
+        occurrences.sort(key=lambda occurrence: occurrence[0])
+
+        return occurrences
+
+    def next(self, start, number):
+        """
+        Returns the next occurrences of scheduled events starting at or after the given time
+
+        start: Time in minutes since the start of the calendar, int
+        number: Maximum number of occurrences, int
+        return: Occurrences sorted by start, list of tuples, (start, end, date ordinal, recurrence_id, Event)
+        """
+        # Search ahead one day at first, doubling the range until enough occurrences are found
+        horizon = self._NUMBER_MINUTES_IN_DAY
+        last_horizon = self._NUMBER_YEARS * 366 * self._NUMBER_MINUTES_IN_DAY
+
+        while True:
+            occurrences = [occurrence for occurrence in self.overlapping(start, start + horizon) if occurrence[0] >= start]
+
+            if len(occurrences) >= number or horizon >= last_horizon:
+                return occurrences[:number]
+
+            horizon = horizon * 2
+
+    def window(self, first_day, number_days):
+        """
+        Returns the occurrences of all scheduled events within the given days
+
+        first_day: First day of the window, date ordinal, int
+        number_days: Number of days in the window, int
+        return: Dictionary, {date ordinal: {recurrence_id: Event, ... }, ... }
+        """
+        # Reuse a recently expanded window if available
+        cache_key = (first_day, number_days)
+        window = self._cache.get(cache_key)
+
+        if window is not None:
+            self._cache.move_to_end(cache_key)
+            return window
+
+        # Expand the event series overlapping the window for the window only
+        window = {}
+        start = first_day * self._NUMBER_MINUTES_IN_DAY
+        end = start + number_days * self._NUMBER_MINUTES_IN_DAY
+
+        for occurrence_start, occurrence_end, ordinal, recurrence_id, event in self.overlapping(start, end):
+            if occurrence_start >= start:
+                self._cache_insert(cache_key, window, ordinal, recurrence_id, event)
+
+        # Keep the cache bounded by discarding the least recently used window
+        self._cache[cache_key] = window
+
+        if len(self._cache) > self._cache_size:
+            evicted_key, evicted_window = self._cache.popitem(last=False)
+            evicted_ids = set()
+
+            for events in evicted_window.values():
+                evicted_ids.update(events)
+
+            for recurrence_id in evicted_ids:
+                cached = self._cache_index.get(recurrence_id)
+                del cached[evicted_key]
+
+                if not cached:
+                    del self._cache_index[recurrence_id]
+
+        return window
+
+    def _months(self, event):
+        """
+        Returns the number of months between occurrences of an event series following the calendar
+
+        event: Event series, Event
+        return: Number of months, or None if the series does not follow the calendar, int
+        """
+        if event.frequency == 'monthly' or (event.frequency == 'yearly' and event.leap_years):
+            return self._FREQUENCY_MONTHS[event.frequency] * event.interval
+
+        return None
+
+    def _month(self, ordinal):
+        """
+        Returns the month of a day
+
+        ordinal: Day, date ordinal, int
+        return: Months since January of year 1, int
+        """
+        date = datetime.date.fromordinal(ordinal)
+
+        return (date.year - 1) * 12 + date.month - 1
+
+    def _month_days(self, event, months):
+        """
+        Returns the days on which an event series following the calendar occurs in the given months, skipping months without such a day
+
+        Computes the first and last day of every month from the start of its 400 year cycle, then the day of each month at once
+
+        event: Event series, Event
+        months: Months since January of year 1, range
+        return: Days, list of date ordinals
+        """
+        date = datetime.date.fromordinal(event.date)
+
+        # First day of each month, and day after its last day
+        cycles = [month // self._NUMBER_MONTHS_IN_CYCLE * self._NUMBER_DAYS_IN_CYCLE + 1 for month in months]
+        starts = [cycle + self._MONTH_STARTS[month % self._NUMBER_MONTHS_IN_CYCLE] for cycle, month in zip(cycles, months)]
+        ends = [cycle + self._MONTH_STARTS[month % self._NUMBER_MONTHS_IN_CYCLE + 1] for cycle, month in zip(cycles, months)]
+
+        # Weekdays count from Monday, the weekday of ordinal 1
+        if event.month_day == 'weekday':
+            # Same weekday of the same week of the month, counting weeks from the first day of the month
+            days = [start + (date.weekday() - start - 6) % 7 + (date.day - 1) // 7 * 7 for start in starts]
+            return [day for day, end in zip(days, ends) if day < end]
+        elif event.month_day == 'last_weekday':
+            return [end - 1 - (end + 5 - date.weekday()) % 7 for end in ends]
+        elif event.month_day == 'last_day':
+            return [end - 1 for end in ends]
+
+        # Same day of the month
+        return [start + date.day - 1 for start, end in zip(starts, ends) if start + date.day - 1 < end]
+
+    def _new_id(self):
+        """
+        Returns a new unique identifier for an event series, allocated from the counter
+
+        return: Decimal number, string
+        """
+        recurrence_id = str(self._next_id)
+        self._next_id = self._next_id + 1
+
+        return recurrence_id
+
+    def _load(self, first_day, last_day):
+        """
+        Reads the events of the given range of days that were not read yet
+
+        first_day: First day of the range, date ordinal, int
+        last_day: Day after the last day of the range, date ordinal, int
+        """
+        if self._loaded is None:
+            return
+
+        loaded_first_day, loaded_last_day = self._loaded
+        first_day = max(1, first_day)
+        last_day = min(datetime.date.max.toordinal() + 1, last_day)
+
+        # Events are read for the days before and after the range already read
+        if first_day < loaded_first_day:
+            self._insert(self._source.read_events(first_day, loaded_first_day))
+            loaded_first_day = first_day
+
+        if last_day > loaded_last_day:
+            self._insert(self._source.read_events(loaded_last_day, last_day))
+            loaded_last_day = last_day
+
+        self._loaded = (loaded_first_day, loaded_last_day)
+
+    def _load_days(self, ordinals):
+        """
+        Reads the events of the given days that were not read yet, without reading the days between them
+
+        ordinals: Days, iterable of date ordinals
+        """
+        if self._loaded is None:
+            return
+
+        loaded_first_day, loaded_last_day = self._loaded
+
+        for ordinal in sorted(ordinals):
+            if not loaded_first_day <= ordinal < loaded_last_day:
+                self._insert(self._source.read_events(ordinal, ordinal + 1))
+
+    def _insert(self, events):
+        """
+        Adds event series read from storage, unless added, edited, or removed since the schedule was read
+
+        events: Event series, list of Event
+        """
+        for event in events:
+            if event.recurrence_id not in self._events and event.recurrence_id not in self._removed:
+                self._events[event.recurrence_id] = event
+                self._index.add(event.recurrence_id, *self.span(event))
+
+    def _migrate(self, occurrences):
+        """
+        Converts a schedule storing every occurrence of a series into one entry per series
+
+        occurrences: Occurrences, each as a single event of its series, list of Event
+        """
+        # Group occurrences by the series they belong to
+        occurrences_by_series = {}
+
+        for event in occurrences:
+            occurrences_by_series.setdefault(event.recurrence_id, []).append(event)
+
+        for recurrence_id, occurrences in occurrences_by_series.items():
+            # The earliest occurrence defines the series
+            occurrences.sort(key=lambda event: event.date)
+            event = occurrences[0]
+
+            # Yearly series added without leap years mode were spaced 365 days apart
+            if event.frequency == 'yearly' and len(occurrences) > 1 and datetime.date.fromordinal(occurrences[1].date).strftime('%m%d') != datetime.date.fromordinal(event.date).strftime('%m%d'):
+                event.leap_years = False
+
+            self._events[recurrence_id] = event
+
+            # Occurrences that were edited or removed individually become exceptions of the series
+            remaining = {occurrence.date: occurrence for occurrence in occurrences}
+            detached = []
+
+            for ordinal in self.occurrences(event, event.date, datetime.date.max.toordinal()):
+                occurrence = remaining.pop(ordinal, None)
+
+                if occurrence is None or (occurrence.start, occurrence.duration, occurrence.color, occurrence.description) != (event.start, event.duration, event.color, event.description):
+                    event.exceptions.add(ordinal)
+
+                    if occurrence is not None:
+                        detached.append(occurrence)
+
+            self._index.add(recurrence_id, *self.span(event))
+
+            # Edited occurrences replace the occurrences listed as exceptions
+            for occurrence in detached:
+                self.add(occurrence.date, occurrence.start, occurrence.duration, occurrence.color, occurrence.description, series_id=recurrence_id)
+
+            for occurrence in remaining.values():
+                self.add(occurrence.date, occurrence.start, occurrence.duration, occurrence.color, occurrence.description)
+
+    def _cache_insert(self, cache_key, window, ordinal, recurrence_id, event):
+        """
+        Adds an occurrence to a cached window and to the index of cached occurrences
+
+        cache_key: Tuple of ints, (first day ordinal, number of days)
+        window: The cached window, dict
+        ordinal: Day of the occurrence, date ordinal, int
+        recurrence_id: Unique identifier of the event series, string
+        event: Event series, Event
+        """
+        window.setdefault(ordinal, {}).update({recurrence_id: event})
+        self._cache_index.setdefault(recurrence_id, {}).setdefault(cache_key, set()).add(ordinal)
+
+    def _refresh(self, recurrence_id):
+        """
+        Updates the index and cached occurrences of an event series after it is added, edited, or removed, then records the change
+
+        recurrence_id: Unique identifier of the event series, string
+        """
+        # Update the time spanned by the series
+        self._index.remove(recurrence_id)
+
+        if recurrence_id in self._events:
+            self._index.add(recurrence_id, *self.span(self._events[recurrence_id]))
+
+        # Remove the previous occurrences of the series only
+        for cache_key, ordinals in self._cache_index.pop(recurrence_id, {}).items():
+            window = self._cache.get(cache_key)
+
+            for ordinal in ordinals:
+                del window[ordinal][recurrence_id]
+
+                if not window[ordinal]:
+                    del window[ordinal]
+
+        # Expand the series again for each cached window
+        event = self._events.get(recurrence_id)
+
+        if event is None:
+            self._removed.add(recurrence_id)
+
+        if event is not None:
+            for cache_key, window in self._cache.items():
+                for ordinal in self.occurrences(event, cache_key[0], cache_key[0] + cache_key[1]):
+                    self._cache_insert(cache_key, window, ordinal, recurrence_id, event)
+
+        if self._on_change is not None:
+            self._on_change(recurrence_id)
+
+        # Record the change, unless the schedule is being read
+        if self.storage is not None:
+            if event is None:
+                self.storage.remove_event(recurrence_id)
+            else:
+                self.storage.write_event(event)
+
+class TaskStore:
+    """
+    Class for the to-do list of the Hourglass application
+
+    Holds the to-do list items in order; changes are recorded in storage once it is attached
+    """
+    def __init__(self):
+        """
+        Initializes the TaskStore class
+        """
+        # Storage in which changes are recorded, None while the to-do list is read
+        self.storage = None
+
+        # To-do list items in order, each with a key identifying it while the application runs
+        # [{'key': int, 'completion': '0' or '1', 'description': string}, ... ]
+        self.items = []
+
+        # Next key of the counter allocating item keys
+        self._next_key = 0
+
+    def read(self, storage):
+        """
+        Reads the to-do list from storage, replacing the current to-do list
+
+        storage: Storage
+        """
+        self.items = [self._item(completion, description) for completion, description in storage.read_tasks()]
+
+    def tasks(self):
+        """
+        Returns the to-do list as stored
+
+        return: List of tuples, (completion, description)
+        """
+        return [(item.get('completion'), item.get('description')) for item in self.items]
+
+    def add(self, description, completion='0'):
+        """
+        Adds an item to the end of the to-do list
+
+        description: Description of the item, string
+        completion: '1' if completed, otherwise '0', string
+        return: The added item, dictionary
+        """
+        item = self._item(completion, description)
+        self.items.append(item)
+
+        if self.storage is not None:
+            self.storage.insert_task(len(self.items) - 1, completion, description)
+
+        return item
+
+    def toggle(self, index):
+        """
+        Toggles the completion of an item
+
+        index: Index of the item, int
+        """
+        item = self.items[index]
+        item['completion'] = '0' if item.get('completion') == '1' else '1'
+
+        if self.storage is not None:
+            self.storage.replace_task(index, item.get('completion'), item.get('description'))
+
+    def remove(self, index):
+        """
+        Removes an item
+
+        index: Index of the item, int
+        """
+        del self.items[index]
+
+        if self.storage is not None:
+            self.storage.remove_task(index)
+
+    def move(self, index, new_index, item):
+        """
+        Moves an item to a new index, replacing it by an edited item
+
+        index: Index of the item before it is moved, int
+        new_index: Index of the item after it is moved, int
+        item: Edited item, dictionary
+        """
+        del self.items[index]
+        self.items.insert(new_index, item)
+
+        if self.storage is not None:
+            self.storage.move_task(index, self.items.index(item), item.get('completion'), item.get('description'))
+
+    def _item(self, completion, description):
+        """
+        Returns a new to-do list item
+
+        completion: '1' if completed, otherwise '0', string
+        description: Description of the item, string
+        return: Dictionary, {'key': int, 'completion': string, 'description': string}
+        """
+        self._next_key = self._next_key + 1
+
+        return {'key': self._next_key, 'completion': completion, 'description': description}
+
+class IntervalIndex:
+    """
+    Class for the interval index of the schedule
+
+    Finds the intervals overlapping a range of time using intervals sorted by start, grouped by length
+    """
+    def __init__(self):
+        """
+        Initializes the IntervalIndex class
+        """
+        # Starts and intervals sorted by start for each group of intervals shorter than 2 ** group
+        # {group: ([start, ... ], [(start, end, item_id), ... ])}
+        self._groups = {}
+
+        # Starts of intervals without an end
+        # {item_id: start}
+        self._unbounded = {}
+
+        # Interval of each item
+        # {item_id: (start, end)}
+        self._intervals = {}
+
+    def add(self, item_id, start, end):
+        """
+        Adds an interval to the index
+
+        item_id: Unique identifier of the item, string
+        start: Start of the interval, int
+        end: End of the interval, exclusive, or None if the interval has no end, int
+        """
+        self._intervals[item_id] = (start, end)
+
+        if end is None:
+            self._unbounded[item_id] = start
+        else:
+            starts, intervals = self._groups.setdefault((end - start).bit_length(), ([], []))
+            i = bisect.bisect_right(starts, start)
+            starts.insert(i, start)
+            intervals.insert(i, (start, end, item_id))
+
+    def remove(self, item_id):
+        """
+        Removes the interval of an item from the index, if any
+
+        item_id: Unique identifier of the item, string
+        """
+        if item_id not in self._intervals:
+            return
+
+        start, end = self._intervals.pop(item_id)
+
+        if end is None:
+            del self._unbounded[item_id]
+        else:
+            group = (end - start).bit_length()
+            starts, intervals = self._groups[group]
+            i = bisect.bisect_left(starts, start)
+
+            while intervals[i][2] != item_id:
+                i = i + 1
+
+            del starts[i]
+            del intervals[i]
+
+            if not starts:
+                del self._groups[group]
+
+    def overlapping(self, start, end):
+        """
+        Returns the items whose intervals overlap the given range
+
+        start: Start of the range, int
+        end: End of the range, exclusive, int
+        return: Unique identifiers of the items, list of strings
+        """
+        items = [item_id for item_id, item_start in self._unbounded.items() if item_start < end]
+
+        # Intervals of a group starting at least 2 ** group before the range end before it
+        for group, (starts, intervals) in self._groups.items():
+            for i in range(bisect.bisect_right(starts, start - (1 << group)), bisect.bisect_left(starts, end)):
+                if intervals[i][1] > start:
+                    items.append(intervals[i][2])
+
+        return items
@@ -1,15 +1,20 @@
 # Libraries
 import os
 import sys
-import uuid
 import calendar
 import datetime
+import heapq
 
 import tkinter as tk
 from tkinter import font
 from tkinter import messagebox
 from tkinter.colorchooser import askcolor
 
+from storage import StorageError, AutosaveStorage, StorageFiles
+from core import ScheduleStore, TaskStore
+from cli import CommandLine
+from snapshot import Snapshots
+
 class Hourglass:
     """
     Class for the Hourglass application
@@ -30,9 +35,27 @@ class Hourglass:
         # Number of recurrences for recurring events (in addition to some special values, the user can schedule 1 to n recurrences, where n is this constant)
         self._NUMBER_EVENT_RECURRENCE = 10
 
+        # Recurrence amount of events recurring until removed or until their until date, which are stored as one series and expanded for the days displayed
+        self._UNLIMITED_RECURRENCE = 'forever'
+
+        # Prompt text of the entry for the last day of recurring events
+        self._UNTIL_PROMPT = ' until yyyy-mm-dd'
+
         # Number of weeks (including those with fewer days than the days in week constant above) in a month to display
         self._NUMBER_DISPLAY_WEEKS_IN_MONTH = 6
 
+        # Number of expanded windows of event occurrences to keep cached
+        self._SCHEDULE_CACHE_SIZE = 16
+
+        # Number of days before and after the current week whose events are read on startup; events of other days are read when displayed
+        self._SCHEDULE_WINDOW_DAYS = 92
+
+        # Number of minutes in a day, used for times measured in minutes since the start of the calendar
+        self._NUMBER_MINUTES_IN_DAY = self._NUMBER_MINUTES_IN_HOUR * self._NUMBER_HOURS_IN_DAY
+
+        # Minutes before the start of an event at which the user is notified, longest first
+        self._NOTIFICATION_MINUTES = (10, 1)
+
         # Maximum width of each event on the schedule in screen units
         self._EVENT_LABEL_WRAPLENGTH = 100
 
@@ -40,6 +63,9 @@ class Hourglass:
         self._CHECKBUTTON_ON = 1
         self._CHECKBUTTON_OFF = 0
 
+        # Days of the month of monthly and yearly recurring events, by their names in the day of the month dropdown
+        self._MONTH_DAYS = {'same date': 'date', 'same weekday': 'weekday', 'last weekday': 'last_weekday', 'last day': 'last_day'}
+
         # Current moment
         self._now = datetime.datetime.now()
 
@@ -53,13 +79,13 @@ class Hourglass:
         # Default mode is dark mode
         self._is_dark_mode = True
         
-        # Set colors used by application
-        self._set_colors(self._is_dark_mode)
+        # Colors used by application, applied to each widget by role when it is created
+        self._theme = Theme(self._is_dark_mode)
         self._dark_mode_display_text_color = '#c2c2c2'
         self._light_mode_display_text_color = '#4b4b4b'
 
         # GUI
-        self._root = tk.Tk()
+        self._root = self._theme.register(tk.Tk(), 'window')
 
         # Font
         self._root.option_add('*Font', 'helvetica')
@@ -83,16 +109,48 @@ class Hourglass:
         self._root.rowconfigure(0, weight=1)
         self._root.rowconfigure(1, weight=5)
 
-        # Location and name of schedule and tasks files
+        # Location of the schedule and tasks files, and of the snapshots
         self._file_location = os.path.dirname('__file__')
-        self._schedule_file_name = 'schedule.txt'
-        self._to_do_list_file_name = 'tasks.txt'
-        self._schedule_old_file_name = 'schedule_old.txt'
-        self._to_do_list_old_file_name = 'tasks_old.txt'
-
-        # Read from schedule and to-do list files
-        self._schedule_read(self._schedule_file_name)
-        self._to_do_read(self._to_do_list_file_name)
+
+        # Snapshots taken by the save button, keeping the most recent snapshots and the last snapshot of each of the most recent days, weeks, and months
+        self._snapshot_directory_name = 'snapshots'
+        self._SNAPSHOTS_RECENT = 10
+        self._SNAPSHOTS_DAILY = 7
+        self._SNAPSHOTS_WEEKLY = 5
+        self._SNAPSHOTS_MONTHLY = 12
+
+        # Files of the schedule and to-do list, opened the same way by the command line
+        self._storage_files = StorageFiles(self._file_location)
+
+        # Seconds without changes after which changes are written in the background, and seconds after a change by which it is written at the latest
+        self._AUTOSAVE_DELAY = 1
+        self._AUTOSAVE_MAXIMUM_DELAY = 5
+
+        # Storage in which changes are recorded, None while the schedule and to-do list are read
+        self._storage = None
+
+        # Schedule of event series, rescheduling notifications of each series that changes, and to-do list; both are read from storage by _storage_read
+        self._schedule = ScheduleStore(self._SCHEDULE_CACHE_SIZE, on_change=self._notify_refresh)
+        self._to_do = TaskStore()
+
+        # Upcoming notifications, heap of tuples, (time in minutes since the start of the calendar, minutes before the event, date ordinal, recurrence_id, version)
+        self._notifications = []
+
+        # Version of each event series, increased when it changes; notifications of earlier versions are skipped
+        self._notifications_versions = {}
+
+        # Time until which occurrences have notifications scheduled, None until notifications are first scheduled
+        self._notifications_horizon = None
+
+        # Notification last given for each occurrence, pruned once the day of the occurrence has passed
+        # {(recurrence_id, date ordinal): (start in minutes since the start of the calendar, minutes before the event), ... }
+        self._notified = {}
+
+        # Identifier of the pending call to notify, if any
+        self._notify_after_id = None
+
+        # Read from schedule and to-do list storage
+        self._storage_read()
         
         # Set up GUI title and GUI widgets
         self._set_title()
@@ -110,18 +168,20 @@ class Hourglass:
 
         # Set up notification function
         self._notify_mode = 1
-        self._notify()
+        self._notify_reset()
+
+        # Report errors of changes written in the background
+        self._autosave_check()
 
         # Application loop
         self._root.mainloop()
 
-        # Write to schedule and to-do list files
+        # Write the changes not written yet in the background to schedule and to-do list storage
         try:
-            self._schedule_write(self._schedule_file_name)
-            self._to_do_write(self._to_do_list_file_name)
-        except:
+            self._storage.close()
+        except StorageError as error:
             # Display an error message then exit the application
-            self._show_error('unable to write to schedule or to-do list files.')
+            self._show_error(str(error))
             sys.exit(1)
     
     def _set_title(self):
@@ -135,42 +195,144 @@ class Hourglass:
         # Update again after 1 second
         self._root.after(1000, self._set_title)
     
+    def _autosave_check(self):
+        """
+        Displays the error of the last change written in the background that failed, if any; calls itself each second
+        """
+        error = self._storage.take_error()
+
+        if error is not None:
+            self._show_error(str(error))
+
+        self._root.after(1000, self._autosave_check)
+
     def _notify(self):
         """
-        Checks for upcoming events and notifies user
+        Notifies user of the notifications that are due, then waits until the next notification is due
         """
+        self._notify_after_id = None
         self._now = datetime.datetime.now()
-        
+        now = self._datetime_minutes(self._now) * 60 + self._now.second
+
         try:
-            if self._notify_mode == 1:
-                # Check for upcoming events in the current day and the next day
-                for i in range(2):
-                    date = self._now + datetime.timedelta(days=i)
-                    year = date.strftime('%Y')
-                    month = date.strftime('%m')
-                    day = date.strftime('%d')
-
-                    key = (year, month, day)
-                    value = self._schedule.get(key)
-
-                    if value is not None:
-                        for event_id, event_info in value.items():
-                            delta = datetime.datetime(year=int(year), month=int(month), day=int(day), hour=int(event_info.get('hour')), minute=int(event_info.get('minute'))) - self._now
-                            
-                            # Ten minute notification
-                            if delta.total_seconds() < 600 and delta.total_seconds() > 60 and event_info.get('ten_minute_notified') is False:
-                                event_info['ten_minute_notified'] = True
-                                messagebox.showinfo(message='in ' + str(max(2, int(delta.total_seconds() / 60))) + ' minutes:\n' + event_info.get('description'))
-                            
-                            # One minute notification
-                            elif delta.total_seconds() < 60 and delta.total_seconds() > 0 and event_info.get('one_minute_notified') is False:
-                                event_info['one_minute_notified'] = True
-                                messagebox.showinfo(message='in 1 minute:\n' + event_info.get('description'))
+            while self._notifications and self._notifications[0][0] * 60 <= now:
+                time, minutes_before, ordinal, recurrence_id, version = heapq.heappop(self._notifications)
+
+                # Schedule the occurrences of the following day before their notifications are due
+                if minutes_before == 0:
+                    self._notify_extend(self._notifications_horizon)
+                    continue
+
+                # Skip notifications of removed or edited events
+                event = self._schedule.get(recurrence_id)
+
+                if event is None or version != self._notifications_versions.get(recurrence_id, 0) or self._notify_mode == 0:
+                    continue
+
+                occurrence_start = ordinal * self._NUMBER_MINUTES_IN_DAY + event.start
+                seconds = occurrence_start * 60 - now
+
+                # Skip notifications already given for the occurrence, unless its start has changed since
+                notified = self._notified.get((recurrence_id, ordinal))
+
+                if notified is not None and notified[0] == occurrence_start and notified[1] <= minutes_before:
+                    continue
+
+                # Ten minute notification
+                if minutes_before > 1 and seconds > 60 and seconds <= minutes_before * 60:
+                    self._notified[(recurrence_id, ordinal)] = (occurrence_start, minutes_before)
+                    messagebox.showinfo(message='in ' + str(max(2, int(seconds / 60))) + ' minutes:\n' + event.description)
+
+                # One minute notification
+                elif minutes_before == 1 and seconds > 0 and seconds <= 60:
+                    self._notified[(recurrence_id, ordinal)] = (occurrence_start, minutes_before)
+                    messagebox.showinfo(message='in 1 minute:\n' + event.description)
         except:
             pass
-        
-        # Update again after 1 second
-        self._root.after(1000, self._notify)
+
+        self._notify_arm()
+
+    def _notify_arm(self):
+        """
+        Waits until the next notification is due, replacing the previous wait
+        """
+        if self._notify_after_id is not None:
+            self._root.after_cancel(self._notify_after_id)
+
+        now = datetime.datetime.now()
+        seconds = self._notifications[0][0] * 60 - (self._datetime_minutes(now) * 60 + now.second + now.microsecond / 1000000)
+        self._notify_after_id = self._root.after(max(0, int(seconds * 1000)), self._notify)
+
+    def _notify_reset(self):
+        """
+        Schedules notifications for all occurrences starting within the next day
+        """
+        self._notifications = []
+        self._notify_extend(self._datetime_minutes(datetime.datetime.now()))
+        self._notify_arm()
+
+    def _notify_extend(self, start):
+        """
+        Schedules notifications for the occurrences starting within one day of the given time
+
+        start: Time in minutes since the start of the calendar, int
+        """
+        end = start + self._NUMBER_MINUTES_IN_DAY
+
+        # Forget notifications given for occurrences on days that have passed
+        today = datetime.date.today().toordinal()
+        self._notified = {key: notified for key, notified in self._notified.items() if key[1] >= today}
+
+        for occurrence_start, occurrence_end, ordinal, recurrence_id, event in self._schedule.overlapping(start, end):
+            if occurrence_start >= start:
+                self._notify_push(occurrence_start, ordinal, recurrence_id)
+
+        self._notifications_horizon = end
+
+        # Extend again before the first notification for the following day is due
+        heapq.heappush(self._notifications, (end - self._NOTIFICATION_MINUTES[0] - 1, 0, 0, '', 0))
+
+    def _notify_push(self, occurrence_start, ordinal, recurrence_id):
+        """
+        Schedules the notifications for an occurrence of an event series
+
+        occurrence_start: Start of the occurrence in minutes since the start of the calendar, int
+        ordinal: Day of the occurrence, date ordinal, int
+        recurrence_id: Unique identifier of the event series, string
+        """
+        version = self._notifications_versions.get(recurrence_id, 0)
+
+        for minutes_before in self._NOTIFICATION_MINUTES:
+            heapq.heappush(self._notifications, (occurrence_start - minutes_before, minutes_before, ordinal, recurrence_id, version))
+
+    def _notify_refresh(self, recurrence_id):
+        """
+        Reschedules the notifications of an event series after it is added, edited, or removed
+
+        recurrence_id: Unique identifier of the event series, string
+        """
+        if self._notifications_horizon is None:
+            return
+
+        # Notifications already scheduled for the series become outdated
+        event = self._schedule.get(recurrence_id)
+
+        if event is None:
+            self._notifications_versions.pop(recurrence_id, None)
+            return
+
+        self._notifications_versions[recurrence_id] = self._notifications_versions.get(recurrence_id, 0) + 1
+
+        now = self._datetime_minutes(datetime.datetime.now())
+        last_day = (self._notifications_horizon - event.start - 1) // self._NUMBER_MINUTES_IN_DAY + 1
+
+        for ordinal in self._schedule.occurrences(event, now // self._NUMBER_MINUTES_IN_DAY, last_day):
+            occurrence_start = ordinal * self._NUMBER_MINUTES_IN_DAY + event.start
+
+            if occurrence_start >= now:
+                self._notify_push(occurrence_start, ordinal, recurrence_id)
+
+        self._notify_arm()
     
     def _toggle_notify(self, *args):
         """
@@ -181,6 +343,7 @@ class Hourglass:
         if self._notify_mode == 0:
             self._notify_mode = 1
             self._notification_label.config({'text': '⌛︎: on'})
+            self._notify_reset()
         else:
             self._notify_mode = 0
             self._notification_label.config({'text': '⌛︎: off'})
@@ -190,7 +353,7 @@ class Hourglass:
         Sets up the week component of the GUI on which events are displayed
         """
         # Frame for all week-related widgets
-        self._week_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._week_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'panel')
         self._week_frame.grid(row=0, column=0, rowspan=2, padx=(6, 3), pady=(6, 3), ipadx=6, ipady=6, sticky='NWSE')
         
         self._week_frame.rowconfigure(0, weight=0)
@@ -201,30 +364,30 @@ class Hourglass:
             self._week_frame.columnconfigure(i, weight=1, uniform='weekday')
         
         # Label indicating which week
-        self._week_label = tk.Label(self._week_frame, anchor='w')
+        self._week_label = self._theme.register(tk.Label(self._week_frame, anchor='w'), 'label')
         self._week_label.grid(row=0, column=0, columnspan=2, padx=(3, 0), pady=(3, 0), sticky='NWS')
 
         # Frame for previous, current, and next week buttons
-        self._week_buttons_frame = tk.Frame(self._week_frame, borderwidth=0, highlightthickness=0)
+        self._week_buttons_frame = self._theme.register(tk.Frame(self._week_frame, borderwidth=0, highlightthickness=0), 'panel')
         self._week_buttons_frame.grid(row=0, column=4, columnspan=3, sticky='NSE')
         self._week_buttons_frame.columnconfigure(0, weight=1)
         self._week_buttons_frame.columnconfigure(1, weight=2)
         self._week_buttons_frame.columnconfigure(2, weight=1)
 
         # Button to go to previous week
-        self._previous_week_label = tk.Label(self._week_buttons_frame, text='← prev. ', justify='left', borderwidth=0, highlightthickness=0)
+        self._previous_week_label = self._theme.register(tk.Label(self._week_buttons_frame, text='← prev. ', justify='left', borderwidth=0, highlightthickness=0), 'label')
         self._previous_week_label.bind('<Button-1>', self._previous_week)
         self._previous_week_label.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._previous_week_label.grid(row=0, column=0, sticky='NWSE')
 
         # Button to go to current week
-        self._current_week_label = tk.Label(self._week_buttons_frame, text=' current ', justify='center', borderwidth=0, highlightthickness=0)
+        self._current_week_label = self._theme.register(tk.Label(self._week_buttons_frame, text=' current ', justify='center', borderwidth=0, highlightthickness=0), 'label')
         self._current_week_label.bind('<Button-1>', self._current_week)
         self._current_week_label.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._current_week_label.grid(row=0, column=1, sticky='NS')
 
         # Button to go to next week
-        self._next_week_label = tk.Label(self._week_buttons_frame, text=' next →', justify='right', borderwidth=0, highlightthickness=0)
+        self._next_week_label = self._theme.register(tk.Label(self._week_buttons_frame, text=' next →', justify='right', borderwidth=0, highlightthickness=0), 'label')
         self._next_week_label.bind('<Button-1>', self._next_week)
         self._next_week_label.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._next_week_label.grid(row=0, column=2, sticky='NWSE')
@@ -237,10 +400,10 @@ class Hourglass:
 
         for i in range(self._NUMBER_DAYS_IN_WEEK):
             # Label for the day of the week and the date
-            self._week_days_labels.append(tk.Label(self._week_frame, anchor='w'))
+            self._week_days_labels.append(self._theme.register(tk.Label(self._week_frame, anchor='w'), 'label'))
 
             # Frame for each day
-            self._week_days.append(tk.Frame(self._week_frame))
+            self._week_days.append(self._theme.register(tk.Frame(self._week_frame), 'panel'))
             self._week_days[i].bind('<Button-1>', lambda event, i=i: self._update_event_entry_date(i))
             self._week_days[i].grid(row=2, column=i, sticky='NWSE')
 
@@ -252,38 +415,47 @@ class Hourglass:
                 self._week_days_labels[i].grid(row=1, column=i, padx=(3, 0), sticky='NWS')
 
                 # References to indicate time of day (first day of week has time)
-                self._week_day_time_references[i].append(tk.LabelFrame(self._week_days[i], text='00:00', labelanchor='nw', borderwidth=0, highlightthickness=0))
+                self._week_day_time_references[i].append(self._theme.register(tk.LabelFrame(self._week_days[i], text='00:00', labelanchor='nw', borderwidth=0, highlightthickness=0), 'time_reference_label'))
                 self._week_day_time_references[i][-1].place(relx=0, rely=0, relwidth=1, relheight=0.05)
 
-                self._week_day_time_references[i].append(tk.LabelFrame(self._week_days[i], text='06:00', labelanchor='sw', borderwidth=0, highlightthickness=0))
+                self._week_day_time_references[i].append(self._theme.register(tk.LabelFrame(self._week_days[i], text='06:00', labelanchor='sw', borderwidth=0, highlightthickness=0), 'time_reference_label'))
                 self._week_day_time_references[i][-1].place(relx=0, rely=0.23, relwidth=1, relheight=0.05)
 
-                self._week_day_time_references[i].append(tk.LabelFrame(self._week_days[i], text='12:00', labelanchor='sw', borderwidth=0, highlightthickness=0))
+                self._week_day_time_references[i].append(self._theme.register(tk.LabelFrame(self._week_days[i], text='12:00', labelanchor='sw', borderwidth=0, highlightthickness=0), 'time_reference_label'))
                 self._week_day_time_references[i][-1].place(relx=0, rely=0.48, relwidth=1, relheight=0.05)
 
-                self._week_day_time_references[i].append(tk.LabelFrame(self._week_days[i], text='18:00', labelanchor='sw', borderwidth=0, highlightthickness=0))
+                self._week_day_time_references[i].append(self._theme.register(tk.LabelFrame(self._week_days[i], text='18:00', labelanchor='sw', borderwidth=0, highlightthickness=0), 'time_reference_label'))
                 self._week_day_time_references[i][-1].place(relx=0, rely=0.73, relwidth=1, relheight=0.05)
                 
             else:
                 self._week_days_labels[i].grid(row=1, column=i, sticky='NWS')
 
                 # Separates adjacent days visually
-                self._week_day_separators[i].append(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0))
+                self._week_day_separators[i].append(self._theme.register(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0), 'frame'))
                 self._week_day_separators[i][-1].place(relx=0, rely=0, relwidth=0.01, relheight=1)
             
             # References to indicate time of day
-            self._week_day_time_references[i].append(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0))
+            self._week_day_time_references[i].append(self._theme.register(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0), 'time_reference'))
             self._week_day_time_references[i][-1].place(relx=0.01, rely=0, relwidth=1, relheight=0.001)
 
-            self._week_day_time_references[i].append(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0))
+            self._week_day_time_references[i].append(self._theme.register(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0), 'time_reference'))
             self._week_day_time_references[i][-1].place(relx=0.01, rely=0.2459, relwidth=1, relheight=0.001)
 
-            self._week_day_time_references[i].append(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0))
+            self._week_day_time_references[i].append(self._theme.register(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0), 'time_reference'))
             self._week_day_time_references[i][-1].place(relx=0.01, rely=0.4959, relwidth=1, relheight=0.001)
 
-            self._week_day_time_references[i].append(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0))
+            self._week_day_time_references[i].append(self._theme.register(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0), 'time_reference'))
             self._week_day_time_references[i][-1].place(relx=0.01, rely=0.7459, relwidth=1, relheight=0.001)
         
+        # Pool of event labels for each day, reused between updates of the displayed week
+        self._week_events_labels = [[] for _ in range(self._NUMBER_DAYS_IN_WEEK)]
+
+        # Occurrence displayed by each event label, (date ordinal, recurrence_id)
+        self._week_events_labels_occurrences = {}
+
+        # Date and events currently displayed for each day
+        self._week_days_displayed = [None for _ in range(self._NUMBER_DAYS_IN_WEEK)]
+
         # Update displayed week to include events
         self._update_week()
     
@@ -294,7 +466,7 @@ class Hourglass:
         self._new_event_calendar = calendar.Calendar(firstweekday=6)
         
         # Frame for all event entry widgets
-        self._event_entry_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._event_entry_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'frame')
         self._event_entry_frame.grid(row=2, column=0, rowspan=2, padx=(6, 6), pady=(3, 6), sticky='NWSE')
 
         self._event_entry_frame.rowconfigure(0, weight=0)
@@ -302,7 +474,7 @@ class Hourglass:
         self._event_entry_frame.columnconfigure(0, weight=1)
 
         # Frame for primary event information
-        self._event_entry_primary_frame = tk.Frame(self._event_entry_frame, borderwidth=0, highlightthickness=0)
+        self._event_entry_primary_frame = self._theme.register(tk.Frame(self._event_entry_frame, borderwidth=0, highlightthickness=0), 'frame')
         self._event_entry_primary_frame.grid(row=0, column=0, pady=(0, 3), sticky='NWSE')
 
         self._event_entry_primary_frame.columnconfigure(0, weight=11)
@@ -314,15 +486,15 @@ class Hourglass:
         self._event_entry_primary_frame.columnconfigure(9, weight=2)
 
         # Frame for secondary event information
-        self._event_entry_secondary_frame = tk.Frame(self._event_entry_frame, borderwidth=0, highlightthickness=0)
+        self._event_entry_secondary_frame = self._theme.register(tk.Frame(self._event_entry_frame, borderwidth=0, highlightthickness=0), 'frame')
         self._event_entry_secondary_frame.grid(row=1, column=0, pady=(3, 0), sticky='NWSE')
         
-        for i in range(10):
+        for i in range(12):
             self._event_entry_secondary_frame.columnconfigure(i, weight=0)
         
         # For entering event description
         self._event_entry_variable = tk.StringVar(self._event_entry_primary_frame)
-        self._event_entry = tk.Entry(self._event_entry_primary_frame, textvariable=self._event_entry_variable, borderwidth=0, highlightthickness=0)
+        self._event_entry = self._theme.register(tk.Entry(self._event_entry_primary_frame, textvariable=self._event_entry_variable, borderwidth=0, highlightthickness=0), 'entry')
         self._event_entry.insert(0, ' add new event...')
         self._event_entry.bind('<FocusIn>', self._event_entry_focus)
         self._event_entry.bind('<FocusOut>', self._event_entry_unfocus)
@@ -330,7 +502,7 @@ class Hourglass:
         self._event_entry.grid(row=0, column=0, padx=(0, 3), sticky='NWSE')
 
         # For selecting color
-        self._color_selection_label = tk.Label(self._event_entry_primary_frame, text='✏', borderwidth=0, highlightthickness=0)
+        self._color_selection_label = self._theme.register(tk.Label(self._event_entry_primary_frame, text='✏', borderwidth=0, highlightthickness=0), 'label')
         self._color_selection_label.bind('<Button-1>', self._choose_color)
         self._color_selection_label.grid(row=0, column=1, padx=(3, 3), sticky='NWSE')
 
@@ -340,7 +512,7 @@ class Hourglass:
         self._current_event_year.set(str(self._now.year))
         self._current_event_year.trace('w', self._update_time_date_menu)
         self._dropdown_years = [str(i) for i in range(self._now.year - self._NUMBER_YEARS, self._now.year + self._NUMBER_YEARS + 1)]
-        self._year_selection_menu = tk.OptionMenu(self._event_entry_primary_frame, self._current_event_year, *self._dropdown_years)
+        self._year_selection_menu = self._theme.register(tk.OptionMenu(self._event_entry_primary_frame, self._current_event_year, *self._dropdown_years), 'menu')
         self._year_selection_menu.config({'borderwidth': 0, 'highlightthickness': 0})
         self._year_selection_menu.grid(row=0, column=2, padx=(2, 3), pady=(2, 0), sticky='NWSE')
 
@@ -349,12 +521,12 @@ class Hourglass:
         self._current_event_month.set(str(self._now.month).zfill(2))
         self._current_event_month.trace('w', self._update_time_date_menu)
         self._dropdown_months = [str(i).zfill(2) for i in range(1, self._NUMBER_MONTHS_IN_YEAR + 1)]
-        self._month_selection_menu = tk.OptionMenu(self._event_entry_primary_frame, self._current_event_month, *self._dropdown_months)
+        self._month_selection_menu = self._theme.register(tk.OptionMenu(self._event_entry_primary_frame, self._current_event_month, *self._dropdown_months), 'menu')
         self._month_selection_menu.config({'borderwidth': 0, 'highlightthickness': 0})
         self._month_selection_menu.grid(row=0, column=3, padx=(3, 1), pady=(2, 0), sticky='NWSE')
         
         # For month/day formatting
-        self._date_separator_label = tk.Label(self._event_entry_primary_frame, text='/', justify='center', borderwidth=0, highlightthickness=0)
+        self._date_separator_label = self._theme.register(tk.Label(self._event_entry_primary_frame, text='/', justify='center', borderwidth=0, highlightthickness=0), 'plain_label')
         self._date_separator_label.grid(row=0, column=4, sticky='NWSE')
 
         # For selecting event day
@@ -366,7 +538,7 @@ class Hourglass:
             if day != 0:
                 self._dropdown_days.append(str(day).zfill(2))
         
-        self._day_selection_menu = tk.OptionMenu(self._event_entry_primary_frame, self._current_event_day, *self._dropdown_days)
+        self._day_selection_menu = self._theme.register(tk.OptionMenu(self._event_entry_primary_frame, self._current_event_day, *self._dropdown_days), 'menu')
         self._day_selection_menu.config({'borderwidth': 0, 'highlightthickness': 0})
         self._day_selection_menu.grid(row=0, column=5, padx=(1, 3), pady=(2, 0), sticky='NWSE')
 
@@ -375,85 +547,99 @@ class Hourglass:
         self._current_event_hour = tk.StringVar(self._event_entry_primary_frame)
         self._current_event_hour.set(str(self._now.hour).zfill(2))
         self._dropdown_hours = [str(i).zfill(2) for i in range(0, self._NUMBER_HOURS_IN_DAY)]
-        self._hour_selection_menu = tk.OptionMenu(self._event_entry_primary_frame, self._current_event_hour, *self._dropdown_hours)
+        self._hour_selection_menu = self._theme.register(tk.OptionMenu(self._event_entry_primary_frame, self._current_event_hour, *self._dropdown_hours), 'menu')
         self._hour_selection_menu.config({'borderwidth': 0, 'highlightthickness': 0})
         self._hour_selection_menu.grid(row=0, column=6, padx=(3, 0), pady=(2, 0), sticky='NWSE')
 
         # For hour:minute formatting
-        self._time_separator_label = tk.Label(self._event_entry_primary_frame, text=':', justify='center', borderwidth=0, highlightthickness=0)
+        self._time_separator_label = self._theme.register(tk.Label(self._event_entry_primary_frame, text=':', justify='center', borderwidth=0, highlightthickness=0), 'plain_label')
         self._time_separator_label.grid(row=0, column=7, sticky='NWSE')
 
         # For selecting event start minute
         self._current_event_minute = tk.StringVar(self._event_entry_primary_frame)
         self._current_event_minute.set(str(self._now.minute).zfill(2))
         self._dropdown_minutes = [str(i).zfill(2) for i in range(self._NUMBER_MINUTES_IN_HOUR)]
-        self._minute_selection_menu = tk.OptionMenu(self._event_entry_primary_frame, self._current_event_minute, *self._dropdown_minutes)
+        self._minute_selection_menu = self._theme.register(tk.OptionMenu(self._event_entry_primary_frame, self._current_event_minute, *self._dropdown_minutes), 'menu')
         self._minute_selection_menu.config({'borderwidth': 0, 'highlightthickness': 0})
         self._minute_selection_menu.grid(row=0, column=8, padx=(1, 0), pady=(2, 0), sticky='NWSE')
 
         # For selecting event duration
         # Duration label
-        self._event_duration_label = tk.Label(self._event_entry_secondary_frame, text='duration (optional):', justify='center', borderwidth=0, highlightthickness=0)
+        self._event_duration_label = self._theme.register(tk.Label(self._event_entry_secondary_frame, text='duration (optional):', justify='center', borderwidth=0, highlightthickness=0), 'prompt_label')
         self._event_duration_label.grid(row=0, column=0, pady=(0, 2), sticky='NWSE')
 
         # For selecting duration hour
         self._current_event_duration_hour = tk.StringVar(self._event_entry_secondary_frame)
         self._current_event_duration_hour.set('0'.zfill(2))
         self._dropdown_duration_hour = [str(i).zfill(2) for i in range(self._NUMBER_HOURS_IN_DAY)]
-        self._duration_hour_menu = tk.OptionMenu(self._event_entry_secondary_frame, self._current_event_duration_hour, *self._dropdown_duration_hour)
+        self._duration_hour_menu = self._theme.register(tk.OptionMenu(self._event_entry_secondary_frame, self._current_event_duration_hour, *self._dropdown_duration_hour), 'menu')
         self._duration_hour_menu.grid(row=0, column=1, padx=(3, 3), sticky='NWSE')
 
         # Duration hour label
-        self._event_duration_hour_label = tk.Label(self._event_entry_secondary_frame, text='hour(s)', justify='center', borderwidth=0, highlightthickness=0)
+        self._event_duration_hour_label = self._theme.register(tk.Label(self._event_entry_secondary_frame, text='hour(s)', justify='center', borderwidth=0, highlightthickness=0), 'prompt_label')
         self._event_duration_hour_label.grid(row=0, column=2, pady=(0, 2), sticky='NWSE')
 
         # For selecting duration minute
         self._current_event_duration_minute = tk.StringVar(self._event_entry_secondary_frame)
         self._current_event_duration_minute.set('0'.zfill(2))
         self._dropdown_duration_minute = [str(i).zfill(2) for i in range(self._NUMBER_MINUTES_IN_HOUR)]
-        self._duration_minute_menu = tk.OptionMenu(self._event_entry_secondary_frame, self._current_event_duration_minute, *self._dropdown_duration_minute)
+        self._duration_minute_menu = self._theme.register(tk.OptionMenu(self._event_entry_secondary_frame, self._current_event_duration_minute, *self._dropdown_duration_minute), 'menu')
         self._duration_minute_menu.grid(row=0, column=3, padx=(3, 3), sticky='NWSE')
 
         # Duration minute label
-        self._event_duration_minute_label = tk.Label(self._event_entry_secondary_frame, text='minute(s)', justify='center', borderwidth=0, highlightthickness=0)
+        self._event_duration_minute_label = self._theme.register(tk.Label(self._event_entry_secondary_frame, text='minute(s)', justify='center', borderwidth=0, highlightthickness=0), 'prompt_label')
         self._event_duration_minute_label.grid(row=0, column=4, padx=(0, 3), pady=(0, 2), sticky='NWSE')
 
         # For selecting event recurrence
         # Recurrence label
-        self._event_recurrence_label = tk.Label(self._event_entry_secondary_frame, text='recurring', justify='center', borderwidth=0, highlightthickness=0)
+        self._event_recurrence_label = self._theme.register(tk.Label(self._event_entry_secondary_frame, text='recurring', justify='center', borderwidth=0, highlightthickness=0), 'prompt_label')
         self._event_recurrence_label.grid(row=0, column=5, padx=(5, 0), pady=(0, 2), sticky='NWSE')
 
         # For selecting event recurrence frequency
         self._current_event_recurrence_frequency = tk.StringVar(self._event_entry_secondary_frame)
         self._current_event_recurrence_frequency.set('none')
         self._dropdown_event_recurrence_frequency = ['none', 'daily', 'weekly', 'monthly', 'yearly']
-        self._event_recurrence_frequency_dictionary = {'none': None, 'daily': 1, 'weekly': 7, 'monthly': 30, 'yearly': 365}
-        self._event_recurrence_frequency_menu = tk.OptionMenu(self._event_entry_secondary_frame, self._current_event_recurrence_frequency, *self._dropdown_event_recurrence_frequency)
+        self._event_recurrence_frequency_menu = self._theme.register(tk.OptionMenu(self._event_entry_secondary_frame, self._current_event_recurrence_frequency, *self._dropdown_event_recurrence_frequency), 'menu')
         self._event_recurrence_frequency_menu.grid(row=0, column=6, padx=(3, 2), sticky='NWSE')
 
         # For selecting event recurrence amount
         self._current_event_recurrence_amount = tk.StringVar(self._event_entry_secondary_frame)
         self._current_event_recurrence_amount.set(1)
-        self._dropdown_event_recurrence_amount = [i for i in range(1, self._NUMBER_EVENT_RECURRENCE + 1)] + [12, 14, 15, 30, 60, 90, 180, 365]
-        self._event_recurrence_amount_menu = tk.OptionMenu(self._event_entry_secondary_frame, self._current_event_recurrence_amount, *self._dropdown_event_recurrence_amount)
+        self._dropdown_event_recurrence_amount = [i for i in range(1, self._NUMBER_EVENT_RECURRENCE + 1)] + [12, 14, 15, 30, 60, 90, 180, 365, self._UNLIMITED_RECURRENCE]
+        self._event_recurrence_amount_menu = self._theme.register(tk.OptionMenu(self._event_entry_secondary_frame, self._current_event_recurrence_amount, *self._dropdown_event_recurrence_amount), 'menu')
         self._event_recurrence_amount_menu.grid(row=0, column=7, padx=(2, 3), sticky='NWSE')
 
         # Recurrence amount label
-        self._event_recurrence_label = tk.Label(self._event_entry_secondary_frame, text='times', justify='center', borderwidth=0, highlightthickness=0)
+        self._event_recurrence_label = self._theme.register(tk.Label(self._event_entry_secondary_frame, text='times', justify='center', borderwidth=0, highlightthickness=0), 'prompt_label')
         self._event_recurrence_label.grid(row=0, column=8, padx=(0, 0), pady=(0, 2), sticky='NWSE')
 
         # Leap years check box
         self._leap_years_mode = tk.IntVar(self._event_entry_secondary_frame)
         self._leap_years_mode.set(self._CHECKBUTTON_ON)
-        self._leap_years_checkbutton = tk.Checkbutton(self._event_entry_secondary_frame, text='leap years?', variable=self._leap_years_mode, onvalue=self._CHECKBUTTON_ON, offvalue=self._CHECKBUTTON_OFF, anchor='w', justify='left')
+        self._leap_years_checkbutton = self._theme.register(tk.Checkbutton(self._event_entry_secondary_frame, text='leap years?', variable=self._leap_years_mode, onvalue=self._CHECKBUTTON_ON, offvalue=self._CHECKBUTTON_OFF, anchor='w', justify='left'), 'prompt_label')
         self._leap_years_checkbutton.grid(row=0, column=9, padx=(3, 3), pady=(0, 2), sticky='NWSE')
+
+        # For selecting the day of the month of monthly and yearly recurrences
+        self._current_event_recurrence_month_day = tk.StringVar(self._event_entry_secondary_frame)
+        self._current_event_recurrence_month_day.set('same date')
+        self._event_recurrence_month_day_menu = self._theme.register(tk.OptionMenu(self._event_entry_secondary_frame, self._current_event_recurrence_month_day, *self._MONTH_DAYS), 'menu')
+        self._event_recurrence_month_day_menu.grid(row=0, column=10, padx=(3, 3), sticky='NWSE')
+
+        # For entering the last day of recurring events
+        self._event_until_entry = self._theme.register(tk.Entry(self._event_entry_secondary_frame, width=len(self._UNTIL_PROMPT), borderwidth=0, highlightthickness=0), 'entry')
+        self._event_until_entry.insert(0, self._UNTIL_PROMPT)
+        self._event_until_entry.config({'foreground': self._theme.prompt_text_color})
+        self._event_until_entry.bind('<FocusIn>', self._event_until_entry_focus)
+        self._event_until_entry.bind('<FocusOut>', self._event_until_entry_unfocus)
+        self._event_until_entry.bind('<Return>', self._event_entry_enter)
+        self._event_until_entry.grid(row=0, column=11, padx=(3, 3), pady=(0, 2), sticky='NWSE')
         
         # Bug: entry widgets do not immediately display correctly without text widget on screen
         # Temporary bug fix
-        self._placeholder_frame_widget = tk.Label(self._event_entry_primary_frame, borderwidth=0, highlightthickness=0)
+        self._placeholder_frame_widget = self._theme.register(tk.Label(self._event_entry_primary_frame, borderwidth=0, highlightthickness=0), 'placeholder')
         self._placeholder_frame_widget.grid(row=0, column=9)
 
-        self._placeholder_text_widget = tk.Text(self._event_entry_primary_frame, height=1, width=1, takefocus=0, borderwidth=0, highlightthickness=0)
+        self._placeholder_text_widget = self._theme.register(tk.Text(self._event_entry_primary_frame, height=1, width=1, takefocus=0, borderwidth=0, highlightthickness=0), 'placeholder')
         self._placeholder_text_widget.config({'state': 'disabled'})
         self._placeholder_text_widget.grid(row=0, column=9, in_=self._placeholder_frame_widget)
         self._placeholder_text_widget.lower()
@@ -463,7 +649,7 @@ class Hourglass:
         Sets up the monthly calendar component of the GUI
         """
         # Frame for the calendar
-        self._calendar_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._calendar_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'panel')
         self._calendar_frame.grid(row=0, column=1, padx=(3, 6), pady=(6, 3), sticky='NWSE')
         
         self._calendar_frame.rowconfigure(0, weight=1)
@@ -476,49 +662,50 @@ class Hourglass:
             self._calendar_frame.columnconfigure(i, weight=1)
         
         # Frame for previous, current, next month buttons
-        self._month_buttons_frame = tk.Frame(self._calendar_frame, borderwidth=0, highlightthickness=0)
+        self._month_buttons_frame = self._theme.register(tk.Frame(self._calendar_frame, borderwidth=0, highlightthickness=0), 'panel')
         self._month_buttons_frame.grid(row=0, column=1, columnspan=5, sticky='NWSE')
         self._month_buttons_frame.columnconfigure(0, weight=1)
         self._month_buttons_frame.columnconfigure(1, weight=2)
         self._month_buttons_frame.columnconfigure(2, weight=1)
 
         # Button to go to previous month
-        self._previous_month_label = tk.Label(self._month_buttons_frame, text='← prev. ', justify='left', borderwidth=0, highlightthickness=0)
+        self._previous_month_label = self._theme.register(tk.Label(self._month_buttons_frame, text='← prev. ', justify='left', borderwidth=0, highlightthickness=0), 'label')
         self._previous_month_label.bind('<Button-1>', self._previous_month)
         self._previous_month_label.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._previous_month_label.grid(row=0, column=0, sticky='NWSE')
 
         # Button to go to current month
-        self._current_month_label = tk.Label(self._month_buttons_frame, text=' current ', justify='center', borderwidth=0, highlightthickness=0)
+        self._current_month_label = self._theme.register(tk.Label(self._month_buttons_frame, text=' current ', justify='center', borderwidth=0, highlightthickness=0), 'label')
         self._current_month_label.bind('<Button-1>', self._current_month)
         self._current_month_label.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._current_month_label.grid(row=0, column=1, sticky='NS')
 
         # Button to go to next month
-        self._next_month_label = tk.Label(self._month_buttons_frame, text=' next →', justify='right', borderwidth=0, highlightthickness=0)
+        self._next_month_label = self._theme.register(tk.Label(self._month_buttons_frame, text=' next →', justify='right', borderwidth=0, highlightthickness=0), 'label')
         self._next_month_label.bind('<Button-1>', self._next_month)
         self._next_month_label.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._next_month_label.grid(row=0, column=2, sticky='NWSE')
 
         # Label for month and year
-        self._month_label = tk.Label(self._calendar_frame, justify='center', borderwidth=0, highlightthickness=0)
+        self._month_label = self._theme.register(tk.Label(self._calendar_frame, justify='center', borderwidth=0, highlightthickness=0), 'label')
         self._month_label.grid(row=1, column=0, columnspan=7, sticky='NWSE')
 
         # Labels for days of the week
         self._calendar_week_days_labels = []
 
         for i in range(self._NUMBER_DAYS_IN_WEEK):
-            self._calendar_week_days_labels.append(tk.Label(self._calendar_frame, justify='right'))
+            self._calendar_week_days_labels.append(self._theme.register(tk.Label(self._calendar_frame, justify='right'), 'label'))
             self._calendar_week_days_labels[-1].grid(row=2, column=i, sticky='NWSE')
         
         # Labels for days of the month
         self._calendar_month_days_labels = [[] for _ in range(self._NUMBER_DISPLAY_WEEKS_IN_MONTH)]
+        self._calendar_event_day_font = font.Font(self._calendar_frame, family='helvetica', underline=True)
 
         for i in range(self._NUMBER_DISPLAY_WEEKS_IN_MONTH):
             for j in range(self._NUMBER_DAYS_IN_WEEK):
-                self._calendar_month_days_labels[i].append(tk.Label(self._calendar_frame, justify='right'))
+                self._calendar_month_days_labels[i].append(self._theme.register(tk.Label(self._calendar_frame, justify='right'), 'label'))
                 self._calendar_month_days_labels[i][-1].grid(row=i + 3, column=j, sticky='NWSE')
-        
+
         # Update displayed month with dates
         self._update_month()
     
@@ -527,7 +714,7 @@ class Hourglass:
         Sets up the to-do list component of the GUI
         """
         # Frame for to-do list
-        self._to_do_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._to_do_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'panel')
         self._to_do_frame.grid(row=1, column=1, padx=(3, 6), pady=(3, 3), ipadx=6, ipady=6, sticky='NWSE')
         self._to_do_frame.grid_propagate(False)
 
@@ -536,16 +723,16 @@ class Hourglass:
         self._to_do_frame.columnconfigure(0, weight=0)
 
         # Label for title
-        self._to_do_label = tk.Label(self._to_do_frame, text='✔︎ to-do list', anchor='w', borderwidth=0, highlightthickness=0)
+        self._to_do_label = self._theme.register(tk.Label(self._to_do_frame, text='✔︎ to-do list', anchor='w', borderwidth=0, highlightthickness=0), 'label')
         self._to_do_label.grid(row=0, column=0, padx=(3, 0), pady=(3, 4), sticky='NWSE')
 
         # Frame for tasks in to-do list
-        self._to_do_list_frame = tk.Frame(self._to_do_frame, borderwidth=0, highlightthickness=0)
+        self._to_do_list_frame = self._theme.register(tk.Frame(self._to_do_frame, borderwidth=0, highlightthickness=0), 'panel')
         self._to_do_list_frame.grid(row=1, column=0, sticky='NWSE')
 
         # For entering tasks
         self._to_do_entry_variable = tk.StringVar(self._root)
-        self._to_do_entry = tk.Entry(self._root, textvariable=self._to_do_entry_variable, borderwidth=0, highlightthickness=0)
+        self._to_do_entry = self._theme.register(tk.Entry(self._root, textvariable=self._to_do_entry_variable, borderwidth=0, highlightthickness=0), 'entry')
         self._to_do_entry.insert(0, ' add new to-do...')
         self._to_do_entry.bind('<FocusIn>', self._to_do_entry_focus)
         self._to_do_entry.bind('<FocusOut>', self._to_do_entry_unfocus)
@@ -560,7 +747,7 @@ class Hourglass:
         Sets up the settings component of the GUI
         """
         # Frame for all settings widgets
-        self._settings_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._settings_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'frame')
         self._settings_frame.grid(row=3, column=1, padx=(6, 6), pady=(3, 7), sticky='NWSE')
         
         self._settings_frame.rowconfigure(0, weight=1)
@@ -571,103 +758,48 @@ class Hourglass:
         self._settings_frame.columnconfigure(4, weight=1)
 
         # For saving
-        self._save_label = tk.Label(self._settings_frame, text='save', borderwidth=0, highlightthickness=0)
+        self._save_label = self._theme.register(tk.Label(self._settings_frame, text='save', borderwidth=0, highlightthickness=0), 'label')
         self._save_label.bind('<Button-1>', lambda event: self._save())
         self._save_label.bind('<ButtonRelease>', lambda event: self._widget_released(self._save_label))
         self._save_label.grid(row=0, column=1, padx=(0, 3), sticky='NWSE')
 
         # For toggling notifications
-        self._notification_label = tk.Label(self._settings_frame, text='⌛︎: on', borderwidth=0, highlightthickness=0)
+        self._notification_label = self._theme.register(tk.Label(self._settings_frame, text='⌛︎: on', borderwidth=0, highlightthickness=0), 'label')
         self._notification_label.bind('<Button-1>', self._toggle_notify)
         self._notification_label.bind('<ButtonRelease>', lambda event: self._widget_released(self._notification_label))
         self._notification_label.grid(row=0, column=2, padx=(3, 3), sticky='NWSE')
 
         # For switching between light/dark mode
-        self._theme_mode_label = tk.Label(self._settings_frame, borderwidth=0, highlightthickness=0)
+        self._theme_mode_label = self._theme.register(tk.Label(self._settings_frame, borderwidth=0, highlightthickness=0), 'label')
         self._theme_mode_label.bind('<Button-1>', self._set_theme_mode)
         self._theme_mode_label.grid(row=0, column=3, padx=(3, 3), sticky='NWSE')
 
         # For how-to/help
-        self._how_to_label = tk.Label(self._settings_frame, text='?', borderwidth=0, highlightthickness=0)
+        self._how_to_label = self._theme.register(tk.Label(self._settings_frame, text='?', borderwidth=0, highlightthickness=0), 'label')
         self._how_to_label.bind('<Button-1>', self._show_how_to)
         self._how_to_label.grid(row=0, column=4, padx=(3, 0), sticky='NWSE')
 
-    def _schedule_read(self, file_name):
+    def _storage_read(self):
         """
-        Reads from schedule file
-
-        file_name: Name of the file to read from, string
+        Reads the schedule and to-do list from storage; new binary files and databases start with the contents of the text files
         """
         try:
-            # If the schedule file does not exist, create it
-            self._schedule_file_location = os.path.join(self._file_location, file_name)
+            new = self._storage_files.new()
 
-            if not os.path.exists(self._schedule_file_location):
-                with open(self._schedule_file_location, 'x') as opened_file:
-                    self._schedule_file = opened_file
-            
-            # Open and read
-            with open(self._schedule_file_location, 'r') as opened_file:
-                self._schedule_file = opened_file
-                
-                # Schedule dictionary
-                # {(year, month, day): {{event_id: {event_info}},
-                #                       {event_id: {event_info}}, ... }}
-                self._schedule = {}
-
-                # Read events from file
-                lines = self._schedule_file.readlines()
-
-                for line in lines:
-                    key = (line[:4], line[4:6], line[6:8])
-                    event_id = str(uuid.uuid4())
-                    event_info = {'hour': line[8:10], 'minute': line[10:12], 'duration_hour': line[12:14], 'duration_minute': line[14:16], 'hex_color': line[16:23], 'recurrence_id': line[23:59], 'frequency': line[59:66], 'amount': line[66:69], 'description': line[69:].strip(), 'ten_minute_notified': False, 'one_minute_notified': False}
-                    
-                    self._schedule.setdefault(key, {}).update({event_id: event_info})
-                
-                # Close schedule file
-                self._schedule_file.close()
-        except:
+            # Changes are written in the background, so that writing never blocks the GUI
+            storage = AutosaveStorage(self._storage_files.open(), self._AUTOSAVE_DELAY, self._AUTOSAVE_MAXIMUM_DELAY)
+            first_day = self._displayed_sunday.toordinal() - self._SCHEDULE_WINDOW_DAYS
+            self._storage_files.read(storage, self._schedule, self._to_do, new, first_day, first_day + self._SCHEDULE_WINDOW_DAYS * 2 + self._NUMBER_DAYS_IN_WEEK)
+        except StorageError as error:
             # Display an error message then exit the application
-            self._show_error('unable to read from schedule file.')
+            self._show_error(str(error))
             sys.exit(1)
-    
-    def _schedule_write(self, file_name):
-        """
-        Writes to schedule file
 
-        file_name: Name of the file to write to, string
-        """
-        try:
-            # If the schedule file does not exist, create it
-            self._schedule_file_location = os.path.join(self._file_location, file_name)
+        self._storage = storage
+        self._schedule.storage = storage
+        self._to_do.storage = storage
 
-            if not os.path.exists(self._schedule_file_location):
-                with open(self._schedule_file_location, 'x') as opened_file:
-                    self._schedule_file = opened_file
-            
-            # Open and write
-            with open(self._schedule_file_location, 'w') as opened_file:
-                self._schedule_file = opened_file
-
-                # Clear schedule file
-                self._schedule_file.seek(0)
-                self._schedule_file.truncate()
-
-                # Write events into file
-                for key in self._schedule:
-                    for event_id, event_info in self._schedule[key].items():
-                        line = key[0] + key[1] + key[2] + event_info.get('hour') + event_info.get('minute') + event_info.get('duration_hour') + event_info.get('duration_minute') + event_info.get('hex_color') + event_info.get('recurrence_id') + event_info.get('frequency') + event_info.get('amount') + event_info.get('description').strip() + '\n'
-                        self._schedule_file.write(line)
-                
-                # Close schedule file
-                self._schedule_file.close()
-        except:
-            # Display an error message then exit the application
-            self._show_error('unable to write to schedule file.')
-            sys.exit(1)
-    
-    def _schedule_add(self, key, hour, minute, duration_hour, duration_minute, hex_color, description, frequency, amount, leap_years):
+    def _schedule_add(self, key, hour, minute, duration_hour, duration_minute, hex_color, description, frequency, amount, leap_years, month_day, until):
         """
         Adds an event to the schedule
 
@@ -679,104 +811,68 @@ class Hourglass:
         hex_color: Hex color, string
         description: Event description, string
         frequency: Event recurrence frequency, string
-        amount: Event recurrence amount, string
+        amount: Event recurrence amount, or the unlimited recurrence amount, string
         leap_years: Whether to account for leap years for yearly recurring events, int
+        month_day: Name of the day of the month of monthly and yearly recurring events, string
+        until: Last day of recurring events, yyyy-mm-dd, or an empty string if not limited, string
         """
-        # Event and recurrence UUID
-        event_id = str(uuid.uuid4())
-        recurrence_id = str(uuid.uuid4())
-
-        # Whether event is recurring
-        delta = self._event_recurrence_frequency_dictionary.get(frequency)
-
-        # Recurrence amount formatting
-        if delta is None:
-            amount = '1'
-        
-        amount = amount.zfill(3)
-
-        # Add event
-        event_info = {'hour': hour, 'minute': minute, 'duration_hour': duration_hour, 'duration_minute': duration_minute, 'hex_color': hex_color, 'recurrence_id': recurrence_id, 'frequency': frequency.rjust(7), 'amount': amount, 'description': description, 'ten_minute_notified': False, 'one_minute_notified': False}
-        self._schedule.setdefault(key, {}).update({event_id: event_info})
-
-        # If event is recurring, add its recurrences
-        if delta is not None:
-            # Leap years mode
-            if leap_years == self._CHECKBUTTON_ON and frequency == 'yearly':
-                for i in range(1, int(amount)):
-                    try:
-                        # Recurrence date
-                        date = datetime.datetime(int(key[0]) + i, int(key[1]), int(key[2]))
-                        new_key = (str(date.year), str(date.month).zfill(2), str(date.day).zfill(2))
-
-                        # UUID of this recurrence
-                        event_id = str(uuid.uuid4())
-
-                        # Add recurrence
-                        self._schedule.setdefault(new_key, {}).update({event_id: event_info})
-                    except:
-                        pass
-            else:
-                for i in range(1, int(amount)):
-                    # Recurrence date
-                    date = datetime.datetime(int(key[0]), int(key[1]), int(key[2])) + datetime.timedelta(days=i * delta)
-                    new_key = (str(date.year), str(date.month).zfill(2), str(date.day).zfill(2))
-
-                    # UUID of this recurrence
-                    event_id = str(uuid.uuid4())
+        try:
+            until = datetime.date.fromisoformat(until).toordinal() if until else None
+        except ValueError:
+            self._show_error('invalid until date: ' + until + '.')
+            return
 
-                    # Add recurrence
-                    self._schedule.setdefault(new_key, {}).update({event_id: event_info})
+        # Add event; its recurrences are expanded when displayed, so series without a number of occurrences are stored once
+        try:
+            self._schedule.add(datetime.date(int(key[0]), int(key[1]), int(key[2])).toordinal(), int(hour) * self._NUMBER_MINUTES_IN_HOUR + int(minute), int(duration_hour) * self._NUMBER_MINUTES_IN_HOUR + int(duration_minute), int(hex_color[1:], 16), description, frequency=frequency, amount=0 if amount == self._UNLIMITED_RECURRENCE else int(amount), until=until, leap_years=leap_years == self._CHECKBUTTON_ON, month_day=self._MONTH_DAYS[month_day])
+        except ValueError as error:
+            self._show_error(str(error))
+            return
+        except StorageError as error:
+            self._show_error(str(error))
 
         # Update displayed week
         self._update_week()
-    
-    def _schedule_edit_remove(self, key, event_id):
+
+    def _schedule_edit_remove(self, ordinal, recurrence_id):
         """
         Edits or removes a scheduled event and, optionally, its recurrences, if any
 
-        key: Tuple of strings, (yyyy, mm, dd)
-        event_id: unique identifier of the event, UUID, string
+        ordinal: Day of the clicked occurrence, date ordinal, int
+        recurrence_id: Unique identifier of the event series, string
         """
         try:
-            # Retrieve event info
-            value = self._schedule.get(key)
-            event_info = value.get(event_id)
+            # Retrieve event series
+            event = self._schedule.get(recurrence_id)
 
-            if value is not None and event_info is not None:
-                popup = EventMenu(self._root, self._is_dark_mode, key, event_info, self._NUMBER_MINUTES_IN_HOUR, self._NUMBER_HOURS_IN_DAY)
-                result = popup.show()
-                popup = None
+            if event is None:
+                raise KeyError(recurrence_id)
 
-                # Edit or remove event(s) based on user response
-                if result[0] == 'remove':
-                    del self._schedule[key][event_id]
+            popup = EventMenu(self._root, self._is_dark_mode, datetime.date.fromordinal(ordinal), event, self._NUMBER_MINUTES_IN_HOUR, self._NUMBER_HOURS_IN_DAY)
+            result = popup.show()
+            popup = None
 
-                elif result[0] == 'remove_all':
-                    keys_list = []
-                    recurrence_id = event_info.get('recurrence_id')
+            # Edit or remove event(s) based on user response
+            if result[0] == 'remove':
+                self._schedule.exclude(recurrence_id, ordinal)
 
-                    for date_key, events in self._schedule.items():
-                        for uuid_key, info in events.items():
-                            if info.get('recurrence_id') == recurrence_id:
-                                keys_list.append((date_key, uuid_key))
-                    
-                    for item in keys_list:
-                        del self._schedule[item[0]][item[1]]
+            elif result[0] == 'remove_all':
+                self._schedule.remove(recurrence_id)
 
-                elif result[0] == 'edit':
-                    self._schedule[key][event_id] = result[1]
-                
-                elif result[0] == 'edit_all':
-                    recurrence_id = event_info.get('recurrence_id')
+            elif result[0] == 'edit':
+                # Editing one occurrence of a series stores the edited occurrence only, replacing the occurrence of the series
+                if event.frequency == 'none':
+                    self._schedule.replace(result[1])
+                else:
+                    self._schedule.override(recurrence_id, ordinal, result[1])
 
-                    for date_key, events in self._schedule.items():
-                        for uuid_key, info in events.items():
-                            if info.get('recurrence_id') == recurrence_id:
-                                self._schedule[date_key][uuid_key] = result[1]
+            elif result[0] == 'edit_all':
+                self._schedule.replace(result[1])
+        except StorageError as error:
+            self._show_error(str(error))
         except:
             self._show_error('no such scheduled event.')
-        
+
         # Update displayed week
         self._update_week()
 
@@ -828,48 +924,81 @@ class Hourglass:
         Updates displayed week and show all scheduled events for that week
         """
         self._displayed_days = ['' for _ in range(self._NUMBER_DAYS_IN_WEEK)]
-        self._week_events_labels = [[] for _ in range(self._NUMBER_DAYS_IN_WEEK)]
 
         # Date of first day of week
         self._week_label.config(text='week of ' + self._displayed_sunday.strftime('%m/%d') + ', ' + str(self._displayed_sunday.year))
 
         # Display scheduled events by day
         try:
+            first_day = self._displayed_sunday.toordinal()
+
+            # Occurrences split into one segment per day they last into, from the expanded window of the week and its previous day, whose events may last into the week
+            # {date ordinal: [(segment start, segment duration, date ordinal of the occurrence, recurrence_id, Event), ... ], ... }
+            segments = {}
+
+            # Segments of each event series, computed once per update as every occurrence of a series has the same start and duration
+            # {recurrence_id: [(number of days after the occurrence, segment start, segment duration), ... ], ... }
+            event_segments = {}
+
+            for ordinal, events in self._schedule.window(first_day - 1, self._NUMBER_DAYS_IN_WEEK + 1).items():
+                for recurrence_id, event in events.items():
+                    if recurrence_id not in event_segments:
+                        event_segments[recurrence_id] = self._day_segments(event.start, event.duration)
+
+                    for days, start, duration in event_segments[recurrence_id]:
+                        if first_day <= ordinal + days < first_day + self._NUMBER_DAYS_IN_WEEK:
+                            segments.setdefault(ordinal + days, []).append((start, duration, ordinal, recurrence_id, event))
+
             for i in range(self._NUMBER_DAYS_IN_WEEK):
-                # Clear the day
-                self._clear_day(self._week_days[i])
+                ordinal = first_day + i
+                self._displayed_days[i] = ordinal
+
+                # Retrieve segments of events for the day, those continuing from the previous day first
+                events = sorted(segments.get(ordinal, []), key=lambda segment: segment[0])
+
+                # Days whose date and events are unchanged are left as they are
+                displayed = (ordinal, [(start, duration, occurrence_ordinal, recurrence_id, event.start, event.color, event.description) for start, duration, occurrence_ordinal, recurrence_id, event in events])
+
+                if displayed == self._week_days_displayed[i]:
+                    continue
+
+                self._week_days_displayed[i] = displayed
 
                 # Display the day of the week and the date
-                displayed_day = self._displayed_sunday + datetime.timedelta(days=i)
-                year = displayed_day.strftime('%Y')
-                month = displayed_day.strftime('%m')
-                day = displayed_day.strftime('%d')
-                key = (year, month, day)
-
-                self._displayed_days[i] = key
-                self._week_days_labels[i].config(text=displayed_day.strftime('%A').lower() + ' ' + day)
-                
-                # Retrieve events for the day
-                events = self._schedule.get(self._displayed_days[i])
-
-                # Display each event
-                if events is not None:
-                    for event_id, event_info in events.items():
-                        self._week_events_labels[i].append(tk.Label(self._week_days[i], text=event_info.get('hour') + ':' + event_info.get('minute') + ' ' + event_info.get('description').strip(), anchor='nw', justify='left'))
-                        self._week_events_labels[i][-1].config({'foreground': self._light_or_dark_mode_text(tuple(int(event_info.get('hex_color')[1:][j:j + 2], 16) for j in (0, 2, 4)))})
-                        self._week_events_labels[i][-1].config({'background': event_info.get('hex_color')})
-                        self._week_events_labels[i][-1].config({'wraplength': self._EVENT_LABEL_WRAPLENGTH})
-                        self._week_events_labels[i][-1].bind('<Button-1>', lambda event: event.widget.lift())
-                        self._week_events_labels[i][-1].bind('<Button-2>', lambda event, key=key, event_id=event_id: self._schedule_edit_remove(key, event_id))
-
-                        # Event display size based on duration
-                        y = self._fraction_of_day(int(event_info.get('hour')), int(event_info.get('minute')))
-
-                        if event_info.get('duration_hour') == '0'.zfill(2) and event_info.get('duration_minute') == '0'.zfill(2):
-                            self._week_events_labels[i][-1].place(relx=0.05, rely=y)
-                        else:
-                            h = self._fraction_of_day(int(event_info.get('duration_hour')), int(event_info.get('duration_minute')))
-                            self._week_events_labels[i][-1].place(relx=0.05, rely=y, relheight=h)
+                displayed_day = datetime.date.fromordinal(ordinal)
+                self._week_days_labels[i].config(text=calendar.day_name[displayed_day.weekday()].lower() + ' ' + str(displayed_day.day).zfill(2))
+
+                # Add labels to the pool of the day if it has more events than labels
+                labels = self._week_events_labels[i]
+
+                while len(labels) < len(events):
+                    labels.append(tk.Label(self._week_days[i], anchor='nw', justify='left', wraplength=self._EVENT_LABEL_WRAPLENGTH))
+                    labels[-1].bind('<Button-1>', lambda event: event.widget.lift())
+                    labels[-1].bind('<Button-2>', lambda event: self._schedule_edit_remove(*self._week_events_labels_occurrences[event.widget]))
+
+                # Display each event, reusing the labels of the day
+                for label, (start, duration, occurrence_ordinal, recurrence_id, event) in zip(labels, events):
+                    # Segments continuing from a previous day show when the event ends instead of when it starts
+                    if occurrence_ordinal == ordinal:
+                        displayed_time = str(event.start // self._NUMBER_MINUTES_IN_HOUR).zfill(2) + ':' + str(event.start % self._NUMBER_MINUTES_IN_HOUR).zfill(2) + ' '
+                    else:
+                        displayed_time = '-' + str((start + duration) // self._NUMBER_MINUTES_IN_HOUR).zfill(2) + ':' + str((start + duration) % self._NUMBER_MINUTES_IN_HOUR).zfill(2) + ' '
+
+                    label.configure(text=displayed_time + event.description, foreground=self._light_or_dark_mode_text(event.rgb()), background=event.hex_color())
+                    self._week_events_labels_occurrences[label] = (occurrence_ordinal, recurrence_id)
+
+                    # Event display size based on the duration of the segment
+                    if duration == 0:
+                        label.place(relx=0.05, rely=self._fraction_of_day(start), relheight='')
+                    else:
+                        label.place(relx=0.05, rely=self._fraction_of_day(start), relheight=self._fraction_of_day(duration))
+
+                    # Later events are displayed above earlier ones
+                    label.lift()
+
+                # Hide labels not needed for the day
+                for label in labels[len(events):]:
+                    label.place_forget()
 
         except:
             self._show_error('unable to load or update events.')
@@ -938,11 +1067,29 @@ class Hourglass:
         for i in range(self._NUMBER_DAYS_IN_WEEK):
             self._calendar_week_days_labels[i].config({'text': calendar_list[i + 2]})
         
+        # Days of the month with scheduled events, from the expanded window of the month and its previous day, whose events may last into the month
+        first_day = datetime.date(self._displayed_year, self._displayed_month, 1).toordinal()
+        number_days = calendar.monthrange(self._displayed_year, self._displayed_month)[1]
+        event_days = set()
+
+        for ordinal, events in self._schedule.window(first_day - 1, number_days + 1).items():
+            for event in events.values():
+                last_ordinal = ordinal + (event.start + max(1, event.duration) - 1) // self._NUMBER_MINUTES_IN_DAY
+
+                for day in range(max(ordinal, first_day), min(last_ordinal, first_day + number_days - 1) + 1):
+                    event_days.add(str(day - first_day + 1))
+
         # Labels for days of the month
         for i in range(self._NUMBER_DISPLAY_WEEKS_IN_MONTH):
             for j in range(self._NUMBER_DAYS_IN_WEEK):
                 self._calendar_month_days_labels[i][j].config({'text': calendar_list[i * self._NUMBER_DAYS_IN_WEEK + j + 2 + self._NUMBER_DAYS_IN_WEEK]})
 
+                # Underline days with scheduled events
+                if calendar_list[i * self._NUMBER_DAYS_IN_WEEK + j + 2 + self._NUMBER_DAYS_IN_WEEK] in event_days:
+                    self._calendar_month_days_labels[i][j].config({'font': self._calendar_event_day_font})
+                else:
+                    self._calendar_month_days_labels[i][j].config({'font': 'helvetica'})
+
                 try:
                     widget = self._calendar_month_days_labels[i][j]
                     day = datetime.datetime(self._displayed_year, self._displayed_month, int(self._calendar_month_days_labels[i][j].cget('text')))
@@ -958,7 +1105,7 @@ class Hourglass:
         if self._event_entry.get() == ' add new event...':
             self._event_entry.delete(1, tk.END)
             
-        self._event_entry.config({'foreground': self._entry_text_color})
+        self._event_entry.config({'foreground': self._theme.entry_text_color})
 
     def _event_entry_unfocus(self, *args):
         """
@@ -968,7 +1115,7 @@ class Hourglass:
             self._event_entry.delete(0, tk.END)
             self._event_entry.insert(0, ' add new event...')
 
-        self._event_entry.config({'foreground': self._prompt_text_color})
+        self._event_entry.config({'foreground': self._theme.prompt_text_color})
         self._root.focus_set()
 
     def _event_entry_enter(self, *args):
@@ -976,11 +1123,31 @@ class Hourglass:
         When enter is pressed and focus is on the event entry widget, remove focus and add event
         """
         if self._event_entry.get() != ' add new event...':
-            self._schedule_add(self._get_event_date(), self._get_event_hour(), self._get_event_minute(), self._get_event_duration_hour(), self._get_event_duration_minute(), self._current_event_hex, self._event_entry.get().strip(), self._current_event_recurrence_frequency.get(), self._current_event_recurrence_amount.get(), self._leap_years_mode.get())
+            self._schedule_add(self._get_event_date(), self._get_event_hour(), self._get_event_minute(), self._get_event_duration_hour(), self._get_event_duration_minute(), self._current_event_hex, self._event_entry.get().strip(), self._current_event_recurrence_frequency.get(), self._current_event_recurrence_amount.get(), self._leap_years_mode.get(), self._current_event_recurrence_month_day.get(), self._get_event_until())
             self._event_entry.delete(0, tk.END)
 
         self._event_entry_unfocus()
     
+    def _event_until_entry_focus(self, *args):
+        """
+        Focuses on the until entry widget, remove prompt text if it is displayed
+        """
+        if self._event_until_entry.get() == self._UNTIL_PROMPT:
+            self._event_until_entry.delete(0, tk.END)
+
+        self._event_until_entry.config({'foreground': self._theme.entry_text_color})
+
+    def _event_until_entry_unfocus(self, *args):
+        """
+        Unfocuses from the until entry widget, restoring prompt text if no date entered
+        """
+        if self._event_until_entry.get().strip() == '':
+            self._event_until_entry.delete(0, tk.END)
+            self._event_until_entry.insert(0, self._UNTIL_PROMPT)
+
+        if self._event_until_entry.get() == self._UNTIL_PROMPT:
+            self._event_until_entry.config({'foreground': self._theme.prompt_text_color})
+
     def _update_time_date_menu(self, *args):
         """
         Updates event day options based on currently selected year and month
@@ -1020,76 +1187,6 @@ class Hourglass:
         self._current_event_month.set(str(clicked_day.month).zfill(2))
         self._current_event_day.set(str(clicked_day.day).zfill(2))
     
-    def _to_do_read(self, file_name):
-        """
-        Reads from to-do list file
-
-        file_name: Name of the file to read from, string
-        """
-        try:
-            # If the to-do list file does not exist, create it
-            self._to_do_list_file_location = os.path.join(self._file_location, file_name)
-
-            if not os.path.exists(self._to_do_list_file_location):
-                with open(self._to_do_list_file_location, 'x') as opened_file:
-                    self._to_do_list_file = opened_file
-            
-            # Open and read
-            with open(self._to_do_list_file_location, 'r') as opened_file:
-                self._to_do_list_file = opened_file
-
-                # To-do list
-                self._to_do_list = []
-
-                # Read from to-do list file
-                lines = self._to_do_list_file.readlines()
-
-                for line in lines:
-                    key = str(uuid.uuid4())
-                    contents = line.strip()
-                    item = {'key': key, 'completion': contents[0], 'description': contents[1:]}
-                    self._to_do_list.append(item)
-                
-                # Close to-do list file
-                self._to_do_list_file.close()
-        except:
-            # Display an error message then exit the application
-            self._show_error('unable to read from to-do list file.')
-            sys.exit(1)
-
-    def _to_do_write(self, file_name):
-        """
-        Writes to to-do list file
-
-        file_name: Name of the file to write to, string
-        """
-        try:
-            # If the to-do list file does not exist, create it
-            self._to_do_list_file_location = os.path.join(self._file_location, file_name)
-
-            if not os.path.exists(self._to_do_list_file_location):
-                with open(self._to_do_list_file_location, 'x') as opened_file:
-                    self._to_do_list_file = opened_file
-            
-            # Open and write
-            with open(self._to_do_list_file_location, 'w') as opened_file:
-                self._to_do_list_file = opened_file
-            
-                # Clear to-do list file
-                self._to_do_list_file.seek(0)
-                self._to_do_list_file.truncate()
-
-                # Write to to-do list file
-                for item in self._to_do_list:
-                    self._to_do_list_file.write(item.get('completion') + item.get('description').strip() + '\n')
-                
-                # Close to-do list file
-                self._to_do_list_file.close()
-        except:
-            # Display an error message then exit the application
-            self._show_error('unable to write to to-do list file.')
-            sys.exit(1)
-
     def _to_do_list_toggle(self, item):
         """
         Toggles the check box for an item
@@ -1097,12 +1194,9 @@ class Hourglass:
         item: To-do list item, string
         """
         try:
-            index = self._to_do_list.index(item)
-
-            if self._to_do_list[index].get('completion') == str(self._CHECKBUTTON_OFF):
-                self._to_do_list[index]['completion'] = str(self._CHECKBUTTON_ON)
-            else:
-                self._to_do_list[index]['completion'] = str(self._CHECKBUTTON_OFF)
+            self._to_do.toggle(self._to_do.items.index(item))
+        except StorageError as error:
+            self._show_error(str(error))
         except:
             self._show_error('no such to-do list task.')
         
@@ -1114,9 +1208,10 @@ class Hourglass:
 
         description: Description of the to-do list item to be added, string
         """
-        key = str(uuid.uuid4())
-        item = {'key': key, 'completion': str(self._CHECKBUTTON_OFF), 'description': description}
-        self._to_do_list.append(item)
+        try:
+            self._to_do.add(description, str(self._CHECKBUTTON_OFF))
+        except StorageError as error:
+            self._show_error(str(error))
 
         self._update_to_do()
     
@@ -1130,7 +1225,7 @@ class Hourglass:
         """
         try:
             # Retrieve item key
-            key = self._to_do_list[index].get('key')
+            key = self._to_do.items[index].get('key')
 
             if key is not None:
                 popup = ToDoMenu(self._root, self._is_dark_mode, index, total, item, self._CHECKBUTTON_ON, self._CHECKBUTTON_OFF)
@@ -1139,13 +1234,14 @@ class Hourglass:
 
                 # Edit or remove item based on user response
                 if result[0] == 'remove':
-                    if self._to_do_list[index]['key'] == key:
-                        del self._to_do_list[index]
+                    if self._to_do.items[index]['key'] == key:
+                        self._to_do.remove(index)
 
                 elif result[0] == 'edit':
-                    if self._to_do_list[index]['key'] == key:
-                        del self._to_do_list[index]
-                        self._to_do_list.insert(result[1], result[2])
+                    if self._to_do.items[index]['key'] == key:
+                        self._to_do.move(index, result[1], result[2])
+        except StorageError as error:
+            self._show_error(str(error))
         except:
             self._show_error('no such to-do list task.')
         
@@ -1159,7 +1255,7 @@ class Hourglass:
         if self._to_do_entry.get() == ' add new to-do...':
             self._to_do_entry.delete(1, tk.END)
             
-        self._to_do_entry.config({'foreground': self._entry_text_color})
+        self._to_do_entry.config({'foreground': self._theme.entry_text_color})
 
     def _to_do_entry_unfocus(self, *args):
         """
@@ -1169,7 +1265,7 @@ class Hourglass:
             self._to_do_entry.delete(0, tk.END)
             self._to_do_entry.insert(0, ' add new to-do...')
 
-        self._to_do_entry.config({'foreground': self._prompt_text_color})
+        self._to_do_entry.config({'foreground': self._theme.prompt_text_color})
         self._root.focus_set()
 
     def _to_do_entry_enter(self, *args):
@@ -1186,23 +1282,21 @@ class Hourglass:
         """
         Updates to-do list to display current items
         """
-        self._to_do_list_display = [[] for _ in range(len(self._to_do_list))]
-        self._to_do_list_button_states = [tk.IntVar() for _ in range(len(self._to_do_list))]
+        self._to_do_list_display = [[] for _ in range(len(self._to_do.items))]
+        self._to_do_list_button_states = [tk.IntVar() for _ in range(len(self._to_do.items))]
 
         try:
             # Clear displayed items
             self._clear_to_do_list_display()
 
             # Display all to-do list items
-            total = len(self._to_do_list)
+            total = len(self._to_do.items)
 
             for i in range(total):
-                item = self._to_do_list[i]
+                item = self._to_do.items[i]
                 self._to_do_list_button_states[i].set(int(item.get('completion')))
 
-                self._to_do_list_display.append(tk.Checkbutton(self._to_do_list_frame, text=item.get('description'), variable=self._to_do_list_button_states[i], onvalue=self._CHECKBUTTON_ON, offvalue=self._CHECKBUTTON_OFF, anchor='w', justify='left', command=lambda item=item: self._to_do_list_toggle(item)))
-                self._to_do_list_display[-1].config({'foreground': self._label_text_color})
-                self._to_do_list_display[-1].config({'background': self._widget_color})
+                self._to_do_list_display.append(self._theme.register(tk.Checkbutton(self._to_do_list_frame, text=item.get('description'), variable=self._to_do_list_button_states[i], onvalue=self._CHECKBUTTON_ON, offvalue=self._CHECKBUTTON_OFF, anchor='w', justify='left', command=lambda item=item: self._to_do_list_toggle(item)), 'label'))
                 self._to_do_list_display[-1].config({'highlightthickness': 0})
                 self._to_do_list_display[-1].bind('<Button-2>', lambda event, i=i, total=total, item=item: self._to_do_list_edit_remove(i, total, item))
                 self._to_do_list_display[-1].grid(row=i, column=0, padx=(2, 2), sticky='NWSE')
@@ -1211,13 +1305,16 @@ class Hourglass:
     
     def _save(self, *args):
         """
-        Saves current schedule and to-do list
+        Saves a snapshot of the current schedule and to-do list
         """
         self._widget_pressed(self._save_label)
 
-        # Save schedule and to-do list
-        self._schedule_write(self._schedule_old_file_name)
-        self._to_do_write(self._to_do_list_old_file_name)
+        # Snapshots share the chunks of the schedule and to-do list files unchanged since another snapshot
+        try:
+            snapshots = Snapshots(os.path.join(self._file_location, self._snapshot_directory_name), self._SNAPSHOTS_RECENT, self._SNAPSHOTS_DAILY, self._SNAPSHOTS_WEEKLY, self._SNAPSHOTS_MONTHLY)
+            snapshots.take(self._schedule.series(), self._to_do.tasks())
+        except StorageError as error:
+            self._show_error(str(error))
     
     def _choose_color(self, *args):
         """
@@ -1245,100 +1342,8 @@ class Hourglass:
         else:
             self._theme_mode_label.config(text='☼')
         
-        self._set_colors(self._is_dark_mode)
-
-        self._change_colors(parent=None)
-    
-    def _set_colors(self, darkmode):
-        """
-        Sets colors used by application
-
-        darkmode: Whether the application is currently in dark mode or not, boolean
-        """
-        if darkmode:
-            # Dark mode colors
-            self._prompt_text_color = '#838383'
-            self._entry_text_color = '#c2c2c2'
-            self._label_text_color = '#c2c2c2'
-            self._menu_text_color = '#ebebeb'
-            self._background_color = '#2c2c2c'
-            self._widget_color = '#383838'
-            self._pressed_widget_color = '#2e2e2e'
-            self._faint_text_color = '#494949'
-            self._faint_display_color = '#424242'
-        else:
-            # Light mode colors
-            self._prompt_text_color = '#797979'
-            self._entry_text_color = '#4b4b4b'
-            self._label_text_color = '#4b4b4b'
-            self._menu_text_color = '#505050'
-            self._background_color = '#d3d3d3'
-            self._widget_color = '#b3b3b3'
-            self._pressed_widget_color = '#969696'
-            self._faint_text_color = '#a5a5a5'
-            self._faint_display_color = '#a1a1a1'
-    
-    def _change_colors(self, parent=None):
-        """
-        Changes colors for widget and all descendant widgets based on current theme mode
-
-        parent: Widget to change color for, tkinter widget
-        """
-        # If no widget provided, start at root
-        if parent is None:
-            parent = self._root
-            parent.config({'background': self._background_color})
-        
-        # Change color for all descendant widgets
-        for child in parent.winfo_children():
-            if type(child) is not tk.Toplevel and child.winfo_children():
-                self._change_colors(parent=child)
-            
-            if child is self._placeholder_frame_widget or child is self._placeholder_text_widget:
-                child.config({'foreground': self._background_color})
-                child.config({'background': self._background_color})
-
-            elif type(child) is tk.Label and parent not in self._week_days:
-                if child in [self._time_separator_label, self._date_separator_label]:
-                    child.config({'foreground': self._label_text_color})
-                    child.config({'background': self._background_color})
-                elif parent is self._event_entry_secondary_frame:
-                    child.config({'foreground': self._prompt_text_color})
-                    child.config({'background': self._background_color})
-                else:
-                    child.config({'foreground': self._label_text_color})
-                    child.config({'background': self._widget_color})
-
-                    if child is self._color_selection_label:
-                        self._current_event_hex = child.cget('background')
-            
-            elif type(child) is tk.Entry:
-                child.config({'foreground': self._prompt_text_color})
-                child.config({'background': self._widget_color})
-            
-            elif type(child) is tk.LabelFrame:
-                child.config({'foreground': self._faint_text_color})
-                child.config({'background': self._widget_color})
-            
-            elif type(child) is tk.OptionMenu:
-                child.config({'foreground': self._menu_text_color})
-                child.config({'background': self._background_color})
-            
-            elif type(child) is tk.Checkbutton:
-                if child is self._leap_years_checkbutton:
-                    child.config({'foreground': self._prompt_text_color})
-                    child.config({'background': self._background_color})
-                else:
-                    child.config({'foreground': self._label_text_color})
-                    child.config({'background': self._widget_color})
-
-            elif type(child) is tk.Frame:
-                if child in [self._week_frame, self._week_buttons_frame, self._calendar_frame, self._month_buttons_frame, self._to_do_frame] or child is self._to_do_list_frame or child in self._week_days:
-                    child.config({'background': self._widget_color})
-                elif any(child in element for element in self._week_day_time_references):
-                    child.config({'background': self._faint_display_color})
-                else:
-                    child.config({'background': self._background_color})
+        self._theme.set_mode(self._is_dark_mode)
+        self._current_event_hex = self._color_selection_label.cget('background')
     
     def _widget_pressed(self, widget):
         """
@@ -1346,7 +1351,7 @@ class Hourglass:
 
         widget: The pressed widget, tkinter widget
         """
-        widget.config({'background': self._pressed_widget_color})
+        widget.config({'background': self._theme.pressed_widget_color})
 
     def _widget_released(self, widget):
         """
@@ -1354,7 +1359,7 @@ class Hourglass:
         
         widget: The pressed widget, tkinter widget
         """
-        widget.config({'background': self._widget_color})
+        widget.config({'background': self._theme.widget_color})
     
     def _widget_focus(self, widget):
         """
@@ -1368,33 +1373,47 @@ class Hourglass:
         except:
             pass
     
-    def _clear_day(self, parent):
-        """
-        Clears displayed events of a day
-
-        parent: The day to clear, tk.Frame
-        """
-        for child in parent.winfo_children():
-            # Do not clear visual, non-event elements
-            if not any(child in element for element in self._week_day_time_references) and not any(child in element for element in self._week_day_separators):
-                child.destroy()
-    
     def _clear_to_do_list_display(self):
         """
         Clears displayed to-do list items
         """
         for child in self._to_do_list_frame.winfo_children():
+            self._theme.unregister(child)
             child.destroy()
     
-    def _fraction_of_day(self, hour, minute):
+    def _fraction_of_day(self, minutes):
         """
         Returns the fraction of the day corresponding to the given time
 
-        hour: Hour, int
-        minute: Minute, int
+        minutes: Minutes since midnight, int
         return: Fraction of the day, float
         """
-        return (hour * 60 + minute) / (24 * 60)
+        return minutes / self._NUMBER_MINUTES_IN_DAY
+
+    def _day_segments(self, start, duration):
+        """
+        Splits an occurrence into one segment for each day it lasts into
+
+        start: Start time, minutes since midnight, int
+        duration: Duration in minutes, int
+        return: Segments in order, list of tuples, (number of days after the day of the occurrence, segment start in minutes since midnight, segment duration in minutes)
+        """
+        # Events without a duration are displayed on the day they start only
+        if duration == 0:
+            return [(0, start, 0)]
+
+        end = start + duration
+
+        return [(days, max(start, days * self._NUMBER_MINUTES_IN_DAY) - days * self._NUMBER_MINUTES_IN_DAY, min(end, (days + 1) * self._NUMBER_MINUTES_IN_DAY) - max(start, days * self._NUMBER_MINUTES_IN_DAY)) for days in range(start // self._NUMBER_MINUTES_IN_DAY, (end - 1) // self._NUMBER_MINUTES_IN_DAY + 1)]
+
+    def _datetime_minutes(self, moment):
+        """
+        Returns the given moment as the number of minutes since the start of the calendar
+
+        moment: Moment, datetime
+        return: Minutes, int
+        """
+        return moment.toordinal() * self._NUMBER_MINUTES_IN_DAY + moment.hour * self._NUMBER_MINUTES_IN_HOUR + moment.minute
 
     def _light_or_dark_mode_text(self, rgb):
         """
@@ -1419,6 +1438,16 @@ class Hourglass:
         """
         return (self._current_event_year.get(), self._current_event_month.get(), self._current_event_day.get())
 
+    def _get_event_until(self):
+        """
+        Returns the last day entered for recurring events
+
+        return: yyyy-mm-dd, or an empty string if not entered, string
+        """
+        until = self._event_until_entry.get().strip()
+
+        return '' if until == self._UNTIL_PROMPT.strip() else until
+
     def _get_event_hour(self):
         """
         Returns the current event start hour entered
@@ -1465,20 +1494,107 @@ class Hourglass:
         """
         msg = messagebox.showerror('hourglass error', message)
 
+class Theme:
+    """
+    Class for the light and dark mode colors of a window
+
+    Records the role of each widget when it is created, then colors all widgets of a role with the same options
+    """
+    def __init__(self, darkmode):
+        """
+        Initializes the Theme class
+
+        darkmode: Whether to use dark mode colors or not, boolean
+        """
+        # Role of each registered widget
+        # {widget: role}
+        self._widgets = {}
+
+        self.set_mode(darkmode)
+
+    def set_mode(self, darkmode):
+        """
+        Sets the colors of the theme and applies them to all registered widgets
+
+        darkmode: Whether to use dark mode colors or not, boolean
+        """
+        if darkmode:
+            # Dark mode colors
+            self.prompt_text_color = '#838383'
+            self.entry_text_color = '#c2c2c2'
+            self.label_text_color = '#c2c2c2'
+            self.menu_text_color = '#ebebeb'
+            self.background_color = '#2c2c2c'
+            self.widget_color = '#383838'
+            self.pressed_widget_color = '#2e2e2e'
+            self.faint_text_color = '#494949'
+            self.faint_display_color = '#424242'
+        else:
+            # Light mode colors
+            self.prompt_text_color = '#797979'
+            self.entry_text_color = '#4b4b4b'
+            self.label_text_color = '#4b4b4b'
+            self.menu_text_color = '#505050'
+            self.background_color = '#d3d3d3'
+            self.widget_color = '#b3b3b3'
+            self.pressed_widget_color = '#969696'
+            self.faint_text_color = '#a5a5a5'
+            self.faint_display_color = '#a1a1a1'
+
+        # Options of each role
+        self._styles = {
+            'window': {'background': self.background_color},
+            'frame': {'background': self.background_color},
+            'panel': {'background': self.widget_color},
+            'time_reference': {'background': self.faint_display_color},
+            'time_reference_label': {'foreground': self.faint_text_color, 'background': self.widget_color},
+            'label': {'foreground': self.label_text_color, 'background': self.widget_color},
+            'disabled_label': {'foreground': self.faint_text_color, 'background': self.widget_color},
+            'plain_label': {'foreground': self.label_text_color, 'background': self.background_color},
+            'prompt_label': {'foreground': self.prompt_text_color, 'background': self.background_color},
+            'heading': {'foreground': self.entry_text_color, 'background': self.background_color},
+            'entry': {'foreground': self.prompt_text_color, 'background': self.widget_color},
+            'menu': {'foreground': self.menu_text_color, 'background': self.background_color},
+            'placeholder': {'foreground': self.background_color, 'background': self.background_color}
+        }
+
+        for widget, role in self._widgets.items():
+            widget.config(self._styles[role])
+
+    def register(self, widget, role):
+        """
+        Records the role of a widget and applies the colors of the role to it
+
+        widget: The widget, tkinter widget
+        role: Role of the widget, string
+        return: The widget, tkinter widget
+        """
+        self._widgets[widget] = role
+        widget.config(self._styles[role])
+        return widget
+
+    def unregister(self, widget):
+        """
+        Stops applying colors to a widget, if registered
+
+        widget: The widget, tkinter widget
+        """
+        self._widgets.pop(widget, None)
+
 class EventMenu:
     """
     Class for the event edit/remove menu
 
     Creates a GUI popup for Hourglass
     """
-    def __init__(self, parent, darkmode, key, event_info, minutes_in_hour, hours_in_day):
+    def __init__(self, parent, darkmode, date, event, minutes_in_hour, hours_in_day):
         """
         Initializes the EventMenu class
 
         parent: Parent widget, tkinter widget
         darkmode: Whether the parent is currently in dark mode or not, boolean
-        key: Tuple of strings, (yyyy, mm, dd)
-        event_info: Event information, dict
+        date: Date of the clicked occurrence, date
+        event: Event series, Event
         minutes_in_hour: The number of minutes in an hour, int
         hours_in_day: The number of hours in a day, int
         """
@@ -1486,19 +1602,22 @@ class EventMenu:
         self._NUMBER_MINUTES_IN_HOUR = minutes_in_hour
         self._NUMBER_HOURS_IN_DAY = hours_in_day
 
+        # Descriptions of the days of the month of monthly and yearly recurring events other than the date of the first occurrence
+        self._MONTH_DAY_TEXTS = {'weekday': ' on the same weekday', 'last_weekday': ' on the last weekday', 'last_day': ' on the last day'}
+
         # Set colors
-        self._set_colors(darkmode)
+        self._theme = Theme(darkmode)
         self._dark_mode_display_text_color = '#c2c2c2'
         self._light_mode_display_text_color = '#4b4b4b'
 
         # Set event information
-        self._key = key
-        self._event_info = event_info.copy()
-        self._current_event_hex = self._event_info.get('hex_color')
+        self._date = date
+        self._event = event.copy()
+        self._current_event_hex = self._event.hex_color()
         self._selected = None
 
         # Window
-        self._root = tk.Toplevel(parent)
+        self._root = self._theme.register(tk.Toplevel(parent), 'window')
 
         # Title
         self._root.title('edit event...')
@@ -1534,31 +1653,43 @@ class EventMenu:
         self._time_color_duration_setup()
         self._text_setup()
         self._buttons_setup()
-
-        self._change_colors()
     
     def _date_recurrence_setup(self):
         """
         Sets up the event date and event recurrence component of the popup window
         """
         # Frame for date and recurrence
-        self._date_recurrence_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._date_recurrence_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'frame')
         self._date_recurrence_frame.grid(row=0, column=0, padx=(6, 6), pady=(6, 3), sticky='NWSE')
         
         self._date_recurrence_frame.columnconfigure(0, weight=0)
         self._date_recurrence_frame.columnconfigure(1, weight=0)
 
         # Event date
-        self._date_label = tk.Label(self._date_recurrence_frame, text=calendar.month_name[int(self._key[1])] + ' ' + self._key[2] + ', ' + self._key[0], borderwidth=0, highlightthickness=0)
+        self._date_label = self._theme.register(tk.Label(self._date_recurrence_frame, text=calendar.month_name[self._date.month] + ' ' + str(self._date.day).zfill(2) + ', ' + str(self._date.year), borderwidth=0, highlightthickness=0), 'heading')
         self._date_label.grid(row=0, column=0, padx=(0, 3), sticky='NWSE')
 
         # Event recurrence
-        if self._event_info.get('frequency').strip() == 'none':
+        if self._event.frequency == 'none' and self._event.series_id is not None:
+            recurrence_text = 'Edited occurrence of a recurring event'
+        elif self._event.frequency == 'none':
             recurrence_text = 'Not recurring'
         else:
-            recurrence_text = 'Recurring ' + self._event_info.get('frequency').strip() + ', ' + str(int(self._event_info.get('amount'))) + ' times'
+            recurrence_text = 'Recurring ' + self._event.frequency
+
+            if self._event.frequency in ('monthly', 'yearly'):
+                recurrence_text = recurrence_text + self._MONTH_DAY_TEXTS.get(self._event.month_day, '')
+
+            # Series without a number of occurrences recur until their until date, or until removed
+            if self._event.amount != 0:
+                recurrence_text = recurrence_text + ', ' + str(self._event.amount) + ' times'
+
+            if self._event.until is not None:
+                recurrence_text = recurrence_text + ', until ' + datetime.date.fromordinal(self._event.until).strftime('%m/%d/%Y')
+            elif self._event.amount == 0:
+                recurrence_text = recurrence_text + ', forever'
         
-        self._recurrence_label = tk.Label(self._date_recurrence_frame, text=recurrence_text, borderwidth=0, highlightthickness=0)
+        self._recurrence_label = self._theme.register(tk.Label(self._date_recurrence_frame, text=recurrence_text, borderwidth=0, highlightthickness=0), 'heading')
         self._recurrence_label.grid(row=0, column=1, padx=(3, 0), sticky='NWSE')
 
     def _time_color_duration_setup(self):
@@ -1566,7 +1697,7 @@ class EventMenu:
         Sets up the event time, color, and event duration component of the popup window
         """
         # Frame for start time and color
-        self._time_color_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._time_color_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'frame')
         self._time_color_frame.grid(row=1, column=0, padx=(6, 6), pady=(3, 3), sticky='NWSE')
         
         self._time_color_frame.columnconfigure(0, weight=1)
@@ -1575,60 +1706,61 @@ class EventMenu:
             self._time_color_frame.columnconfigure(i, weight=0)
 
         # Frame for duration
-        self._duration_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._duration_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'frame')
         self._duration_frame.grid(row=2, column=0, padx=(6, 6), pady=(3, 3), sticky='NWSE')
 
         # For selecting color
         self._color_selection_label = tk.Label(self._time_color_frame, text='   ✏   ', borderwidth=0, highlightthickness=0)
+        self._color_selection_label.config({'foreground': self._light_or_dark_mode_text(self._event.rgb()), 'background': self._current_event_hex})
         self._color_selection_label.bind('<Button-1>', self._choose_color)
         self._color_selection_label.grid(row=0, column=0, padx=(0, 3), sticky='NWSE')
 
         # For selecting event start time
         # For selecting event start hour
         self._current_event_hour = tk.StringVar(self._time_color_frame)
-        self._current_event_hour.set(self._event_info.get('hour'))
+        self._current_event_hour.set(str(self._event.start // self._NUMBER_MINUTES_IN_HOUR).zfill(2))
         self._dropdown_hours = [str(i).zfill(2) for i in range(0, self._NUMBER_HOURS_IN_DAY)]
-        self._hour_selection_menu = tk.OptionMenu(self._time_color_frame, self._current_event_hour, *self._dropdown_hours)
+        self._hour_selection_menu = self._theme.register(tk.OptionMenu(self._time_color_frame, self._current_event_hour, *self._dropdown_hours), 'menu')
         self._hour_selection_menu.config({'borderwidth': 0, 'highlightthickness': 0})
         self._hour_selection_menu.grid(row=0, column=1, padx=(3, 0), pady=(2, 0), sticky='NWSE')
 
         # For hour:minute formatting
-        self._time_separator_label = tk.Label(self._time_color_frame, text=':', justify='center', borderwidth=0, highlightthickness=0)
+        self._time_separator_label = self._theme.register(tk.Label(self._time_color_frame, text=':', justify='center', borderwidth=0, highlightthickness=0), 'plain_label')
         self._time_separator_label.grid(row=0, column=2, sticky='NWSE')
 
         # For selecting event start minute
         self._current_event_minute = tk.StringVar(self._time_color_frame)
-        self._current_event_minute.set(self._event_info.get('minute'))
+        self._current_event_minute.set(str(self._event.start % self._NUMBER_MINUTES_IN_HOUR).zfill(2))
         self._dropdown_minutes = [str(i).zfill(2) for i in range(self._NUMBER_MINUTES_IN_HOUR)]
-        self._minute_selection_menu = tk.OptionMenu(self._time_color_frame, self._current_event_minute, *self._dropdown_minutes)
+        self._minute_selection_menu = self._theme.register(tk.OptionMenu(self._time_color_frame, self._current_event_minute, *self._dropdown_minutes), 'menu')
         self._minute_selection_menu.config({'borderwidth': 0, 'highlightthickness': 0})
         self._minute_selection_menu.grid(row=0, column=3, padx=(1, 0), pady=(2, 0), sticky='NWSE')
 
         # For selecting event duration
         # Duration label
-        self._event_duration_label = tk.Label(self._duration_frame, text='duration (optional):', justify='center', borderwidth=0, highlightthickness=0)
+        self._event_duration_label = self._theme.register(tk.Label(self._duration_frame, text='duration (optional):', justify='center', borderwidth=0, highlightthickness=0), 'prompt_label')
         self._event_duration_label.grid(row=0, column=0, pady=(0, 2), sticky='NWSE')
 
         # For selecting duration hour
         self._current_event_duration_hour = tk.StringVar(self._duration_frame)
-        self._current_event_duration_hour.set(self._event_info.get('duration_hour'))
+        self._current_event_duration_hour.set(str(self._event.duration // self._NUMBER_MINUTES_IN_HOUR).zfill(2))
         self._dropdown_duration_hour = [str(i).zfill(2) for i in range(self._NUMBER_HOURS_IN_DAY)]
-        self._duration_hour_menu = tk.OptionMenu(self._duration_frame, self._current_event_duration_hour, *self._dropdown_duration_hour)
+        self._duration_hour_menu = self._theme.register(tk.OptionMenu(self._duration_frame, self._current_event_duration_hour, *self._dropdown_duration_hour), 'menu')
         self._duration_hour_menu.grid(row=0, column=1, padx=(3, 3), sticky='NWSE')
 
         # Duration hour label
-        self._event_duration_hour_label = tk.Label(self._duration_frame, text='hour(s)', justify='center', borderwidth=0, highlightthickness=0)
+        self._event_duration_hour_label = self._theme.register(tk.Label(self._duration_frame, text='hour(s)', justify='center', borderwidth=0, highlightthickness=0), 'prompt_label')
         self._event_duration_hour_label.grid(row=0, column=2, pady=(0, 2), sticky='NWSE')
 
         # For selecting duration minute
         self._current_event_duration_minute = tk.StringVar(self._duration_frame)
-        self._current_event_duration_minute.set(self._event_info.get('duration_minute'))
+        self._current_event_duration_minute.set(str(self._event.duration % self._NUMBER_MINUTES_IN_HOUR).zfill(2))
         self._dropdown_duration_minute = [str(i).zfill(2) for i in range(self._NUMBER_MINUTES_IN_HOUR)]
-        self._duration_minute_menu = tk.OptionMenu(self._duration_frame, self._current_event_duration_minute, *self._dropdown_duration_minute)
+        self._duration_minute_menu = self._theme.register(tk.OptionMenu(self._duration_frame, self._current_event_duration_minute, *self._dropdown_duration_minute), 'menu')
         self._duration_minute_menu.grid(row=0, column=3, padx=(3, 3), sticky='NWSE')
 
         # Duration minute label
-        self._event_duration_minute_label = tk.Label(self._duration_frame, text='minute(s)', justify='center', borderwidth=0, highlightthickness=0)
+        self._event_duration_minute_label = self._theme.register(tk.Label(self._duration_frame, text='minute(s)', justify='center', borderwidth=0, highlightthickness=0), 'prompt_label')
         self._event_duration_minute_label.grid(row=0, column=4, padx=(0, 3), pady=(0, 2), sticky='NWSE')
 
     def _text_setup(self):
@@ -1636,8 +1768,8 @@ class EventMenu:
         Sets up the event description component of the popup window
         """
         # Event description
-        self._text = tk.Text(self._root, width=1, height=1, borderwidth=0, highlightthickness=0)
-        self._text.insert(tk.END, self._event_info.get('description'))
+        self._text = self._theme.register(tk.Text(self._root, width=1, height=1, borderwidth=0, highlightthickness=0), 'entry')
+        self._text.insert(tk.END, self._event.description)
         self._text.grid(row=3, column=0, padx=(6, 6), pady=(3, 3), sticky='NWSE')
 
     def _buttons_setup(self):
@@ -1645,7 +1777,7 @@ class EventMenu:
         Sets up the edit/remove and cancel buttons of the popup window
         """
         # Frame for buttons
-        self._buttons_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._buttons_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'frame')
         self._buttons_frame.grid(row=4, column=0, padx=(6, 6), pady=(3, 6), sticky='NWSE')
 
         self._buttons_frame.columnconfigure(0, weight=3)
@@ -1654,37 +1786,37 @@ class EventMenu:
             self._buttons_frame.columnconfigure(i, weight=2)
 
         # Edit button
-        self._edit_button = tk.Label(self._buttons_frame, text='edit', borderwidth=0, highlightthickness=0)
+        self._edit_button = self._theme.register(tk.Label(self._buttons_frame, text='edit', borderwidth=0, highlightthickness=0), 'label')
         self._edit_button.bind('<Button-1>', lambda event: self._select(event.widget, 'edit'))
         self._edit_button.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._edit_button.grid(row=0, column=0, padx=(50, 3), sticky='NWSE')
 
         # Edit all button
-        self._edit_all_button = tk.Label(self._buttons_frame, text='edit all', borderwidth=0, highlightthickness=0)
+        self._edit_all_button = self._theme.register(tk.Label(self._buttons_frame, text='edit all', borderwidth=0, highlightthickness=0), 'label' if self._event.frequency != 'none' else 'disabled_label')
 
-        if self._event_info.get('frequency').strip() != 'none':
+        if self._event.frequency != 'none':
             self._edit_all_button.bind('<Button-1>', lambda event: self._select(event.widget, 'edit_all'))
 
         self._edit_all_button.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._edit_all_button.grid(row=0, column=1, padx=(3, 3), sticky='NWSE')
 
         # Remove button
-        self._remove_button = tk.Label(self._buttons_frame, text='remove', borderwidth=0, highlightthickness=0)
+        self._remove_button = self._theme.register(tk.Label(self._buttons_frame, text='remove', borderwidth=0, highlightthickness=0), 'label')
         self._remove_button.bind('<Button-1>', lambda event: self._select(event.widget, 'remove'))
         self._remove_button.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._remove_button.grid(row=0, column=2, padx=(3, 3), sticky='NWSE')
 
         # Remove all button
-        self._remove_all_button = tk.Label(self._buttons_frame, text='remove all', borderwidth=0, highlightthickness=0)
+        self._remove_all_button = self._theme.register(tk.Label(self._buttons_frame, text='remove all', borderwidth=0, highlightthickness=0), 'label' if self._event.frequency != 'none' else 'disabled_label')
 
-        if self._event_info.get('frequency').strip() != 'none':
+        if self._event.frequency != 'none':
             self._remove_all_button.bind('<Button-1>', lambda event: self._select(event.widget, 'remove_all'))
 
         self._remove_all_button.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._remove_all_button.grid(row=0, column=3, padx=(3, 3), sticky='NWSE')
 
         # Cancel button
-        self._cancel_button = tk.Label(self._buttons_frame, text='cancel', borderwidth=0, highlightthickness=0)
+        self._cancel_button = self._theme.register(tk.Label(self._buttons_frame, text='cancel', borderwidth=0, highlightthickness=0), 'label')
         self._cancel_button.bind('<Button-1>', lambda event: self._select(event.widget, None))
         self._cancel_button.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._cancel_button.grid(row=0, column=4, padx=(3, 0), sticky='NWSE')
@@ -1714,91 +1846,13 @@ class EventMenu:
         self._selected = selection
 
         if selection is not None:
-            self._event_info['hour'] = self._current_event_hour.get()
-            self._event_info['minute'] = self._current_event_minute.get()
-            self._event_info['duration_hour'] = self._current_event_duration_hour.get()
-            self._event_info['duration_minute'] = self._current_event_duration_minute.get()
-            self._event_info['hex_color'] = self._current_event_hex
-            self._event_info['description'] = self._text.get('1.0', tk.END).strip()
+            self._event.start = int(self._current_event_hour.get()) * self._NUMBER_MINUTES_IN_HOUR + int(self._current_event_minute.get())
+            self._event.duration = int(self._current_event_duration_hour.get()) * self._NUMBER_MINUTES_IN_HOUR + int(self._current_event_duration_minute.get())
+            self._event.color = int(self._current_event_hex[1:], 16)
+            self._event.description = self._text.get('1.0', tk.END).strip()
 
         self._root.destroy()
     
-    def _set_colors(self, darkmode):
-        """
-        Sets colors used by popup
-
-        darkmode: Whether the application is currently in dark mode or not, boolean
-        """
-        if darkmode:
-            # Dark mode colors
-            self._prompt_text_color = '#838383'
-            self._entry_text_color = '#c2c2c2'
-            self._label_text_color = '#c2c2c2'
-            self._menu_text_color = '#ebebeb'
-            self._background_color = '#2c2c2c'
-            self._widget_color = '#383838'
-            self._pressed_widget_color = '#2e2e2e'
-            self._faint_text_color = '#494949'
-            self._faint_display_color = '#424242'
-        else:
-            # Light mode colors
-            self._prompt_text_color = '#797979'
-            self._entry_text_color = '#4b4b4b'
-            self._label_text_color = '#4b4b4b'
-            self._menu_text_color = '#505050'
-            self._background_color = '#d3d3d3'
-            self._widget_color = '#b3b3b3'
-            self._pressed_widget_color = '#969696'
-            self._faint_text_color = '#a5a5a5'
-            self._faint_display_color = '#a1a1a1'
-    
-    def _change_colors(self, parent=None):
-        """
-        Changes colors for widget and all descendant widgets based on current theme mode
-
-        parent: Widget to change color for, tkinter widget
-        """
-        # If no widget provided, start at root
-        if parent is None:
-            parent = self._root
-            parent.config({'background': self._background_color})
-        
-        # Change color for all descendant widgets
-        for child in parent.winfo_children():
-            if child.winfo_children():
-                self._change_colors(parent=child)
-
-            if type(child) is tk.Label:
-                if child is self._color_selection_label:
-                    child.config({'foreground': self._light_or_dark_mode_text(tuple(int(self._current_event_hex[1:][i:i + 2], 16) for i in (0, 2, 4)))})
-                    child.config({'background': self._current_event_hex})
-                elif parent is self._date_recurrence_frame:
-                    child.config({'foreground': self._entry_text_color})
-                    child.config({'background': self._background_color})
-                elif parent is self._time_color_frame:
-                    child.config({'foreground': self._label_text_color})
-                    child.config({'background': self._background_color})
-                elif parent is self._duration_frame:
-                    child.config({'foreground': self._prompt_text_color})
-                    child.config({'background': self._background_color})
-                elif self._event_info.get('frequency').strip() == 'none' and child in [self._edit_all_button, self._remove_all_button]:
-                    child.config({'foreground': self._faint_text_color})
-                    child.config({'background': self._widget_color})
-                else:
-                    child.config({'foreground': self._label_text_color})
-                    child.config({'background': self._widget_color})
-            
-            elif type(child) is tk.OptionMenu:
-                child.config({'foreground': self._menu_text_color})
-                child.config({'background': self._background_color})
-            
-            elif type(child) is tk.Text:
-                child.config({'foreground': self._prompt_text_color})
-                child.config({'background': self._widget_color})
-
-            elif type(child) is tk.Frame:
-                child.config({'background': self._background_color})
-    
     def _light_or_dark_mode_text(self, rgb):
         """
         Returns the text color to be used on the given background color
@@ -1820,7 +1874,7 @@ class EventMenu:
 
         widget: The pressed widget, tkinter widget
         """
-        widget.config({'background': self._pressed_widget_color})
+        widget.config({'background': self._theme.pressed_widget_color})
 
     def _widget_released(self, widget):
         """
@@ -1828,7 +1882,7 @@ class EventMenu:
         
         widget: The pressed widget, tkinter widget
         """
-        widget.config({'background': self._widget_color})
+        widget.config({'background': self._theme.widget_color})
 
     def show(self):
         """
@@ -1838,7 +1892,7 @@ class EventMenu:
         """
         self._root.deiconify()
         self._root.wait_window(self._root)
-        return (self._selected, self._event_info)
+        return (self._selected, self._event)
 
 class ToDoMenu:
     """
@@ -1863,7 +1917,7 @@ class ToDoMenu:
         self._CHECKBUTTON_OFF = checkbutton_off
 
         # Set colors
-        self._set_colors(darkmode)
+        self._theme = Theme(darkmode)
 
         # Set to-do list item information
         self._item = item.copy()
@@ -1872,7 +1926,7 @@ class ToDoMenu:
         self._selected = None
 
         # Window
-        self._root = tk.Toplevel(parent)
+        self._root = self._theme.register(tk.Toplevel(parent), 'window')
 
         # Title
         self._root.title('edit to-do...')
@@ -1905,36 +1959,34 @@ class ToDoMenu:
         self._index_completion_setup()
         self._text_setup()
         self._buttons_setup()
-
-        self._change_colors()
     
     def _index_completion_setup(self):
         """
         Sets up the to-do item index and completion status component of the popup window
         """
         # Frame for to-do task index
-        self._index_completion_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._index_completion_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'frame')
         self._index_completion_frame.grid(row=0, column=0, padx=(6, 6), pady=(6, 3), sticky='NWSE')
         
         self._index_completion_frame.columnconfigure(0, weight=0)
         self._index_completion_frame.columnconfigure(1, weight=0)
 
         # Item index
-        self._index_label = tk.Label(self._index_completion_frame, text='rank:', borderwidth=0, highlightthickness=0)
+        self._index_label = self._theme.register(tk.Label(self._index_completion_frame, text='rank:', borderwidth=0, highlightthickness=0), 'plain_label')
         self._index_label.grid(row=0, column=0, sticky='NWSE')
 
         # For selecting item index
         self._current_item_index = tk.IntVar(self._index_completion_frame)
         self._current_item_index.set(self._index + 1)
         self._dropdown_indices = [i for i in range(1, self._total + 1)]
-        self._hour_selection_menu = tk.OptionMenu(self._index_completion_frame, self._current_item_index, *self._dropdown_indices)
+        self._hour_selection_menu = self._theme.register(tk.OptionMenu(self._index_completion_frame, self._current_item_index, *self._dropdown_indices), 'menu')
         self._hour_selection_menu.config({'borderwidth': 0, 'highlightthickness': 0})
         self._hour_selection_menu.grid(row=0, column=1, padx=(3, 3), pady=(2, 0), sticky='NWSE')
 
         # For selecting item completion
         self._completion = tk.IntVar(self._index_completion_frame)
         self._completion.set(self._item.get('completion'))
-        self._completion_checkbutton = tk.Checkbutton(self._index_completion_frame, text='complete', variable=self._completion, onvalue=self._CHECKBUTTON_ON, offvalue=self._CHECKBUTTON_OFF, anchor='w', justify='left')
+        self._completion_checkbutton = self._theme.register(tk.Checkbutton(self._index_completion_frame, text='complete', variable=self._completion, onvalue=self._CHECKBUTTON_ON, offvalue=self._CHECKBUTTON_OFF, anchor='w', justify='left'), 'plain_label')
         self._completion_checkbutton.config({'highlightthickness': 0})
         self._completion_checkbutton.grid(row=0, column=2, padx=(3, 0), pady=(2, 0), sticky='NWSE')
 
@@ -1943,7 +1995,7 @@ class ToDoMenu:
         Sets up the to-do item description component of the popup window
         """
         # To-do item description
-        self._text = tk.Text(self._root, width=1, height=1, borderwidth=0, highlightthickness=0)
+        self._text = self._theme.register(tk.Text(self._root, width=1, height=1, borderwidth=0, highlightthickness=0), 'entry')
         self._text.insert(tk.END, self._item.get('description'))
         self._text.grid(row=1, column=0, padx=(6, 6), pady=(3, 3), sticky='NWSE')
 
@@ -1952,7 +2004,7 @@ class ToDoMenu:
         Sets up the edit/remove and cancel buttons of the popup window
         """
         # Frame for buttons
-        self._buttons_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._buttons_frame = self._theme.register(tk.Frame(self._root, borderwidth=0, highlightthickness=0), 'frame')
         self._buttons_frame.grid(row=2, column=0, padx=(6, 6), pady=(3, 6), sticky='NWSE')
 
         self._buttons_frame.columnconfigure(0, weight=3)
@@ -1960,19 +2012,19 @@ class ToDoMenu:
         self._buttons_frame.columnconfigure(2, weight=2)
 
         # Edit button
-        self._edit_button = tk.Label(self._buttons_frame, text='edit', borderwidth=0, highlightthickness=0)
+        self._edit_button = self._theme.register(tk.Label(self._buttons_frame, text='edit', borderwidth=0, highlightthickness=0), 'label')
         self._edit_button.bind('<Button-1>', lambda event: self._select(event.widget, 'edit'))
         self._edit_button.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._edit_button.grid(row=0, column=0, padx=(100, 3), sticky='NWSE')
 
         # Remove button
-        self._remove_button = tk.Label(self._buttons_frame, text='remove', borderwidth=0, highlightthickness=0)
+        self._remove_button = self._theme.register(tk.Label(self._buttons_frame, text='remove', borderwidth=0, highlightthickness=0), 'label')
         self._remove_button.bind('<Button-1>', lambda event: self._select(event.widget, 'remove'))
         self._remove_button.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._remove_button.grid(row=0, column=1, padx=(3, 3), sticky='NWSE')
 
         # Cancel button
-        self._cancel_button = tk.Label(self._buttons_frame, text='cancel', borderwidth=0, highlightthickness=0)
+        self._cancel_button = self._theme.register(tk.Label(self._buttons_frame, text='cancel', borderwidth=0, highlightthickness=0), 'label')
         self._cancel_button.bind('<Button-1>', lambda event: self._select(event.widget, None))
         self._cancel_button.bind('<ButtonRelease>', lambda event: self._widget_released(event.widget))
         self._cancel_button.grid(row=0, column=2, padx=(3, 0), sticky='NWSE')
@@ -1994,81 +2046,13 @@ class ToDoMenu:
 
         self._root.destroy()
     
-    def _set_colors(self, darkmode):
-        """
-        Sets colors used by popup
-
-        darkmode: Whether the application is currently in dark mode or not, boolean
-        """
-        if darkmode:
-            # Dark mode colors
-            self._prompt_text_color = '#838383'
-            self._entry_text_color = '#c2c2c2'
-            self._label_text_color = '#c2c2c2'
-            self._menu_text_color = '#ebebeb'
-            self._background_color = '#2c2c2c'
-            self._widget_color = '#383838'
-            self._pressed_widget_color = '#2e2e2e'
-            self._faint_text_color = '#494949'
-            self._faint_display_color = '#424242'
-        else:
-            # Light mode colors
-            self._prompt_text_color = '#797979'
-            self._entry_text_color = '#4b4b4b'
-            self._label_text_color = '#4b4b4b'
-            self._menu_text_color = '#505050'
-            self._background_color = '#d3d3d3'
-            self._widget_color = '#b3b3b3'
-            self._pressed_widget_color = '#969696'
-            self._faint_text_color = '#a5a5a5'
-            self._faint_display_color = '#a1a1a1'
-    
-    def _change_colors(self, parent=None):
-        """
-        Changes colors for widget and all descendant widgets based on current theme mode
-
-        parent: Widget to change color for, tkinter widget
-        """
-        # If no widget provided, start at root
-        if parent is None:
-            parent = self._root
-            parent.config({'background': self._background_color})
-        
-        # Change color for all descendant widgets
-        for child in parent.winfo_children():
-            if child.winfo_children():
-                self._change_colors(parent=child)
-
-            if type(child) is tk.Label:
-                if parent is self._index_completion_frame:
-                    child.config({'foreground': self._label_text_color})
-                    child.config({'background': self._background_color})
-                else:
-                    child.config({'foreground': self._label_text_color})
-                    child.config({'background': self._widget_color})
-            
-            elif type(child) is tk.OptionMenu:
-                child.config({'foreground': self._menu_text_color})
-                child.config({'background': self._background_color})
-            
-            elif type(child) is tk.Checkbutton:
-                child.config({'foreground': self._label_text_color})
-                child.config({'background': self._background_color})
-            
-            elif type(child) is tk.Text:
-                child.config({'foreground': self._prompt_text_color})
-                child.config({'background': self._widget_color})
-
-            elif type(child) is tk.Frame:
-                child.config({'background': self._background_color})
-    
     def _widget_pressed(self, widget):
         """
         Sets widget to pressed appearance
 
         widget: The pressed widget, tkinter widget
         """
-        widget.config({'background': self._pressed_widget_color})
+        widget.config({'background': self._theme.pressed_widget_color})
 
     def _widget_released(self, widget):
         """
@@ -2076,7 +2060,7 @@ class ToDoMenu:
         
         widget: The pressed widget, tkinter widget
         """
-        widget.config({'background': self._widget_color})
+        widget.config({'background': self._theme.widget_color})
 
     def show(self):
         """
@@ -2089,4 +2073,8 @@ class ToDoMenu:
         return (self._selected, self._current_item_index.get() - 1, self._item)
 
 if __name__ == '__main__':
-    Hourglass()
\ No newline at end of file
+    # Run a command without starting the GUI if one is given, see --help
+    if len(sys.argv) > 1:
+        sys.exit(CommandLine().run(sys.argv[1:]))
+    else:
+        Hourglass()
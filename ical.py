@@ -0,0 +1,552 @@
+# Libraries
+import re
+import uuid
+import datetime
+import zoneinfo
+
+from storage import Event
+from core import ScheduleStore
+
+class ICalendar:
+    """
+    Class for iCalendar (.ics) files
+
+    Reads and writes events and tasks one component at a time, so that files of any size are processed in constant memory
+    """
+    def __init__(self, color=0x808080):
+        """
+        Initializes the ICalendar class
+
+        color: Color of imported events, packed as 0xrrggbb, int
+        """
+        # Number of minutes in a day, used for times measured in minutes since the start of the calendar
+        self._NUMBER_MINUTES_IN_DAY = 60 * 24
+
+        # Largest number of occurrences and interval that schedule files can store
+        self._MAXIMUM_AMOUNT = 999
+        self._MAXIMUM_INTERVAL = 999
+
+        # Longest line in octets, excluding the line break; longer lines are folded
+        self._MAXIMUM_LINE_LENGTH = 75
+
+        # Recurrence frequencies of RRULE values
+        self._FREQUENCIES = {'DAILY': 'daily', 'WEEKLY': 'weekly', 'MONTHLY': 'monthly', 'YEARLY': 'yearly'}
+
+        # Weekdays of BYDAY values, from Monday
+        self._WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+        # Durations, e.g. P1W, PT1H30M, or -P1D
+        self._DURATION_PATTERN = re.compile(r'([+-]?)P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
+        self._color = color
+
+        # Schedule whose calendar gives the occurrences of imported series
+        self._calendar = ScheduleStore()
+
+        # Number of recurring events whose recurrence could not be kept exactly by the last import
+        self.simplified = 0
+
+        # Number of events longer than one day shortened to one day by the last import
+        self.truncated = 0
+
+    def read(self, lines):
+        """
+        Reads the events and tasks of a calendar
+
+        lines: Lines of the calendar, iterable of strings
+        return: Generator of tuples, ('event', UID, date ordinal of the replaced occurrence or None, Event) or ('task', completion, description)
+        """
+        component = None
+
+        for name, parameters, value in self._properties(lines):
+            if name == 'BEGIN' and value.upper() in ('VEVENT', 'VTODO') and component is None:
+                component = {'BEGIN': value.upper()}
+            elif name == 'END' and component is not None and value.upper() == component['BEGIN']:
+                if component['BEGIN'] == 'VEVENT':
+                    event = self._event(component)
+
+                    if event is not None:
+                        yield event
+                else:
+                    yield ('task', '1' if component.get('STATUS', ('', ''))[1].upper() == 'COMPLETED' else '0', ' '.join(self._unescape(component.get('SUMMARY', ('', ''))[1]).split()))
+
+                component = None
+            elif component is not None:
+                # Exception dates may be given by several properties
+                if name == 'EXDATE':
+                    component.setdefault(name, []).append((parameters, value))
+                else:
+                    component[name] = (parameters, value)
+
+    def write(self, file, events, tasks):
+        """
+        Writes events and tasks as a calendar
+
+        file: Text file opened with newline='', file
+        events: Event series, iterable of Event
+        tasks: Tasks, iterable of tuples, (completion, description)
+        """
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+        self._write_lines(file, ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//hourglass//hourglass//EN'])
+
+        # Events replacing an occurrence share the UID of their series, identifying the occurrence by its original start
+        # {recurrence_id: start, ... }
+        events = list(events)
+        series_starts = {event.recurrence_id: event.start for event in events if event.frequency != 'none'}
+
+        for event in events:
+            if event.series_id in series_starts:
+                identification = ['UID:' + event.series_id + '@hourglass', 'RECURRENCE-ID:' + self._format_datetime(event.date, series_starts[event.series_id])]
+            else:
+                identification = ['UID:' + event.recurrence_id + '@hourglass']
+
+            lines = ['BEGIN:VEVENT'] + identification + ['DTSTAMP:' + stamp, 'DTSTART:' + self._format_datetime(event.date, event.start), 'DTEND:' + self._format_datetime(event.date, event.start + event.duration), 'SUMMARY:' + self._escape(event.description), 'X-HOURGLASS-COLOR:' + event.hex_color()]
+            rule = self._format_rule(event)
+
+            if rule is not None:
+                lines.append('RRULE:' + rule)
+
+                for ordinal in sorted(event.exceptions):
+                    lines.append('EXDATE:' + self._format_datetime(ordinal, event.start))
+
+            lines.append('END:VEVENT')
+            self._write_lines(file, lines)
+
+        for completion, description in tasks:
+            self._write_lines(file, ['BEGIN:VTODO', 'UID:' + str(uuid.uuid4()) + '@hourglass', 'DTSTAMP:' + stamp, 'SUMMARY:' + self._escape(description), 'STATUS:' + ('COMPLETED' if completion == '1' else 'NEEDS-ACTION'), 'END:VTODO'])
+
+        self._write_lines(file, ['END:VCALENDAR'])
+
+    def import_into(self, lines, schedule, to_do):
+        """
+        Adds the events and tasks of a calendar to a schedule and to-do list
+
+        lines: Lines of the calendar, iterable of strings
+        schedule: ScheduleStore
+        to_do: TaskStore
+        return: Tuple of ints, (number of events, number of tasks)
+        """
+        self.simplified = 0
+        self.truncated = 0
+        number_events = 0
+        number_tasks = 0
+
+        # Series added for each UID, and occurrences replaced before their series was read, with the events replacing them
+        # {UID: recurrence_id, ... }, {UID: [(date ordinal, Event), ... ], ... }
+        series = {}
+        replaced = {}
+
+        for component in self.read(lines):
+            if component[0] == 'task':
+                to_do.add(component[2], component[1])
+                number_tasks = number_tasks + 1
+                continue
+
+            uid, replaced_ordinal, event = component[1:]
+            series_id = None
+            replacing = []
+
+            if replaced_ordinal is not None:
+                # An occurrence edited individually replaces that occurrence of its series
+                recurrence_id = series.get(uid)
+
+                if recurrence_id is not None and schedule.get(recurrence_id) is not None:
+                    schedule.exclude(recurrence_id, replaced_ordinal)
+
+                    # Only events on the day of the replaced occurrence are linked to their series
+                    if replaced_ordinal == event.date and schedule.get(recurrence_id) is not None:
+                        series_id = recurrence_id
+
+                event.frequency = 'none'
+            else:
+                replacing = replaced.pop(uid, [])
+                event.exceptions.update(ordinal for ordinal, _ in replacing)
+
+            added = schedule.add(event.date, event.start, event.duration, event.color, event.description, frequency=event.frequency, amount=event.amount, interval=event.interval, until=event.until, leap_years=event.leap_years, month_day=event.month_day, exceptions=event.exceptions, series_id=series_id)
+            number_events = number_events + 1
+
+            if replaced_ordinal is not None and uid not in series:
+                replaced.setdefault(uid, []).append((replaced_ordinal, added))
+            elif replaced_ordinal is None and added.frequency != 'none':
+                series[uid] = added.recurrence_id
+
+                # Events read before their series are linked once it is added
+                for ordinal, override in replacing:
+                    if ordinal == override.date:
+                        linked = override.copy()
+                        linked.series_id = added.recurrence_id
+                        schedule.replace(linked)
+
+        return (number_events, number_tasks)
+
+    def _properties(self, lines):
+        """
+        Unfolds the lines of a calendar and splits them into properties
+
+        lines: Lines of the calendar, iterable of strings
+        return: Generator of tuples, (upper case name, {upper case parameter name: value, ... }, value)
+        """
+        folded = None
+
+        for line in lines:
+            line = line.rstrip('\r\n')
+
+            # Lines starting with a space or tab continue the previous line
+            if line[:1] in (' ', '\t') and folded is not None:
+                folded = folded + line[1:]
+                continue
+
+            if folded:
+                yield self._split_property(folded)
+
+            folded = line
+
+        if folded:
+            yield self._split_property(folded)
+
+    def _split_property(self, line):
+        """
+        Splits a line of a calendar into its name, parameters, and value
+
+        line: Unfolded line, string
+        return: Tuple, (upper case name, {upper case parameter name: value, ... }, value)
+        """
+        # Parameter values may contain colons and semicolons inside quotes
+        quoted = False
+        fields = ['']
+
+        for i, character in enumerate(line):
+            if character == '"':
+                quoted = not quoted
+            elif character == ';' and not quoted:
+                fields.append('')
+                continue
+            elif character == ':' and not quoted:
+                value = line[i + 1:]
+                break
+
+            fields[-1] = fields[-1] + character
+        else:
+            value = ''
+
+        parameters = {}
+
+        for field in fields[1:]:
+            name, _, parameter = field.partition('=')
+            parameters[name.upper()] = parameter.strip('"')
+
+        return (fields[0].upper(), parameters, value)
+
+    def _event(self, component):
+        """
+        Converts the properties of a VEVENT into an event series
+
+        component: Properties, {name: (parameters, value), ... }
+        return: Tuple, ('event', UID, date ordinal of the replaced occurrence or None, Event), or None if the event has no start
+        """
+        if 'DTSTART' not in component:
+            return None
+
+        ordinal, start, timed = self._parse_datetime(*component['DTSTART'])
+
+        # Events last until their end, for their duration, or for the rest of their day
+        if 'DTEND' in component:
+            end_ordinal, end, _ = self._parse_datetime(*component['DTEND'])
+            duration = (end_ordinal - ordinal) * self._NUMBER_MINUTES_IN_DAY + end - start
+        elif 'DURATION' in component:
+            duration = self._parse_duration(component['DURATION'][1])
+        else:
+            duration = 0 if timed else self._NUMBER_MINUTES_IN_DAY
+
+        # Events are at most one day long, longer events are counted as they lose the rest of their duration
+        if duration > self._NUMBER_MINUTES_IN_DAY:
+            self.truncated = self.truncated + 1
+
+        duration = max(0, min(duration, self._NUMBER_MINUTES_IN_DAY))
+
+        try:
+            color = int(component['X-HOURGLASS-COLOR'][1].strip()[1:], 16)
+        except (KeyError, ValueError):
+            color = self._color
+
+        # Descriptions are stored on one line
+        description = ' '.join(self._unescape(component.get('SUMMARY', ('', ''))[1]).split())
+        event = Event('', ordinal, start, duration, color, description)
+
+        if 'RRULE' in component:
+            self._parse_rule(component['RRULE'][1], event)
+
+        for parameters, value in component.get('EXDATE', []):
+            for text in value.split(','):
+                event.exceptions.add(self._parse_datetime(parameters, text)[0])
+
+        replaced_ordinal = self._parse_datetime(*component['RECURRENCE-ID'])[0] if 'RECURRENCE-ID' in component else None
+
+        return ('event', component.get('UID', ('', ''))[1], replaced_ordinal, event)
+
+    def _parse_rule(self, rule, event):
+        """
+        Sets the recurrence of an event series from a recurrence rule
+
+        rule: RRULE value, string
+        event: Event series, Event
+        """
+        parts = dict(part.partition('=')[::2] for part in rule.upper().split(';') if part)
+        frequency = self._FREQUENCIES.get(parts.get('FREQ'))
+
+        try:
+            interval = int(parts.get('INTERVAL', '1'))
+            count = int(parts['COUNT']) if 'COUNT' in parts else None
+        except ValueError:
+            frequency = None
+
+        # Daily rules a multiple of 365 days apart are yearly series not keeping their date, which are written as such
+        if frequency == 'daily' and interval > 0 and interval % 365 == 0:
+            frequency = 'yearly'
+            interval = interval // 365
+            event.leap_years = False
+
+        month_day = self._month_day(parts, event)
+
+        # Rules that cannot be stored keep only the first occurrence, and rules that select other days keep only the day of the first occurrence
+        if frequency is None or not 1 <= interval <= self._MAXIMUM_INTERVAL or month_day is None:
+            self.simplified = self.simplified + 1
+
+        if frequency is None or not 1 <= interval <= self._MAXIMUM_INTERVAL:
+            return
+
+        event.frequency = frequency
+        event.interval = interval
+        event.month_day = month_day or 'date'
+        event.amount = 0
+
+        if 'UNTIL' in parts:
+            until_ordinal, until, timed = self._parse_datetime({}, parts['UNTIL'])
+            event.until = until_ordinal if not timed or until >= event.start else until_ordinal - 1
+
+            # Rules ending before their first occurrence keep only the first occurrence
+            if event.until < event.date:
+                if month_day is not None:
+                    self.simplified = self.simplified + 1
+
+                event.frequency, event.interval, event.month_day, event.amount, event.until = 'none', 1, 'date', 1, None
+                return
+
+        if count is not None:
+            # Skipped months count toward the number of occurrences of a series, but not toward COUNT, so rules that may skip months end at their last occurrence instead
+            if (frequency == 'monthly' or (frequency == 'yearly' and event.leap_years)) and event.month_day in ('date', 'weekday') and datetime.date.fromordinal(event.date).day > 28:
+                occurrences = self._calendar.occurrences(event, event.date, datetime.date.max.toordinal() + 1)
+                event.until = occurrences[min(count, len(occurrences)) - 1]
+            elif count <= self._MAXIMUM_AMOUNT:
+                event.amount = count
+            else:
+                # Larger numbers of occurrences end at the day of the last occurrence instead, or at the end of its month for series following the calendar
+                if frequency == 'monthly' or (frequency == 'yearly' and event.leap_years):
+                    last_ordinal = self._month_end(event.date, (count - 1) * interval * (12 if frequency == 'yearly' else 1))
+                else:
+                    last_ordinal = min(event.date + (count - 1) * {'daily': 1, 'weekly': 7, 'yearly': 365}[frequency] * interval, datetime.date.max.toordinal())
+
+                event.until = last_ordinal if event.until is None else min(event.until, last_ordinal)
+
+    def _month_day(self, parts, event):
+        """
+        Returns the day of the month selected by the parts of a recurrence rule, if it selects no days other than those of its frequency from the first occurrence
+
+        parts: Parts of the RRULE value, {name: value, ... }
+        event: Event series, Event
+        return: Either the strings 'date', 'weekday', 'last_weekday', or 'last_day', or None if the rule selects other days
+        """
+        date = datetime.date.fromordinal(event.date)
+        weekday = self._WEEKDAYS[date.weekday()]
+        frequency = parts.get('FREQ')
+
+        # Parts naming only the weekday, day of the month, or month of the first occurrence select nothing else
+        selected = {'FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'WKST'}
+        month_day = 'date'
+
+        if parts.get('BYDAY') == weekday and frequency == 'WEEKLY':
+            selected.add('BYDAY')
+
+        if parts.get('BYMONTHDAY') == str(date.day) and frequency in ('MONTHLY', 'YEARLY'):
+            selected.add('BYMONTHDAY')
+
+        if parts.get('BYMONTH') == str(date.month) and frequency == 'YEARLY':
+            selected.add('BYMONTH')
+
+        # Monthly and yearly rules may select a weekday of the week of the month of the first occurrence, its last such weekday, or the last day of the month
+        if frequency == 'MONTHLY' or (frequency == 'YEARLY' and 'BYMONTH' in selected):
+            if parts.get('BYDAY') == str((date.day - 1) // 7 + 1) + weekday:
+                selected.add('BYDAY')
+                month_day = 'weekday'
+            elif parts.get('BYDAY') == '-1' + weekday and (date + datetime.timedelta(days=7)).month != date.month:
+                selected.add('BYDAY')
+                month_day = 'last_weekday'
+            elif parts.get('BYMONTHDAY') == '-1' and (date + datetime.timedelta(days=1)).month != date.month:
+                selected.add('BYMONTHDAY')
+                month_day = 'last_day'
+
+        return month_day if not set(parts) - selected else None
+
+    def _month_end(self, ordinal, months):
+        """
+        Returns the last day of the month some months after the month of a day
+
+        ordinal: Day, date ordinal, int
+        months: Number of months, int
+        return: Day, date ordinal, int
+        """
+        date = datetime.date.fromordinal(ordinal)
+        month = (date.year - 1) * 12 + date.month - 1 + months
+
+        if month >= (datetime.MAXYEAR - 1) * 12 + 11:
+            return datetime.date.max.toordinal()
+
+        return datetime.date(month // 12 + 1 + (month % 12 == 11), (month + 1) % 12 + 1, 1).toordinal() - 1
+
+    def _format_rule(self, event):
+        """
+        Returns the recurrence rule of an event series
+
+        event: Event series, Event
+        return: RRULE value, or None if not recurring, string
+        """
+        if event.frequency == 'none':
+            return None
+
+        date = datetime.date.fromordinal(event.date)
+        until = event.until
+
+        # Yearly recurrences not keeping their date are a fixed number of days apart
+        if event.frequency == 'yearly' and not event.leap_years:
+            rule = 'FREQ=DAILY;INTERVAL=' + str(365 * event.interval)
+        else:
+            rule = 'FREQ=' + event.frequency.upper() + ';INTERVAL=' + str(event.interval)
+
+        # Monthly and yearly recurrences occur on the day of the month of their first occurrence unless they name another
+        if (event.frequency == 'monthly' or (event.frequency == 'yearly' and event.leap_years)) and event.month_day != 'date':
+            if event.frequency == 'yearly':
+                rule = rule + ';BYMONTH=' + str(date.month)
+
+            if event.month_day == 'weekday':
+                rule = rule + ';BYDAY=' + str((date.day - 1) // 7 + 1) + self._WEEKDAYS[date.weekday()]
+            elif event.month_day == 'last_weekday':
+                rule = rule + ';BYDAY=-1' + self._WEEKDAYS[date.weekday()]
+            else:
+                rule = rule + ';BYMONTHDAY=-1'
+
+        # Skipped months count toward the number of occurrences of a series, but not toward COUNT, so series that may skip months end at the end of the month of their last occurrence instead
+        if event.amount != 0 and (event.frequency == 'monthly' or (event.frequency == 'yearly' and event.leap_years)) and event.month_day in ('date', 'weekday') and date.day > 28:
+            last_ordinal = self._month_end(event.date, (event.amount - 1) * event.interval * (12 if event.frequency == 'yearly' else 1))
+            until = last_ordinal if until is None else min(until, last_ordinal)
+        elif event.amount != 0:
+            rule = rule + ';COUNT=' + str(event.amount)
+
+        if until is not None:
+            rule = rule + ';UNTIL=' + self._format_datetime(until, event.start)
+
+        return rule
+
+    def _parse_datetime(self, parameters, text):
+        """
+        Parses a date or date and time, converting times in UTC or a time zone into local time
+
+        parameters: Parameters of the property, {name: value, ... }
+        text: Date, yyyymmdd, or date and time, yyyymmddThhmmss, optionally followed by Z for UTC, string
+        return: Tuple, (date ordinal, minutes since midnight, whether a time was given)
+        """
+        text = text.strip()
+
+        try:
+            if 'T' not in text:
+                return (datetime.date(int(text[:4]), int(text[4:6]), int(text[6:8])).toordinal(), 0, False)
+
+            moment = datetime.datetime(int(text[:4]), int(text[4:6]), int(text[6:8]), int(text[9:11]), int(text[11:13]), int(text[13:15] or 0))
+        except ValueError:
+            raise ValueError('invalid date: ' + text)
+
+        if text.endswith('Z'):
+            moment = moment.replace(tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None)
+        elif 'TZID' in parameters:
+            try:
+                moment = moment.replace(tzinfo=zoneinfo.ZoneInfo(parameters['TZID'])).astimezone().replace(tzinfo=None)
+            except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+                # Unknown time zones are taken as local time
+                pass
+
+        return (moment.toordinal(), moment.hour * 60 + moment.minute, True)
+
+    def _format_datetime(self, ordinal, minutes):
+        """
+        Formats a local date and time
+
+        ordinal: Day, date ordinal, int
+        minutes: Minutes since midnight of the day, may exceed one day, int
+        return: Date and time, yyyymmddThhmmss, string
+        """
+        moment = datetime.datetime.fromordinal(ordinal) + datetime.timedelta(minutes=minutes)
+
+        return moment.strftime('%Y%m%dT%H%M%S')
+
+    def _parse_duration(self, text):
+        """
+        Parses a duration
+
+        text: Duration, e.g. PT1H30M, string
+        return: Minutes, int
+        """
+        match = self._DURATION_PATTERN.match(text.strip().upper())
+
+        if match is None:
+            raise ValueError('invalid duration: ' + text)
+
+        sign, weeks, days, hours, minutes, seconds = match.groups()
+        total = ((int(weeks or 0) * 7 + int(days or 0)) * 24 + int(hours or 0)) * 60 + int(minutes or 0) + int(seconds or 0) // 60
+
+        return -total if sign == '-' else total
+
+    def _escape(self, text):
+        """
+        Escapes a text value
+
+        text: string
+        return: string
+        """
+        return text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+    def _unescape(self, text):
+        """
+        Unescapes a text value
+
+        text: string
+        return: string
+        """
+        return re.sub(r'\\(.)', lambda match: '\n' if match.group(1) in 'nN' else match.group(1), text)
+
+    def _write_lines(self, file, lines):
+        """
+        Writes lines, folding those longer than the maximum line length without splitting characters
+
+        file: Text file opened with newline='', file
+        lines: Lines, list of strings
+        """
+        contents = []
+
+        for line in lines:
+            length = 0
+            start = 0
+
+            for i, character in enumerate(line):
+                size = len(character.encode('utf-8'))
+
+                # Continuation lines start with a space, which counts toward their length
+                if length + size > self._MAXIMUM_LINE_LENGTH:
+                    contents.append(line[start:i] + '\r\n ')
+                    start = i
+                    length = 1
+
+                length = length + size
+
+            contents.append(line[start:] + '\r\n')
+
+        file.write(''.join(contents))
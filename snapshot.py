@@ -0,0 +1,263 @@
+# Libraries
+import os
+import zlib
+import hashlib
+import datetime
+
+from storage import StorageError, TextStorage
+
+class SnapshotStorage(TextStorage):
+    """
+    Class for a snapshot of the schedule and to-do list
+
+    Stores the contents of text schedule and to-do list files as compressed chunks named by the hash of their contents, shared by every snapshot, so chunks unchanged since another snapshot are stored once
+    Each file of the snapshot lists its chunks; chunks end at lines chosen by their contents, so a change to a line changes only the chunk holding it
+    """
+    # First line of the lists of chunks
+    SNAPSHOT_FILE_HEADER = 'hourglass snapshot v1'
+
+    # A chunk ends after each line whose checksum is a multiple of this number, or once it reaches the maximum size in bytes
+    CHUNK_LINES = 64
+    MAXIMUM_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, schedule_location, tasks_location, objects_location):
+        """
+        Initializes the SnapshotStorage class
+
+        schedule_location: Location of the list of chunks of the schedule, string
+        tasks_location: Location of the list of chunks of the to-do list, string
+        objects_location: Directory of the chunks, string
+        """
+        super().__init__(schedule_location, tasks_location)
+        self._objects_location = objects_location
+
+    def chunks(self):
+        """
+        Returns the hashes of the chunks of the snapshot
+
+        return: Set of strings
+        """
+        try:
+            return set(self._read_chunk_list(self._schedule_location) + self._read_chunk_list(self._tasks_location))
+        except (OSError, ValueError) as error:
+            raise StorageError('unable to read snapshot.') from error
+
+    def object_location(self, chunk_hash):
+        """
+        Returns the location of a chunk
+
+        chunk_hash: Hash of the contents of the chunk, hexadecimal string
+        return: Location of the chunk, string
+        """
+        return os.path.join(self._objects_location, chunk_hash[:2], chunk_hash[2:])
+
+    def _read_lines(self, file_location):
+        """
+        Returns the lines of a file of the snapshot, joining its chunks
+
+        file_location: Location of the list of chunks of the file, string
+        return: Lines, list of strings
+        """
+        contents = []
+
+        for chunk_hash in self._read_chunk_list(file_location):
+            with open(self.object_location(chunk_hash), 'rb') as opened_file:
+                chunk = zlib.decompress(opened_file.read())
+
+            # Chunks are checked against their hash, as a damaged chunk would damage every snapshot sharing it
+            if hashlib.sha256(chunk).hexdigest() != chunk_hash:
+                raise ValueError('damaged chunk ' + chunk_hash)
+
+            contents.append(chunk)
+
+        return b''.join(contents).decode().splitlines(keepends=True)
+
+    def _write_atomic(self, file_location, contents):
+        """
+        Replaces the contents of a file of the snapshot, storing the chunks not stored yet
+
+        file_location: Location of the list of chunks of the file, string
+        contents: New contents of the file, string or bytes
+        """
+        data = contents if isinstance(contents, bytes) else contents.encode()
+        chunk_hashes = []
+        start = 0
+        offset = 0
+
+        while offset < len(data):
+            end = data.find(b'\n', offset) + 1 or len(data)
+
+            if zlib.crc32(data[offset:end]) % self.CHUNK_LINES == 0 or end - start >= self.MAXIMUM_CHUNK_SIZE or end == len(data):
+                chunk = data[start:end]
+                chunk_hash = hashlib.sha256(chunk).hexdigest()
+                location = self.object_location(chunk_hash)
+
+                if not os.path.exists(location):
+                    os.makedirs(os.path.dirname(location), exist_ok=True)
+                    super()._write_atomic(location, zlib.compress(chunk, 9))
+
+                chunk_hashes.append(chunk_hash)
+                start = end
+
+            offset = end
+
+        super()._write_atomic(file_location, self.SNAPSHOT_FILE_HEADER + '\n' + ''.join(chunk_hash + '\n' for chunk_hash in chunk_hashes))
+
+    def _read_chunk_list(self, file_location):
+        """
+        Returns the hashes of the chunks of a file of the snapshot, in order
+
+        file_location: Location of the list of chunks of the file, string
+        return: List of strings
+        """
+        with open(file_location, 'r') as opened_file:
+            lines = opened_file.read().split()
+
+        if not lines or ' '.join(lines[:3]) != self.SNAPSHOT_FILE_HEADER:
+            raise ValueError('unknown snapshot format')
+
+        return lines[3:]
+
+class Snapshots:
+    """
+    Class for the snapshots of the schedule and to-do list kept in a directory
+
+    Snapshots are named by the time they are taken; taking one removes the snapshots that the retention policy no longer keeps, then the chunks no snapshot uses
+    The policy keeps the most recent snapshots, and the last snapshot of each of the most recent days, weeks, and months
+    """
+    def __init__(self, directory, recent=10, daily=7, weekly=5, monthly=12):
+        """
+        Initializes the Snapshots class
+
+        directory: Directory of the snapshots, string
+        recent: Number of most recent snapshots kept, int
+        daily: Number of most recent days whose last snapshot is kept, int
+        weekly: Number of most recent weeks whose last snapshot is kept, int
+        monthly: Number of most recent months whose last snapshot is kept, int
+        """
+        self._directory = directory
+        self._objects_location = os.path.join(directory, 'objects')
+        self._recent = recent
+        self._daily = daily
+        self._weekly = weekly
+        self._monthly = monthly
+
+        # Format of the names of snapshots, which sort in the order they were taken
+        self._NAME_FORMAT = '%Y%m%d-%H%M%S'
+
+    def take(self, events, tasks, now=None):
+        """
+        Takes a snapshot of the schedule and to-do list, then applies the retention policy
+
+        events: Event series, iterable of Event
+        tasks: Tasks in order, iterable of tuples, (completion, description)
+        now: Time of the snapshot, datetime.datetime, or None for the current time
+        return: Name of the snapshot, string
+        """
+        name = (now or datetime.datetime.now()).strftime(self._NAME_FORMAT)
+
+        # Snapshots taken within the same second are numbered
+        names = set(self.names())
+        number = 1
+
+        while (name if number == 1 else name + '-' + str(number)) in names:
+            number = number + 1
+
+        name = name if number == 1 else name + '-' + str(number)
+
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+        except OSError as error:
+            raise StorageError('unable to write snapshot.') from error
+
+        storage = self.open(name)
+        storage.write_schedule(events)
+        storage.write_tasks(tasks)
+
+        self.prune()
+
+        return name
+
+    def names(self):
+        """
+        Returns the names of the snapshots, oldest first
+
+        return: List of strings
+        """
+        if not os.path.isdir(self._directory):
+            return []
+
+        try:
+            entries = set(os.listdir(self._directory))
+        except OSError as error:
+            raise StorageError('unable to read snapshots.') from error
+
+        return sorted(entry[:-len('.schedule')] for entry in entries if entry.endswith('.schedule') and entry[:-len('.schedule')] + '.tasks' in entries)
+
+    def open(self, name):
+        """
+        Returns the storage of a snapshot
+
+        name: Name of the snapshot, string
+        return: SnapshotStorage
+        """
+        return SnapshotStorage(os.path.join(self._directory, name + '.schedule'), os.path.join(self._directory, name + '.tasks'), self._objects_location)
+
+    def prune(self):
+        """
+        Removes the snapshots that the retention policy does not keep, then the chunks no snapshot uses
+
+        return: Names of the removed snapshots, list of strings
+        """
+        names = self.names()
+        kept = set(names[max(0, len(names) - self._recent):] if self._recent > 0 else [])
+
+        # Last snapshot of each period, for the most recent periods of each length
+        for number_periods, period in ((self._daily, lambda day: day), (self._weekly, lambda day: day.isocalendar()[:2]), (self._monthly, lambda day: (day.year, day.month))):
+            periods = set()
+
+            for name in reversed(names):
+                key = period(datetime.datetime.strptime(name[:15], self._NAME_FORMAT).date())
+
+                if key not in periods and len(periods) < number_periods:
+                    periods.add(key)
+                    kept.add(name)
+
+        removed = [name for name in names if name not in kept]
+
+        try:
+            for name in removed:
+                os.remove(os.path.join(self._directory, name + '.schedule'))
+                os.remove(os.path.join(self._directory, name + '.tasks'))
+
+            if not removed:
+                return removed
+
+            # Remove the chunks used by no remaining snapshot
+            used = set()
+
+            for name in names:
+                if name in kept:
+                    used.update(self.open(name).chunks())
+
+            for prefix in os.listdir(self._objects_location):
+                for rest in os.listdir(os.path.join(self._objects_location, prefix)):
+                    if prefix + rest not in used:
+                        os.remove(os.path.join(self._objects_location, prefix, rest))
+        except OSError as error:
+            raise StorageError('unable to remove snapshot.') from error
+
+        return removed
+
+    def size(self):
+        """
+        Returns the space used by the snapshots
+
+        return: Bytes, int
+        """
+        total = 0
+
+        for root, directories, files in os.walk(self._directory):
+            total = total + sum(os.path.getsize(os.path.join(root, file)) for file in files)
+
+        return total
@@ -0,0 +1,2050 @@
+# Libraries
+import os
+import sys
+import mmap
+import array
+import bisect
+import struct
+import zlib
+import sqlite3
+import threading
+import time
+import uuid
+import datetime
+
+class StorageError(Exception):
+    """
+    Exception raised when the schedule or to-do list cannot be read or written
+    """
+
+class Event:
+    """
+    Class for a scheduled event series
+
+    Holds the recurrence rule and display information of an event using typed fields
+    """
+    __slots__ = ('recurrence_id', 'date', 'start', 'duration', 'color', 'description', 'frequency', 'amount', 'interval', 'until', 'leap_years', 'month_day', 'exceptions', 'series_id')
+
+    def __init__(self, recurrence_id, date, start, duration, color, description, frequency='none', amount=1, interval=1, until=None, leap_years=True, month_day='date', exceptions=None, series_id=None):
+        """
+        Initializes the Event class
+
+        recurrence_id: Unique identifier of the event series, allocated from a counter, string
+        date: Day of the first occurrence, date ordinal, int
+        start: Start time in minutes since midnight, int
+        duration: Duration in minutes, int
+        color: Color packed as 0xrrggbb, int
+        description: Event description, string
+        frequency: Recurrence frequency, either the strings 'none', 'daily', 'weekly', 'monthly', or 'yearly'
+        amount: Number of occurrences, counting months and years skipped by monthly and yearly series, or 0 if not limited, int
+        interval: Number of frequency periods between occurrences, int
+        until: Last day on which the series may occur, date ordinal, or None if not limited, int
+        leap_years: Whether yearly recurrences keep the same date, skipping years in which it does not exist, rather than recurring every 365 days, boolean
+        month_day: Day of the month on which monthly and yearly series occur, either the strings 'date' (day of the month of the first occurrence, skipping months without it), 'weekday' (same weekday of the same week of the month, skipping months without it), 'last_weekday' (last such weekday of the month), or 'last_day'
+        exceptions: Days on which the series does not occur, set of date ordinals
+        series_id: Unique identifier of the event series whose occurrence on the same day this event replaces, which lists that day as an exception, or None, string
+        """
+        self.recurrence_id = sys.intern(recurrence_id)
+        self.date = date
+        self.start = start
+        self.duration = duration
+        self.color = color
+        self.description = description
+        self.frequency = sys.intern(frequency)
+        self.amount = amount
+        self.interval = interval
+        self.until = until
+        self.leap_years = leap_years
+        self.month_day = sys.intern(month_day)
+        self.exceptions = exceptions if exceptions is not None else set()
+        self.series_id = sys.intern(series_id) if series_id is not None else None
+
+    def copy(self):
+        """
+        Returns a copy of the event series
+
+        return: Event series, Event
+        """
+        return Event(self.recurrence_id, self.date, self.start, self.duration, self.color, self.description, frequency=self.frequency, amount=self.amount, interval=self.interval, until=self.until, leap_years=self.leap_years, month_day=self.month_day, exceptions=set(self.exceptions), series_id=self.series_id)
+
+    def hex_color(self):
+        """
+        Returns the color of the event
+
+        return: Hex color, string
+        """
+        return '#' + format(self.color, '06x')
+
+    def rgb(self):
+        """
+        Returns the color of the event as red, green, and blue components
+
+        return: Tuple of ints, (r, g, b)
+        """
+        return (self.color >> 16, (self.color >> 8) & 0xff, self.color & 0xff)
+
+class Storage:
+    """
+    Class for the storage of the schedule and to-do list
+
+    Defines the operations of all storage backends; errors are raised as StorageError
+    Event series are Event objects and to-do list tasks are tuples, (completion, description)
+    """
+    # Whether each change is stored as it is made, rather than only when the schedule and to-do list are written
+    records_changes = False
+
+    # Days of the month of monthly and yearly series in the order of their codes; files store the code and the leap years mode of a series as one number, 2 * code + leap years, so that files written before the day of the month was stored read as 'date'
+    MONTH_DAYS = ('date', 'weekday', 'last_weekday', 'last_day')
+
+    def __init__(self):
+        """
+        Initializes the Storage class
+        """
+        # Whether the last schedule read was stored in an older format, with one event for every occurrence of a series
+        self.needs_migration = False
+
+        # Next identifier of the counter allocating event series identifiers, which only advances so that identifiers are never reused
+        self.next_id = 1
+
+    def read_schedule(self):
+        """
+        Returns all event series
+
+        return: Event series, list of Event
+        """
+        raise NotImplementedError
+
+    def write_schedule(self, events):
+        """
+        Replaces all event series
+
+        events: Event series, iterable of Event
+        """
+        raise NotImplementedError
+
+    def read_tasks(self):
+        """
+        Returns all to-do list tasks in order
+
+        return: List of tuples, (completion, description)
+        """
+        raise NotImplementedError
+
+    def write_tasks(self, tasks):
+        """
+        Replaces all to-do list tasks
+
+        tasks: Tasks in order, iterable of tuples, (completion, description)
+        """
+        raise NotImplementedError
+
+    def reads_windows(self):
+        """
+        Returns whether event series can be read for a range of days without reading every event series
+
+        return: boolean
+        """
+        return False
+
+    def read_series(self):
+        """
+        Returns the recurring event series
+
+        return: Event series, list of Event
+        """
+        raise NotImplementedError
+
+    def read_events(self, first_day, last_day):
+        """
+        Returns the events that do not recur occurring within the given range
+
+        first_day: First day of the range, date ordinal, int
+        last_day: Day after the last day of the range, date ordinal, int
+        return: Events, list of Event
+        """
+        raise NotImplementedError
+
+    def write_event(self, event):
+        """
+        Records that an event series was added or edited
+
+        event: Event series, Event
+        """
+        self._count_identifiers([event.recurrence_id])
+
+    def remove_event(self, recurrence_id):
+        """
+        Records that an event series was removed
+
+        recurrence_id: Unique identifier of the event series, string
+        """
+
+    def insert_task(self, index, completion, description):
+        """
+        Records that a to-do list task was inserted
+
+        index: Position of the task, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+
+    def remove_task(self, index):
+        """
+        Records that a to-do list task was removed
+
+        index: Position of the task, int
+        """
+
+    def replace_task(self, index, completion, description):
+        """
+        Records that a to-do list task was edited
+
+        index: Position of the task, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+
+    def move_task(self, index, new_index, completion, description):
+        """
+        Records that a to-do list task was edited and moved
+
+        index: Position of the task before it is moved, int
+        new_index: Position of the task after it is moved, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+
+    def close(self):
+        """
+        Closes the storage
+        """
+
+    def _count_identifiers(self, recurrence_ids):
+        """
+        Advances the counter of identifiers past the identifiers allocated from it
+
+        recurrence_ids: Unique identifiers of event series, iterable of strings
+        """
+        for recurrence_id in recurrence_ids:
+            if recurrence_id.isdecimal() and int(recurrence_id) >= self.next_id:
+                self.next_id = int(recurrence_id) + 1
+
+    def _rule_code(self, event):
+        """
+        Returns the number storing the day of the month and leap years mode of an event series
+
+        event: Event series, Event
+        return: int
+        """
+        return 2 * self.MONTH_DAYS.index(event.month_day) + int(event.leap_years)
+
+    def _rule(self, code):
+        """
+        Returns the day of the month and leap years mode stored as one number
+
+        code: int
+        return: Tuple, (leap_years, month_day)
+        """
+        return (bool(code & 1), self.MONTH_DAYS[code >> 1])
+
+    def _write_atomic(self, file_location, contents):
+        """
+        Replaces the contents of a file, leaving either the previous or the new contents if interrupted
+
+        file_location: Location of the file, string
+        contents: New contents of the file, string or bytes
+        """
+        temporary_file_location = file_location + '.tmp'
+
+        with open(temporary_file_location, 'wb' if isinstance(contents, bytes) else 'w') as opened_file:
+            opened_file.write(contents)
+            opened_file.flush()
+            os.fsync(opened_file.fileno())
+
+        os.replace(temporary_file_location, file_location)
+
+class TextStorage(Storage):
+    """
+    Class for the schedule and to-do list stored as text files
+
+    The schedule file stores one fixed-width line per event series and the to-do list file one line per task; both are rewritten in full
+    The first line of the schedule file holds the next identifier of the counter allocating event series identifiers
+    Lines of the schedule file are sorted with recurring series first, then by date, so the events of a range of days are found by binary search
+    An index file holds the offset of the first line of each day, so the events of a range of days are one slice of the memory-mapped schedule file
+    Events replacing an occurrence of a series hold the identifier of the series after their own, separated by a space
+    """
+    # First line of schedule files storing one line per event series, sorted, followed by the next identifier of the counter
+    SCHEDULE_FILE_HEADER = 'hourglass schedule v4'
+
+    # Start of index files, followed by the checksum, size, and modification time of the schedule file they index, and the number of days
+    INDEX_FILE_MAGIC = b'HGI\x01'
+
+    _INDEX_HEADER = struct.Struct('<IQqI')
+
+    def __init__(self, schedule_location, tasks_location, index_location=None):
+        """
+        Initializes the TextStorage class
+
+        schedule_location: Location of the schedule file, string
+        tasks_location: Location of the to-do list file, string
+        index_location: Location of the index of the schedule file, or None if not indexed, string
+        """
+        super().__init__()
+        self._schedule_location = schedule_location
+        self._tasks_location = tasks_location
+        self._index_location = index_location
+
+        # Index of the schedule file last read, None if not read
+        # (checksum, size, modification time, array of date ordinals, array of offsets of the first line of each day followed by the end of the file)
+        self._index = None
+
+    def read_schedule(self):
+        """
+        Returns all event series
+
+        return: Event series, list of Event
+        """
+        try:
+            return self._parse_schedule(self._read_lines(self._schedule_location))
+        except (OSError, ValueError, IndexError) as error:
+            raise StorageError('unable to read from schedule file.') from error
+
+    def reads_windows(self):
+        """
+        Returns whether event series can be read for a range of days without reading every event series, which requires a sorted schedule file
+
+        return: boolean
+        """
+        try:
+            with open(self._schedule_location, 'rb') as opened_file:
+                return self._parse_header(opened_file.readline().decode()) == self.SCHEDULE_FILE_HEADER
+        except (OSError, ValueError):
+            return False
+
+    def read_series(self):
+        """
+        Returns the recurring event series, which are stored before the other events
+
+        return: Event series, list of Event
+        """
+        return self._read_schedule_range(None, 0)
+
+    def read_events(self, first_day, last_day):
+        """
+        Returns the events that do not recur occurring within the given range
+
+        first_day: First day of the range, date ordinal, int
+        last_day: Day after the last day of the range, date ordinal, int
+        return: Events, list of Event
+        """
+        return self._read_schedule_range(first_day, last_day)
+
+    def write_schedule(self, events):
+        """
+        Replaces all event series
+
+        events: Event series, iterable of Event
+        """
+        try:
+            self._write_schedule_file(self._format_schedule(events))
+        except OSError as error:
+            raise StorageError('unable to write to schedule file.') from error
+
+    def read_tasks(self):
+        """
+        Returns all to-do list tasks in order
+
+        return: List of tuples, (completion, description)
+        """
+        try:
+            return [self._parse_task(line) for line in self._read_lines(self._tasks_location)]
+        except (OSError, ValueError, IndexError) as error:
+            raise StorageError('unable to read from to-do list file.') from error
+
+    def write_tasks(self, tasks):
+        """
+        Replaces all to-do list tasks
+
+        tasks: Tasks in order, iterable of tuples, (completion, description)
+        """
+        try:
+            self._write_atomic(self._tasks_location, self._format_tasks(tasks))
+        except OSError as error:
+            raise StorageError('unable to write to to-do list file.') from error
+
+    def _read_schedule_range(self, first_day, last_day):
+        """
+        Returns the event series of a sorted schedule file within the given range of days, mapping the file into memory
+
+        first_day: First day of the events that do not recur, date ordinal, or None to start with the recurring series, int
+        last_day: Day after the last day of the events that do not recur, date ordinal, or 0 to end with the recurring series, int
+        return: Event series, list of Event
+        """
+        try:
+            with open(self._schedule_location, 'rb') as opened_file:
+                with mmap.mmap(opened_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    index = self._read_index()
+
+                    if index is not None:
+                        # Offsets of the first line of each day
+                        days, offsets = index[3:]
+                        start = mapped.find(b'\n') + 1 if first_day is None else offsets[bisect.bisect_left(days, first_day)]
+                        end = offsets[bisect.bisect_left(days, last_day)]
+                    else:
+                        # Binary search of the lines, by whether each event does not recur, then by date
+                        header_end = mapped.find(b'\n') + 1
+                        start = header_end if first_day is None else self._schedule_offset(mapped, (True, int(self._file_date_string(first_day))), header_end, len(mapped))
+                        # The key following the date of the last day of the range, as the day after may be past the last date
+                        end = self._schedule_offset(mapped, (True, int(self._file_date_string(last_day - 1)) + 1) if last_day else (True, 0), start, len(mapped))
+
+                    contents = mapped[start:end].decode()
+
+            return [self._parse_event(line) for line in contents.splitlines()]
+        except (OSError, ValueError, IndexError) as error:
+            raise StorageError('unable to read from schedule file.') from error
+
+    def _schedule_offset(self, mapped, key, low, high):
+        """
+        Returns the offset of the first line of a sorted schedule file whose sort key is at least the given key
+
+        mapped: Schedule file mapped into memory, mmap
+        key: Sort key, tuple, (whether the event does not recur, yyyymmdd as an int)
+        low: Offset of a line at or before the line searched for, int
+        high: Offset of a line, or the end of the file, at or after the line searched for, int
+        return: Offset, int
+        """
+        while low < high:
+            # Start of the line containing the middle offset
+            line_start = mapped.rfind(b'\n', low, (low + high) // 2) + 1 or low
+            line_end = mapped.find(b'\n', line_start, high) + 1 or high
+
+            if (mapped[line_start + 59:line_start + 66] == b'   none', int(mapped[line_start:line_start + 8])) < key:
+                low = line_end
+            else:
+                high = line_start
+
+        return low
+
+    def _write_schedule_file(self, contents):
+        """
+        Replaces the contents of the schedule file, then of its index
+
+        contents: Contents of the schedule file, string
+        """
+        # Written as bytes, so that offsets in the file are those of the encoded contents
+        data = contents.encode()
+        self._write_atomic(self._schedule_location, data)
+
+        if self._index_location is None:
+            return
+
+        # Offset of the first line of each day of the events that do not recur
+        days = array.array('i')
+        offsets = array.array('q')
+        offset = data.find(b'\n') + 1
+
+        while offset < len(data):
+            end = data.index(b'\n', offset) + 1
+
+            if data[offset + 59:offset + 66] == b'   none':
+                day = self._file_date(data[offset:offset + 8].decode())
+
+                if not days or days[-1] != day:
+                    days.append(day)
+                    offsets.append(offset)
+
+            offset = end
+
+        # Ranges after the last day end with the file
+        offsets.append(len(data))
+
+        status = os.stat(self._schedule_location)
+        self._index = (zlib.crc32(data), status.st_size, status.st_mtime_ns, days, offsets)
+
+        if sys.byteorder == 'big':
+            days, offsets = array.array('i', days), array.array('q', offsets)
+            days.byteswap()
+            offsets.byteswap()
+
+        self._write_atomic(self._index_location, self.INDEX_FILE_MAGIC + self._INDEX_HEADER.pack(self._index[0], self._index[1], self._index[2], len(days)) + days.tobytes() + offsets.tobytes())
+
+    def _read_index(self):
+        """
+        Returns the index of the schedule file, if it indexes the current contents of the file
+
+        return: Tuple, (checksum, size, modification time, array of date ordinals, array of offsets), or None if there is no index of the current contents
+        """
+        if self._index_location is None:
+            return None
+
+        try:
+            status = os.stat(self._schedule_location)
+
+            if self._index is None or self._index[1:3] != (status.st_size, status.st_mtime_ns):
+                self._index = None
+
+                with open(self._index_location, 'rb') as opened_file:
+                    data = opened_file.read()
+
+                if data[:len(self.INDEX_FILE_MAGIC)] != self.INDEX_FILE_MAGIC:
+                    return None
+
+                checksum, size, modification_time, number_days = self._INDEX_HEADER.unpack_from(data, len(self.INDEX_FILE_MAGIC))
+
+                if (size, modification_time) != (status.st_size, status.st_mtime_ns):
+                    return None
+
+                start = len(self.INDEX_FILE_MAGIC) + self._INDEX_HEADER.size
+                days = array.array('i', data[start:start + 4 * number_days])
+                offsets = array.array('q', data[start + 4 * number_days:start + 4 * number_days + 8 * (number_days + 1)])
+
+                if sys.byteorder == 'big':
+                    days.byteswap()
+                    offsets.byteswap()
+
+                if len(offsets) != number_days + 1:
+                    return None
+
+                self._index = (checksum, size, modification_time, days, offsets)
+        except (OSError, struct.error):
+            return None
+
+        return self._index
+
+    def _read_lines(self, file_location):
+        """
+        Returns the lines of a file, creating the file if it does not exist
+
+        file_location: Location of the file, string
+        return: Lines, list of strings
+        """
+        if not os.path.exists(file_location):
+            with open(file_location, 'x'):
+                pass
+
+        with open(file_location, 'r') as opened_file:
+            return opened_file.readlines()
+
+    def _parse_schedule(self, lines):
+        """
+        Parses the lines of a schedule file
+
+        lines: Lines of the schedule file, list of strings
+        return: Event series, list of Event
+        """
+        # Older schedule files store one line for every occurrence of a series
+        header = self._parse_header(lines[0]) if lines else None
+        self.needs_migration = header != self.SCHEDULE_FILE_HEADER
+
+        if self.needs_migration:
+            return [self._parse_occurrence(line) for line in lines if line.strip() != '']
+
+        return [self._parse_event(line) for line in lines[1:]]
+
+    def _format_schedule(self, events):
+        """
+        Formats event series as the contents of a schedule file
+
+        events: Event series, iterable of Event
+        return: Contents of the schedule file, string
+        """
+        # Write each event series into file once, recurring series first, then by date, then by identifier so that the same schedule is always written the same
+        events = sorted(events, key=lambda event: (event.frequency == 'none', event.date, event.recurrence_id))
+        self._count_identifiers(event.recurrence_id for event in events)
+
+        return self.SCHEDULE_FILE_HEADER + ' ' + str(self.next_id) + '\n' + ''.join(self._format_event(event) + '\n' for event in events)
+
+    def _parse_header(self, line):
+        """
+        Parses the first line of a schedule file, advancing the counter of identifiers to the one it holds
+
+        line: First line of the schedule file, string
+        return: Header of the schedule file, without the counter, string
+        """
+        header = line.strip()
+
+        if header.startswith(self.SCHEDULE_FILE_HEADER + ' '):
+            self.next_id = max(self.next_id, int(header[len(self.SCHEDULE_FILE_HEADER) + 1:]))
+
+            return self.SCHEDULE_FILE_HEADER
+
+        return header
+
+    def _parse_event(self, line):
+        """
+        Parses an event series from a line of the schedule file
+
+        line: Line of the schedule file, string
+        return: Event series, Event
+        """
+        # Exception dates follow the fixed-width fields and are preceded by their number
+        number_exceptions = int(line[81:85])
+        description_start = 85 + 8 * number_exceptions
+        exceptions = set(self._file_date(line[i:i + 8]) for i in range(85, description_start, 8))
+
+        leap_years, month_day = self._rule(int(line[69]))
+        identifiers = line[23:59].split()
+
+        return Event(identifiers[0], self._file_date(line[:8]), int(line[8:10]) * 60 + int(line[10:12]), int(line[12:14]) * 60 + int(line[14:16]), int(line[17:23], 16), line[description_start:].strip(), frequency=line[59:66].strip(), amount=int(line[66:69]), interval=int(line[70:73]), until=self._file_date(line[73:81]) if line[73:81].strip() else None, leap_years=leap_years, month_day=month_day, exceptions=exceptions, series_id=identifiers[1] if len(identifiers) > 1 else None)
+
+    def _parse_occurrence(self, line):
+        """
+        Parses an occurrence from a line of an older schedule file
+
+        line: Line of the schedule file, string
+        return: Occurrence as a single event of its series, Event
+        """
+        return Event(line[23:59], self._file_date(line[:8]), int(line[8:10]) * 60 + int(line[10:12]), int(line[12:14]) * 60 + int(line[14:16]), int(line[17:23], 16), line[69:].strip(), frequency=line[59:66].strip(), amount=int(line[66:69]))
+
+    def _format_event(self, event):
+        """
+        Formats an event series as a line of the schedule file, without the line break
+
+        event: Event series, Event
+        return: Line of the schedule file, string
+        """
+        exceptions = ''.join(self._file_date_string(ordinal) for ordinal in sorted(event.exceptions))
+        until = self._file_date_string(event.until) if event.until is not None else ''
+        identifiers = event.recurrence_id + (' ' + event.series_id if event.series_id is not None else '')
+
+        return self._file_date_string(event.date) + str(event.start // 60).zfill(2) + str(event.start % 60).zfill(2) + str(event.duration // 60).zfill(2) + str(event.duration % 60).zfill(2) + event.hex_color() + identifiers.ljust(36) + event.frequency.rjust(7) + str(event.amount).zfill(3) + str(self._rule_code(event)) + str(event.interval).zfill(3) + until.ljust(8) + str(len(event.exceptions)).zfill(4) + exceptions + event.description.strip()
+
+    def _parse_task(self, line):
+        """
+        Parses a to-do list task from a line of the to-do list file
+
+        line: Line of the to-do list file, string
+        return: Tuple, (completion, description)
+        """
+        contents = line.strip()
+
+        return (contents[0], contents[1:])
+
+    def _format_tasks(self, tasks):
+        """
+        Formats to-do list tasks as the contents of a to-do list file
+
+        tasks: Tasks in order, iterable of tuples, (completion, description)
+        return: Contents of the to-do list file, string
+        """
+        return ''.join(self._format_task(completion, description) + '\n' for completion, description in tasks)
+
+    def _format_task(self, completion, description):
+        """
+        Formats a to-do list task as a line of the to-do list file, without the line break
+
+        completion: Completion of the task, string
+        description: Description of the task, string
+        return: Line of the to-do list file, string
+        """
+        return completion + description.strip()
+
+    def _file_date(self, text):
+        """
+        Returns the day of a date stored in a file
+
+        text: Date, yyyymmdd, string
+        return: Date ordinal, int
+        """
+        return datetime.date(int(text[:4]), int(text[4:6]), int(text[6:8])).toordinal()
+
+    def _file_date_string(self, ordinal):
+        """
+        Returns a day as a date to be stored in a file
+
+        ordinal: Date ordinal, int
+        return: Date, yyyymmdd, string
+        """
+        date = datetime.date.fromordinal(ordinal)
+
+        return str(date.year).zfill(4) + str(date.month).zfill(2) + str(date.day).zfill(2)
+
+class JournaledStorage(TextStorage):
+    """
+    Class for the schedule and to-do list stored as text files with a journal of the changes made since the files were last written
+
+    Each change costs one append to a journal, which is replayed and written into the files when they are read
+    Reading a range of days applies the journal to the event series read instead, until the journal grows too long
+    The first line of a journal holds the checksum of the file contents it applies to, so a journal whose file was written without resetting it is ignored
+    """
+    # First line of journal files, followed by the checksum of the file the journal applies to
+    JOURNAL_FILE_HEADER = 'hourglass journal'
+
+    # Largest number of schedule journal records applied to ranges of days read, rather than written into the schedule file
+    JOURNAL_WINDOW_RECORDS = 1000
+
+    records_changes = True
+
+    def __init__(self, schedule_location, tasks_location, schedule_journal_location, tasks_journal_location, index_location=None):
+        """
+        Initializes the JournaledStorage class
+
+        schedule_location: Location of the schedule file, string
+        tasks_location: Location of the to-do list file, string
+        schedule_journal_location: Location of the schedule journal, string
+        tasks_journal_location: Location of the to-do list journal, string
+        index_location: Location of the index of the schedule file, or None if not indexed, string
+        """
+        super().__init__(schedule_location, tasks_location, index_location)
+        self._schedule_journal_location = schedule_journal_location
+        self._tasks_journal_location = tasks_journal_location
+
+        # Latest state recorded in the schedule journal of each event series it changes, None if removed, while reading ranges of days
+        # {recurrence_id: Event or None, ... }
+        self._journal_events = {}
+
+    def read_schedule(self):
+        """
+        Returns all event series, including the changes recorded in the journal
+
+        Records are '+line' (series added or edited) and '-recurrence_id' (series removed)
+
+        return: Event series, list of Event
+        """
+        try:
+            lines = self._read_lines(self._schedule_location)
+            events = self._parse_schedule(lines)
+
+            # Journals of older schedule files are not replayed, as the schedule is written again once migrated
+            records = self._journal_read(self._schedule_journal_location, ''.join(lines))
+
+            if self.needs_migration or not records:
+                self._journal_reset(self._schedule_journal_location, ''.join(lines))
+                return events
+
+            schedule = {event.recurrence_id: event for event in events}
+
+            # Identifiers of removed series stay allocated
+            for record in records:
+                if record[0] == '+':
+                    event = self._parse_event(record[1:])
+                    schedule[event.recurrence_id] = event
+                    self._count_identifiers([event.recurrence_id])
+                elif record[0] == '-':
+                    schedule.pop(record[1:], None)
+                    self._count_identifiers([record[1:]])
+        except (OSError, ValueError, IndexError) as error:
+            raise StorageError('unable to read from schedule file.') from error
+
+        # Write replayed changes into the schedule file, starting a new journal
+        self.write_schedule(schedule.values())
+
+        return list(schedule.values())
+
+    def reads_windows(self):
+        """
+        Returns whether event series can be read for a range of days without reading every event series, which requires a sorted schedule file and a short journal applying to it
+
+        return: boolean
+        """
+        if not super().reads_windows():
+            return False
+
+        try:
+            # The index holds the checksum of the schedule file, which is otherwise computed from the mapped file
+            index = self._read_index()
+
+            if index is not None:
+                checksum = index[0]
+            else:
+                with open(self._schedule_location, 'rb') as opened_file:
+                    with mmap.mmap(opened_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        checksum = zlib.crc32(mapped)
+
+            records = self._journal_records(self._schedule_journal_location, checksum)
+
+            if records is None or len(records) > self.JOURNAL_WINDOW_RECORDS:
+                return False
+
+            self._journal_events = {}
+
+            for record in records:
+                if record[0] == '+':
+                    event = self._parse_event(record[1:])
+                    self._journal_events[event.recurrence_id] = event
+                elif record[0] == '-':
+                    self._journal_events[record[1:]] = None
+
+            self._count_identifiers(self._journal_events)
+        except (OSError, ValueError, IndexError):
+            return False
+
+        return True
+
+    def read_series(self):
+        """
+        Returns the recurring event series, including the changes recorded in the journal
+
+        return: Event series, list of Event
+        """
+        events = [event for event in super().read_series() if event.recurrence_id not in self._journal_events]
+
+        return events + [event for event in self._journal_events.values() if event is not None and event.frequency != 'none']
+
+    def read_events(self, first_day, last_day):
+        """
+        Returns the events that do not recur occurring within the given range, including the changes recorded in the journal
+
+        first_day: First day of the range, date ordinal, int
+        last_day: Day after the last day of the range, date ordinal, int
+        return: Events, list of Event
+        """
+        events = [event for event in super().read_events(first_day, last_day) if event.recurrence_id not in self._journal_events]
+
+        return events + [event for event in self._journal_events.values() if event is not None and event.frequency == 'none' and first_day <= event.date < last_day]
+
+    def write_schedule(self, events):
+        """
+        Replaces all event series, starting a new journal
+
+        events: Event series, iterable of Event
+        """
+        try:
+            contents = self._format_schedule(events)
+            self._write_schedule_file(contents)
+            self._journal_reset(self._schedule_journal_location, contents)
+        except OSError as error:
+            raise StorageError('unable to write to schedule file.') from error
+
+    def read_tasks(self):
+        """
+        Returns all to-do list tasks in order, including the changes recorded in the journal
+
+        Records are '+index line' (insert), '-index' (remove), '~index line' (replace), and '>index new_index line' (move and replace)
+
+        return: List of tuples, (completion, description)
+        """
+        try:
+            lines = self._read_lines(self._tasks_location)
+            tasks = [self._parse_task(line) for line in lines]
+            records = self._journal_read(self._tasks_journal_location, ''.join(lines))
+
+            if not records:
+                self._journal_reset(self._tasks_journal_location, ''.join(lines))
+                return tasks
+
+            for record in records:
+                if record[0] == '+':
+                    index, line = record[1:].split(' ', 1)
+                    tasks.insert(int(index), self._parse_task(line))
+                elif record[0] == '-':
+                    del tasks[int(record[1:])]
+                elif record[0] == '~':
+                    index, line = record[1:].split(' ', 1)
+                    tasks[int(index)] = self._parse_task(line)
+                elif record[0] == '>':
+                    index, new_index, line = record[1:].split(' ', 2)
+                    del tasks[int(index)]
+                    tasks.insert(int(new_index), self._parse_task(line))
+        except (OSError, ValueError, IndexError) as error:
+            raise StorageError('unable to read from to-do list file.') from error
+
+        # Write replayed changes into the to-do list file, starting a new journal
+        self.write_tasks(tasks)
+
+        return tasks
+
+    def write_tasks(self, tasks):
+        """
+        Replaces all to-do list tasks, starting a new journal
+
+        tasks: Tasks in order, iterable of tuples, (completion, description)
+        """
+        try:
+            contents = self._format_tasks(tasks)
+            self._write_atomic(self._tasks_location, contents)
+            self._journal_reset(self._tasks_journal_location, contents)
+        except OSError as error:
+            raise StorageError('unable to write to to-do list file.') from error
+
+    def write_event(self, event):
+        """
+        Records that an event series was added or edited
+
+        event: Event series, Event
+        """
+        self._journal_append(self._schedule_journal_location, '+' + self._format_event(event), 'schedule')
+        super().write_event(event)
+
+    def remove_event(self, recurrence_id):
+        """
+        Records that an event series was removed
+
+        recurrence_id: Unique identifier of the event series, string
+        """
+        self._journal_append(self._schedule_journal_location, '-' + recurrence_id, 'schedule')
+
+    def insert_task(self, index, completion, description):
+        """
+        Records that a to-do list task was inserted
+
+        index: Position of the task, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+        self._journal_append(self._tasks_journal_location, '+' + str(index) + ' ' + self._format_task(completion, description), 'to-do list')
+
+    def remove_task(self, index):
+        """
+        Records that a to-do list task was removed
+
+        index: Position of the task, int
+        """
+        self._journal_append(self._tasks_journal_location, '-' + str(index), 'to-do list')
+
+    def replace_task(self, index, completion, description):
+        """
+        Records that a to-do list task was edited
+
+        index: Position of the task, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+        self._journal_append(self._tasks_journal_location, '~' + str(index) + ' ' + self._format_task(completion, description), 'to-do list')
+
+    def move_task(self, index, new_index, completion, description):
+        """
+        Records that a to-do list task was edited and moved
+
+        index: Position of the task before it is moved, int
+        new_index: Position of the task after it is moved, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+        self._journal_append(self._tasks_journal_location, '>' + str(index) + ' ' + str(new_index) + ' ' + self._format_task(completion, description), 'to-do list')
+
+    def _journal_header(self, contents):
+        """
+        Returns the first line of a journal applying to the given file contents
+
+        contents: Contents of the file the journal applies to, string
+        return: First line of the journal, without the line break, string
+        """
+        return self.JOURNAL_FILE_HEADER + ' ' + str(zlib.crc32(contents.encode()))
+
+    def _journal_read(self, file_location, contents):
+        """
+        Returns the records of a journal, if the journal applies to the given file contents
+
+        file_location: Location of the journal, string
+        contents: Contents of the file the journal applies to, string
+        return: Records, list of strings, or None if there is no journal applying to the contents
+        """
+        return self._journal_records(file_location, zlib.crc32(contents.encode()))
+
+    def _journal_records(self, file_location, checksum):
+        """
+        Returns the records of a journal, if the journal applies to the file contents with the given checksum, removing a record interrupted while being appended
+
+        file_location: Location of the journal, string
+        checksum: Checksum of the contents of the file the journal applies to, int
+        return: Records, list of strings, or None if there is no journal applying to the contents
+        """
+        if not os.path.exists(file_location):
+            return None
+
+        with open(file_location, 'r') as opened_file:
+            lines = opened_file.readlines()
+
+        if not lines or lines[0].rstrip('\n') != self.JOURNAL_FILE_HEADER + ' ' + str(checksum):
+            return None
+
+        # A record interrupted while being appended has no line break, and is cut off so the next record is not appended to it
+        if not lines[-1].endswith('\n'):
+            with open(file_location, 'rb+') as opened_file:
+                opened_file.truncate(opened_file.read().rfind(b'\n') + 1)
+                opened_file.flush()
+                os.fsync(opened_file.fileno())
+
+            lines.pop()
+
+        return [line[:-1] for line in lines[1:]]
+
+    def _journal_reset(self, file_location, contents):
+        """
+        Starts an empty journal applying to the given file contents
+
+        file_location: Location of the journal, string
+        contents: Contents of the file the journal applies to, string
+        """
+        self._write_atomic(file_location, self._journal_header(contents) + '\n')
+
+    def _journal_append(self, file_location, record, name):
+        """
+        Appends a record to a journal, returning once it is on disk
+
+        file_location: Location of the journal, string
+        record: Record, without line breaks, string
+        name: Name of the journaled file used in error messages, string
+        """
+        try:
+            with open(file_location, 'a') as opened_file:
+                opened_file.write(record + '\n')
+                opened_file.flush()
+                os.fsync(opened_file.fileno())
+        except OSError as error:
+            raise StorageError('unable to record change to ' + name + '.') from error
+
+class BinaryStorage(Storage):
+    """
+    Class for the schedule and to-do list stored as binary files
+
+    The schedule is stored in columns of fixed-size fields, one entry per event series, with the recurrence rules in a series table and the descriptions in a string table; both files are rewritten in full
+    Recurring series are stored before the other events, which are sorted by date, so that a range of days is found by a binary search of the dates
+    The header of the schedule file holds the next identifier of the counter allocating event series identifiers
+    """
+    # First bytes of schedule and to-do list files
+    SCHEDULE_FILE_MAGIC = b'HGS\x03'
+    TASKS_FILE_MAGIC = b'HGT\x01'
+
+    # Frequencies in the order of their codes in the series table
+    FREQUENCIES = ('none', 'daily', 'weekly', 'monthly', 'yearly')
+
+    # Schedule header: next identifier, identifier kind, number of recurring series, number of events that do not recur, number of exceptions, number of strings, length of the string table
+    _SCHEDULE_HEADER = struct.Struct('<IBIIIII')
+
+    # Identifiers are stored as indexes in the string table, as 16 bytes when they are all UUIDs, or as 4 bytes when they are all allocated from the counter
+    _STRING_IDENTIFIERS = 0
+    _UUID_IDENTIFIERS = 1
+    _INTEGER_IDENTIFIERS = 2
+
+    # Typecodes of the event columns, followed by the identifiers: date, start, duration, color, index in the series table (-1 if the event does not recur, or -2 - the index of the series whose occurrence the event replaces), description index in the string table
+    _COLUMNS = ('i', 'H', 'H', 'I', 'i', 'I')
+
+    # Series table record: frequency code, amount, interval, until (0 if not limited), day of the month and leap years mode, index of the first exception, number of exceptions
+    _SERIES = struct.Struct('<BHHiBII')
+
+    # To-do list task record: completion, description length
+    _TASK = struct.Struct('<1sI')
+
+    # Number of items in a file
+    _COUNT = struct.Struct('<I')
+
+    def __init__(self, schedule_location, tasks_location):
+        """
+        Initializes the BinaryStorage class
+
+        schedule_location: Location of the schedule file, string
+        tasks_location: Location of the to-do list file, string
+        """
+        super().__init__()
+        self._schedule_location = schedule_location
+        self._tasks_location = tasks_location
+
+    def read_schedule(self):
+        """
+        Returns all event series
+
+        return: Event series, list of Event
+        """
+        try:
+            return self._read_schedule_range(self._read_bytes(self._schedule_location, self.SCHEDULE_FILE_MAGIC), None, None)
+        except (OSError, ValueError, IndexError, struct.error) as error:
+            raise StorageError('unable to read from schedule file.') from error
+
+    def reads_windows(self):
+        """
+        Returns whether event series can be read for a range of days without reading every event series, which requires a schedule file
+
+        return: boolean
+        """
+        try:
+            with open(self._schedule_location, 'rb') as opened_file:
+                return opened_file.read(len(self.SCHEDULE_FILE_MAGIC)) == self.SCHEDULE_FILE_MAGIC
+        except OSError:
+            return False
+
+    def read_series(self):
+        """
+        Returns the recurring event series, which are stored before the other events
+
+        return: Event series, list of Event
+        """
+        try:
+            return self._read_schedule_range(self._read_bytes(self._schedule_location, self.SCHEDULE_FILE_MAGIC), None, 0)
+        except (OSError, ValueError, IndexError, struct.error) as error:
+            raise StorageError('unable to read from schedule file.') from error
+
+    def read_events(self, first_day, last_day):
+        """
+        Returns the events that do not recur occurring within the given range
+
+        first_day: First day of the range, date ordinal, int
+        last_day: Day after the last day of the range, date ordinal, int
+        return: Events, list of Event
+        """
+        try:
+            return self._read_schedule_range(self._read_bytes(self._schedule_location, self.SCHEDULE_FILE_MAGIC), first_day, last_day)
+        except (OSError, ValueError, IndexError, struct.error) as error:
+            raise StorageError('unable to read from schedule file.') from error
+
+    def write_schedule(self, events):
+        """
+        Replaces all event series
+
+        events: Event series, iterable of Event
+        """
+        try:
+            events = sorted(events, key=lambda event: (event.frequency == 'none', event.date))
+            columns = [array.array(typecode) for typecode in self._COLUMNS]
+            dates, starts, durations, colors, series_indexes, descriptions = columns
+            series = []
+            exceptions = array.array('i')
+
+            # Descriptions repeated by several events are stored once
+            strings = {}
+
+            self._count_identifiers(event.recurrence_id for event in events)
+
+            if self.next_id <= 0xffffffff and all(event.recurrence_id.isdecimal() and str(int(event.recurrence_id)) == event.recurrence_id for event in events):
+                identifier_kind = self._INTEGER_IDENTIFIERS
+            else:
+                try:
+                    identifier_kind = self._UUID_IDENTIFIERS if all(str(uuid.UUID(event.recurrence_id)) == event.recurrence_id for event in events) else self._STRING_IDENTIFIERS
+                except ValueError:
+                    identifier_kind = self._STRING_IDENTIFIERS
+
+            if identifier_kind == self._INTEGER_IDENTIFIERS:
+                identifiers = array.array('I', [int(event.recurrence_id) for event in events])
+            elif identifier_kind == self._UUID_IDENTIFIERS:
+                identifiers = bytes.fromhex(''.join(event.recurrence_id for event in events).replace('-', ''))
+            else:
+                identifiers = array.array('I', [strings.setdefault(event.recurrence_id, len(strings)) for event in events])
+
+            # Entries of the recurring series, which are also their indexes in the series table
+            series_entries = {event.recurrence_id: entry for entry, event in enumerate(events) if event.frequency != 'none'}
+
+            for event in events:
+                dates.append(event.date)
+                starts.append(event.start)
+                durations.append(event.duration)
+                colors.append(event.color)
+                descriptions.append(strings.setdefault(event.description, len(strings)))
+
+                if event.frequency == 'none':
+                    series_indexes.append(-2 - series_entries[event.series_id] if event.series_id in series_entries else -1)
+                else:
+                    series_indexes.append(len(series))
+                    series.append(self._SERIES.pack(self.FREQUENCIES.index(event.frequency), event.amount, event.interval, event.until or 0, self._rule_code(event), len(exceptions), len(event.exceptions)))
+                    exceptions.extend(sorted(event.exceptions))
+
+            encoded = [string.encode() for string in strings]
+            string_offsets = array.array('I', [0])
+
+            for string in encoded:
+                string_offsets.append(string_offsets[-1] + len(string))
+
+            header = self._SCHEDULE_HEADER.pack(self.next_id, identifier_kind, len(series), len(events) - len(series), len(exceptions), len(encoded), string_offsets[-1])
+
+            if sys.byteorder == 'big':
+                for values in columns + [exceptions, string_offsets] + ([identifiers] if identifier_kind != self._UUID_IDENTIFIERS else []):
+                    values.byteswap()
+
+            parts = [self.SCHEDULE_FILE_MAGIC, header]
+            parts.extend(values.tobytes() for values in columns)
+            parts.append(bytes(identifiers))
+            parts.extend(series)
+            parts.append(exceptions.tobytes())
+            parts.append(string_offsets.tobytes())
+            parts.extend(encoded)
+
+            self._write_atomic(self._schedule_location, b''.join(parts))
+        except (OSError, ValueError, OverflowError, struct.error) as error:
+            raise StorageError('unable to write to schedule file.') from error
+
+    def read_tasks(self):
+        """
+        Returns all to-do list tasks in order
+
+        return: List of tuples, (completion, description)
+        """
+        try:
+            data = self._read_bytes(self._tasks_location, self.TASKS_FILE_MAGIC)
+
+            if data is None:
+                return []
+
+            (number_tasks,) = self._COUNT.unpack_from(data, len(self.TASKS_FILE_MAGIC))
+            offset = len(self.TASKS_FILE_MAGIC) + self._COUNT.size
+            tasks = []
+
+            for _ in range(number_tasks):
+                completion, description_length = self._TASK.unpack_from(data, offset)
+                offset = offset + self._TASK.size
+                tasks.append((completion.decode(), data[offset:offset + description_length].decode()))
+                offset = offset + description_length
+
+            return tasks
+        except (OSError, ValueError, struct.error) as error:
+            raise StorageError('unable to read from to-do list file.') from error
+
+    def write_tasks(self, tasks):
+        """
+        Replaces all to-do list tasks
+
+        tasks: Tasks in order, iterable of tuples, (completion, description)
+        """
+        try:
+            tasks = list(tasks)
+            parts = [self.TASKS_FILE_MAGIC, self._COUNT.pack(len(tasks))]
+
+            for completion, description in tasks:
+                description = description.strip().encode()
+                parts.append(self._TASK.pack(completion.encode(), len(description)))
+                parts.append(description)
+
+            self._write_atomic(self._tasks_location, b''.join(parts))
+        except (OSError, struct.error) as error:
+            raise StorageError('unable to write to to-do list file.') from error
+
+    def _read_schedule_range(self, data, first_day, last_day):
+        """
+        Returns the event series of a schedule file within the given range of days, decoding only the entries of the range
+
+        data: Contents of the schedule file, bytes, or None if the file does not exist or is empty
+        first_day: First day of the events that do not recur, date ordinal, or None to start with the recurring series, int
+        last_day: Day after the last day of the events that do not recur, date ordinal, 0 to end with the recurring series, or None to end with the last event, int
+        return: Event series, list of Event
+        """
+        if data is None:
+            return []
+
+        view = memoryview(data)
+
+        next_id, identifier_kind, number_series, number_events, number_exceptions, number_strings, strings_length = self._SCHEDULE_HEADER.unpack_from(data, len(self.SCHEDULE_FILE_MAGIC))
+        self.next_id = max(self.next_id, next_id)
+        offset = len(self.SCHEDULE_FILE_MAGIC) + self._SCHEDULE_HEADER.size
+
+        number_entries = number_series + number_events
+
+        # Offsets of the columns, of the identifiers, of the series table, of the exceptions, and of the string table, in order
+        column_offsets = []
+
+        for typecode in self._COLUMNS:
+            column_offsets.append(offset)
+            offset = offset + array.array(typecode).itemsize * number_entries
+
+        identifiers_offset = offset
+        identifier_size = 16 if identifier_kind == self._UUID_IDENTIFIERS else 4
+        series_offset = identifiers_offset + identifier_size * number_entries
+        exceptions_offset = series_offset + self._SERIES.size * number_series
+        string_offsets_offset = exceptions_offset + 4 * number_exceptions
+        strings_offset = string_offsets_offset + 4 * (number_strings + 1)
+
+        if strings_offset + strings_length != len(data):
+            raise ValueError('truncated schedule file')
+
+        dates = self._read_array('i', view, column_offsets[0], number_entries)
+
+        # Entries of the range, found by a binary search of the dates of the events that do not recur
+        first = 0 if first_day is None else bisect.bisect_left(dates, first_day, number_series, number_entries)
+        last = number_entries if last_day is None else number_series if last_day == 0 else bisect.bisect_left(dates, last_day, first, number_entries)
+        starts, durations, colors, series_indexes, descriptions = [self._read_array(typecode, view, column_offset + array.array(typecode).itemsize * first, last - first) for typecode, column_offset in zip(self._COLUMNS[1:], column_offsets[1:])]
+        exceptions = self._read_array('i', view, exceptions_offset, number_exceptions) if first < number_series else ()
+        string_offsets = self._read_array('I', view, string_offsets_offset, number_strings + 1)
+
+        # Strings are decoded once, as descriptions may be shared
+        strings = {}
+
+        for string_index in set(descriptions):
+            strings[string_index] = str(view[strings_offset + string_offsets[string_index]:strings_offset + string_offsets[string_index + 1]], 'utf-8')
+
+        recurrence_ids = self._read_identifiers(view, identifier_kind, identifiers_offset, strings_offset, string_offsets, first, last)
+
+        # Identifiers of the series whose occurrences are replaced, read only if any event of the range replaces one
+        series_ids = self._read_identifiers(view, identifier_kind, identifiers_offset, strings_offset, string_offsets, 0, number_series) if min(series_indexes, default=0) < -1 else None
+
+        events = []
+
+        for recurrence_id, date, start, duration, color, series_index, description in zip(recurrence_ids, dates[first:last], starts, durations, colors, series_indexes, descriptions):
+            if series_index < 0:
+                events.append(Event(recurrence_id, date, start, duration, color, strings[description], series_id=series_ids[-2 - series_index] if series_index < -1 else None))
+            else:
+                frequency, amount, interval, until, rule, first_exception, number_series_exceptions = self._SERIES.unpack_from(data, series_offset + self._SERIES.size * series_index)
+                leap_years, month_day = self._rule(rule)
+                events.append(Event(recurrence_id, date, start, duration, color, strings[description], frequency=self.FREQUENCIES[frequency], amount=amount, interval=interval, until=until or None, leap_years=leap_years, month_day=month_day, exceptions=set(exceptions[first_exception:first_exception + number_series_exceptions])))
+
+        return events
+
+    def _read_identifiers(self, view, identifier_kind, identifiers_offset, strings_offset, string_offsets, first, last):
+        """
+        Returns the identifiers of a range of entries of a schedule file
+
+        view: Contents of the schedule file, memoryview
+        identifier_kind: How the identifiers are stored, int
+        identifiers_offset: Offset of the identifiers, int
+        strings_offset: Offset of the strings of the string table, int
+        string_offsets: Offsets of the strings in the string table, followed by its length, array of ints
+        first: First entry, int
+        last: Entry after the last entry, int
+        return: List of strings
+        """
+        if identifier_kind == self._INTEGER_IDENTIFIERS:
+            return [str(identifier) for identifier in self._read_array('I', view, identifiers_offset + 4 * first, last - first)]
+        elif identifier_kind == self._UUID_IDENTIFIERS:
+            # Formatted from the hexadecimal digits of every identifier at once, which is faster than one uuid.UUID per identifier
+            digits = view[identifiers_offset + 16 * first:identifiers_offset + 16 * last].hex()
+            return [digits[i:i + 8] + '-' + digits[i + 8:i + 12] + '-' + digits[i + 12:i + 16] + '-' + digits[i + 16:i + 20] + '-' + digits[i + 20:i + 32] for i in range(0, len(digits), 32)]
+
+        return [str(view[strings_offset + string_offsets[string_index]:strings_offset + string_offsets[string_index + 1]], 'utf-8') for string_index in self._read_array('I', view, identifiers_offset + 4 * first, last - first)]
+
+    def _read_array(self, typecode, view, offset, length):
+        """
+        Returns a column of values stored in a file
+
+        typecode: Typecode of the values, string
+        view: Contents of the file, memoryview
+        offset: Offset of the first value, int
+        length: Number of values, int
+        return: array.array
+        """
+        values = array.array(typecode)
+        values.frombytes(view[offset:offset + values.itemsize * length])
+
+        if sys.byteorder == 'big':
+            values.byteswap()
+
+        return values
+
+    def _read_bytes(self, file_location, magic):
+        """
+        Returns the contents of a binary file, checking its first bytes
+
+        file_location: Location of the file, string
+        magic: Expected first bytes of the file, bytes
+        return: Contents of the file, bytes, or None if the file does not exist or is empty
+        """
+        if not os.path.exists(file_location):
+            return None
+
+        with open(file_location, 'rb') as opened_file:
+            data = opened_file.read()
+
+        if not data:
+            return None
+
+        if not data.startswith(magic):
+            raise ValueError('unknown file format')
+
+        return data
+
+class SQLiteStorage(Storage):
+    """
+    Class for the SQLite database storing the schedule and to-do list
+
+    Event series and to-do list tasks are written one change per transaction, so the database is up to date after every change
+    The counters table holds the next identifier of the counter allocating event series identifiers
+    """
+    records_changes = True
+
+    def __init__(self, file_location):
+        """
+        Initializes the SQLiteStorage class, creating the tables and indexes if needed
+
+        file_location: Location of the database file, string
+        """
+        super().__init__()
+
+        try:
+            # The connection may be used by another thread, such as the worker of AutosaveStorage, which serializes its use
+            self._connection = sqlite3.connect(file_location, check_same_thread=False)
+
+            # Write-ahead logging lets each change commit with a single append
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+
+            with self._connection:
+                self._connection.execute("CREATE TABLE IF NOT EXISTS events (recurrence_id TEXT PRIMARY KEY, date INTEGER NOT NULL, start INTEGER NOT NULL, duration INTEGER NOT NULL, color INTEGER NOT NULL, description TEXT NOT NULL, frequency TEXT NOT NULL, amount INTEGER NOT NULL, interval INTEGER NOT NULL, until INTEGER, leap_years INTEGER NOT NULL, month_day TEXT NOT NULL DEFAULT 'date', series_id TEXT)")
+                self._connection.execute('CREATE TABLE IF NOT EXISTS exceptions (recurrence_id TEXT NOT NULL, date INTEGER NOT NULL, PRIMARY KEY (recurrence_id, date))')
+                self._connection.execute('CREATE TABLE IF NOT EXISTS tasks (position INTEGER NOT NULL, completion TEXT NOT NULL, description TEXT NOT NULL)')
+                self._connection.execute('CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+                self._connection.execute('CREATE INDEX IF NOT EXISTS events_date ON events (date)')
+                self._connection.execute('CREATE INDEX IF NOT EXISTS events_start ON events (date, start)')
+                self._connection.execute('CREATE INDEX IF NOT EXISTS exceptions_date ON exceptions (date)')
+                self._connection.execute('CREATE INDEX IF NOT EXISTS tasks_position ON tasks (position)')
+
+            # Databases not written yet have no counter
+            counter = self._connection.execute("SELECT value FROM counters WHERE name = 'events'").fetchone()
+            self._numbered = counter is not None
+
+            if counter is not None:
+                self.next_id = counter[0]
+        except sqlite3.Error as error:
+            raise StorageError('unable to open database.') from error
+
+    def close(self):
+        """
+        Closes the database
+        """
+        self._connection.close()
+
+    def read_schedule(self):
+        """
+        Returns all event series
+
+        return: Event series, list of Event
+        """
+        return self._select_events('1', ())
+
+    def reads_windows(self):
+        """
+        Returns whether event series can be read for a range of days without reading every event series, which requires a database with a counter
+
+        return: boolean
+        """
+        return self._numbered
+
+    def read_series(self):
+        """
+        Returns the recurring event series
+
+        return: Event series, list of Event
+        """
+        return self._select_events("events.frequency != 'none'", ())
+
+    def read_events(self, first_day, last_day):
+        """
+        Returns the events that do not recur occurring within the given range
+
+        first_day: First day of the range, date ordinal, int
+        last_day: Day after the last day of the range, date ordinal, int
+        return: Events, list of Event
+        """
+        return self._select_events("events.date >= ? AND events.date < ? AND events.frequency = 'none'", (first_day, last_day))
+
+    def _select_events(self, condition, parameters):
+        """
+        Returns the event series matching a condition
+
+        condition: SQL condition on the events table, string
+        parameters: Parameters of the condition, tuple
+        return: Event series, list of Event
+        """
+        try:
+            exceptions = {}
+
+            for recurrence_id, date in self._connection.execute('SELECT exceptions.recurrence_id, exceptions.date FROM exceptions JOIN events ON exceptions.recurrence_id = events.recurrence_id WHERE ' + condition, parameters):
+                exceptions.setdefault(recurrence_id, set()).add(date)
+
+            return [Event(recurrence_id, date, start, duration, color, description, frequency=frequency, amount=amount, interval=interval, until=until, leap_years=bool(leap_years), month_day=month_day, exceptions=exceptions.get(recurrence_id), series_id=series_id) for recurrence_id, date, start, duration, color, description, frequency, amount, interval, until, leap_years, month_day, series_id in self._connection.execute('SELECT recurrence_id, date, start, duration, color, description, frequency, amount, interval, until, leap_years, month_day, series_id FROM events WHERE ' + condition, parameters)]
+        except sqlite3.Error as error:
+            raise StorageError('unable to read from database.') from error
+
+    def write_schedule(self, events):
+        """
+        Replaces all event series
+
+        events: Event series, iterable of Event
+        """
+        try:
+            with self._connection:
+                self._connection.execute('DELETE FROM events')
+                self._connection.execute('DELETE FROM exceptions')
+
+                for event in events:
+                    self._insert_event(event)
+
+                self._write_counter()
+        except sqlite3.Error as error:
+            raise StorageError('unable to write to database.') from error
+
+    def write_event(self, event):
+        """
+        Adds or replaces an event series
+
+        event: Event series, Event
+        """
+        try:
+            with self._connection:
+                self._connection.execute('DELETE FROM exceptions WHERE recurrence_id = ?', (event.recurrence_id,))
+                self._insert_event(event)
+                self._write_counter()
+        except sqlite3.Error as error:
+            raise StorageError('unable to record change to schedule.') from error
+
+    def remove_event(self, recurrence_id):
+        """
+        Removes an event series, if any
+
+        recurrence_id: Unique identifier of the event series, string
+        """
+        try:
+            with self._connection:
+                self._connection.execute('DELETE FROM events WHERE recurrence_id = ?', (recurrence_id,))
+                self._connection.execute('DELETE FROM exceptions WHERE recurrence_id = ?', (recurrence_id,))
+        except sqlite3.Error as error:
+            raise StorageError('unable to record change to schedule.') from error
+
+    def _write_counter(self):
+        """
+        Stores the next identifier of the counter, within the current transaction
+        """
+        self._connection.execute("INSERT OR REPLACE INTO counters VALUES ('events', ?)", (self.next_id,))
+        self._numbered = True
+
+    def _insert_event(self, event):
+        """
+        Inserts or replaces the rows of an event series within the current transaction
+
+        event: Event series, Event
+        """
+        self._connection.execute('INSERT OR REPLACE INTO events (recurrence_id, date, start, duration, color, description, frequency, amount, interval, until, leap_years, month_day, series_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (event.recurrence_id, event.date, event.start, event.duration, event.color, event.description, event.frequency, event.amount, event.interval, event.until, int(event.leap_years), event.month_day, event.series_id))
+        self._connection.executemany('INSERT INTO exceptions VALUES (?, ?)', ((event.recurrence_id, date) for date in event.exceptions))
+        self._count_identifiers([event.recurrence_id])
+
+    def read_tasks(self):
+        """
+        Returns all to-do list tasks in order
+
+        return: List of tuples, (completion, description)
+        """
+        try:
+            return self._connection.execute('SELECT completion, description FROM tasks ORDER BY position').fetchall()
+        except sqlite3.Error as error:
+            raise StorageError('unable to read from database.') from error
+
+    def write_tasks(self, tasks):
+        """
+        Replaces all to-do list tasks
+
+        tasks: Tasks in order, iterable of tuples, (completion, description)
+        """
+        try:
+            with self._connection:
+                self._connection.execute('DELETE FROM tasks')
+                self._connection.executemany('INSERT INTO tasks VALUES (?, ?, ?)', ((position, completion, description) for position, (completion, description) in enumerate(tasks)))
+        except sqlite3.Error as error:
+            raise StorageError('unable to write to database.') from error
+
+    def insert_task(self, index, completion, description):
+        """
+        Inserts a to-do list task
+
+        index: Position of the task, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+        try:
+            with self._connection:
+                self._insert_task(index, completion, description)
+        except sqlite3.Error as error:
+            raise StorageError('unable to record change to to-do list.') from error
+
+    def remove_task(self, index):
+        """
+        Removes a to-do list task
+
+        index: Position of the task, int
+        """
+        try:
+            with self._connection:
+                self._remove_task(index)
+        except sqlite3.Error as error:
+            raise StorageError('unable to record change to to-do list.') from error
+
+    def replace_task(self, index, completion, description):
+        """
+        Replaces a to-do list task
+
+        index: Position of the task, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+        try:
+            with self._connection:
+                self._connection.execute('UPDATE tasks SET completion = ?, description = ? WHERE position = ?', (completion, description, index))
+        except sqlite3.Error as error:
+            raise StorageError('unable to record change to to-do list.') from error
+
+    def move_task(self, index, new_index, completion, description):
+        """
+        Moves and replaces a to-do list task
+
+        index: Position of the task before it is moved, int
+        new_index: Position of the task after it is moved, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+        try:
+            with self._connection:
+                self._remove_task(index)
+                self._insert_task(new_index, completion, description)
+        except sqlite3.Error as error:
+            raise StorageError('unable to record change to to-do list.') from error
+
+    def _insert_task(self, index, completion, description):
+        """
+        Inserts a to-do list task within the current transaction
+
+        index: Position of the task, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+        self._connection.execute('UPDATE tasks SET position = position + 1 WHERE position >= ?', (index,))
+        self._connection.execute('INSERT INTO tasks VALUES (?, ?, ?)', (index, completion, description))
+
+    def _remove_task(self, index):
+        """
+        Removes a to-do list task within the current transaction
+
+        index: Position of the task, int
+        """
+        self._connection.execute('DELETE FROM tasks WHERE position = ?', (index,))
+        self._connection.execute('UPDATE tasks SET position = position - 1 WHERE position > ?', (index,))
+
+class AutosaveStorage(Storage):
+    """
+    Class for storage whose changes are written by a worker thread
+
+    Wraps another storage: changes are recorded in memory as they are made, then written together by a worker thread once no change was made for a short delay, or at the latest a few seconds after the first change not written
+    Callers never wait for writes, except when reading while the worker writes; storage that does not record changes is written in full, from the event series and tasks the worker keeps
+    Changes whose write failed are kept, and written again once another change is made or the storage is closed
+    """
+    records_changes = True
+
+    def __init__(self, storage, delay=1, maximum_delay=5):
+        """
+        Initializes the AutosaveStorage class, starting the worker thread
+
+        storage: Wrapped storage, Storage
+        delay: Seconds without changes after which changes are written, float
+        maximum_delay: Seconds after the first change not written after which changes are written, float
+        """
+        super().__init__()
+        self._storage = storage
+        self._delay = delay
+        self._maximum_delay = maximum_delay
+
+        # Changes not written yet in order, and times of the first and last of them
+        # [(name of the storage method, arguments), ... ]
+        self._changes = []
+        self._first_change = None
+        self._last_change = None
+        self._closed = False
+
+        # Whether the last write failed, in which case the changes not written are written again once another change is made or the storage is closed
+        self._failed = False
+
+        # Error of the last write, reported by take_error, None if none
+        self._error = None
+
+        # Condition signalling changes to the worker, and lock serializing the use of the wrapped storage
+        self._condition = threading.Condition()
+        self._storage_lock = threading.Lock()
+
+        # Every event series and task last written by the worker to storage that does not record changes, None until then
+        # {recurrence_id: Event, ... }, [(completion, description), ... ]
+        self._events = None
+        self._tasks = None
+
+        self._thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+        self._thread.start()
+
+    def read_schedule(self):
+        """
+        Returns all event series
+
+        return: Event series, list of Event
+        """
+        with self._storage_lock:
+            events = self._storage.read_schedule()
+            self.needs_migration = self._storage.needs_migration
+            self._count_read()
+
+        return events
+
+    def reads_windows(self):
+        """
+        Returns whether event series can be read for a range of days without reading every event series
+
+        return: boolean
+        """
+        with self._storage_lock:
+            reads_windows = self._storage.reads_windows()
+            self._count_read()
+
+        return reads_windows
+
+    def read_series(self):
+        """
+        Returns the recurring event series
+
+        return: Event series, list of Event
+        """
+        with self._storage_lock:
+            events = self._storage.read_series()
+            self._count_read()
+
+        return events
+
+    def read_events(self, first_day, last_day):
+        """
+        Returns the events that do not recur occurring within the given range
+
+        first_day: First day of the range, date ordinal, int
+        last_day: Day after the last day of the range, date ordinal, int
+        return: Events, list of Event
+        """
+        with self._storage_lock:
+            return self._storage.read_events(first_day, last_day)
+
+    def read_tasks(self):
+        """
+        Returns all to-do list tasks in order
+
+        return: List of tuples, (completion, description)
+        """
+        with self._storage_lock:
+            return self._storage.read_tasks()
+
+    def write_schedule(self, events):
+        """
+        Records that all event series were replaced
+
+        events: Event series, iterable of Event
+        """
+        events = list(events)
+        self._count_identifiers(event.recurrence_id for event in events)
+        self._record('write_schedule', (events,))
+
+    def write_tasks(self, tasks):
+        """
+        Records that all to-do list tasks were replaced
+
+        tasks: Tasks in order, iterable of tuples, (completion, description)
+        """
+        self._record('write_tasks', (list(tasks),))
+
+    def write_event(self, event):
+        """
+        Records that an event series was added or edited
+
+        event: Event series, Event
+        """
+        super().write_event(event)
+        self._record('write_event', (event,))
+
+    def remove_event(self, recurrence_id):
+        """
+        Records that an event series was removed
+
+        recurrence_id: Unique identifier of the event series, string
+        """
+        self._record('remove_event', (recurrence_id,))
+
+    def insert_task(self, index, completion, description):
+        """
+        Records that a to-do list task was inserted
+
+        index: Position of the task, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+        self._record('insert_task', (index, completion, description))
+
+    def remove_task(self, index):
+        """
+        Records that a to-do list task was removed
+
+        index: Position of the task, int
+        """
+        self._record('remove_task', (index,))
+
+    def replace_task(self, index, completion, description):
+        """
+        Records that a to-do list task was edited
+
+        index: Position of the task, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+        self._record('replace_task', (index, completion, description))
+
+    def move_task(self, index, new_index, completion, description):
+        """
+        Records that a to-do list task was edited and moved
+
+        index: Position of the task before it is moved, int
+        new_index: Position of the task after it is moved, int
+        completion: Completion of the task, string
+        description: Description of the task, string
+        """
+        self._record('move_task', (index, new_index, completion, description))
+
+    def dirty(self):
+        """
+        Returns whether changes were made that are not written yet
+
+        return: boolean
+        """
+        with self._condition:
+            return bool(self._changes)
+
+    def take_error(self):
+        """
+        Returns the error of the last write that failed since last called, if any
+
+        return: StorageError, or None
+        """
+        with self._condition:
+            error = self._error
+            self._error = None
+
+        return error
+
+    def close(self):
+        """
+        Writes the changes not written yet, stops the worker thread, then closes the wrapped storage; raises the error of the last write that failed, if any
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        self._thread.join()
+
+        with self._storage_lock:
+            self._storage.close()
+
+        error = self.take_error()
+
+        if error is not None:
+            raise error
+
+    def _count_read(self):
+        """
+        Advances the counter of identifiers to the one of the wrapped storage after a read
+        """
+        self.next_id = max(self.next_id, self._storage.next_id)
+
+    def _record(self, name, arguments):
+        """
+        Records a change to be written by the worker thread
+
+        name: Name of the storage method writing the change, string
+        arguments: Arguments of the method, tuple
+        """
+        with self._condition:
+            if self._closed:
+                raise StorageError('unable to record change to closed storage.')
+
+            self._last_change = time.monotonic()
+
+            if not self._changes or self._failed:
+                self._first_change = self._last_change
+
+            self._changes.append((name, arguments))
+            self._failed = False
+            self._condition.notify()
+
+    def _run(self):
+        """
+        Writes the changes recorded, in bursts, until the storage is closed
+        """
+        while True:
+            with self._condition:
+                while (not self._changes or self._failed) and not self._closed:
+                    self._condition.wait()
+
+                # Coalesce the changes made until no change was made for the delay, or the maximum delay passed
+                while not self._closed:
+                    timeout = min(self._last_change + self._delay, self._first_change + self._maximum_delay) - time.monotonic()
+
+                    if timeout <= 0:
+                        break
+
+                    self._condition.wait(timeout)
+
+                changes = self._changes
+                self._changes = []
+
+                if not changes:
+                    return
+
+            # Writes not done yet, the changes themselves until they are coalesced
+            writes = changes
+
+            try:
+                with self._storage_lock:
+                    writes = self._coalesce(changes)
+
+                    while writes:
+                        name, arguments = writes[0]
+                        getattr(self._storage, name)(*arguments)
+                        del writes[0]
+
+                        # Later changes to storage that does not record changes start from what was last written
+                        if not self._storage.records_changes and name == 'write_schedule':
+                            self._events = {event.recurrence_id: event for event in arguments[0]}
+                        elif not self._storage.records_changes and name == 'write_tasks':
+                            self._tasks = arguments[0]
+            except StorageError as error:
+                with self._condition:
+                    self._error = error
+
+                    # Changes not written are kept, whatever the storage, ahead of the changes made since
+                    self._changes = writes + self._changes
+                    self._failed = True
+
+                    if self._closed:
+                        return
+
+    def _coalesce(self, changes):
+        """
+        Returns the writes of changes to the wrapped storage, replacing successive changes of the same event series by the last of them
+
+        changes: Changes in order, list of tuples, (name of the storage method, arguments)
+        return: Writes in order, list of tuples, (name of the storage method, arguments)
+        """
+        # Event series replaced in full, if any, and the latest change of each event series after it, None if removed
+        # {recurrence_id: Event or None, ... }
+        events = None
+        event_changes = {}
+
+        # Tasks replaced in full, if any, and the changes of tasks after it, in order
+        tasks = None
+        task_changes = []
+
+        for name, arguments in changes:
+            if name == 'write_schedule':
+                events = {event.recurrence_id: event for event in arguments[0]}
+                event_changes = {}
+            elif name == 'write_event':
+                event_changes[arguments[0].recurrence_id] = arguments[0]
+            elif name == 'remove_event':
+                event_changes[arguments[0]] = None
+            elif name == 'write_tasks':
+                tasks = arguments[0]
+                task_changes = []
+            else:
+                task_changes.append((name, arguments))
+
+        # Storage that does not record changes is written in full, starting from every event series and task last written or read
+        if not self._storage.records_changes:
+            if events is None and event_changes:
+                events = dict(self._events) if self._events is not None else {event.recurrence_id: event for event in self._storage.read_schedule()}
+
+            if tasks is None and task_changes:
+                tasks = self._tasks if self._tasks is not None else self._storage.read_tasks()
+
+        if events is not None:
+            for recurrence_id, event in event_changes.items():
+                if event is None:
+                    events.pop(recurrence_id, None)
+                else:
+                    events[recurrence_id] = event
+
+            writes = [('write_schedule', (list(events.values()),))]
+        else:
+            writes = [('write_event', (event,)) if event is not None else ('remove_event', (recurrence_id,)) for recurrence_id, event in event_changes.items()]
+
+        if tasks is not None:
+            tasks = list(tasks)
+
+            for name, arguments in task_changes:
+                if name == 'insert_task':
+                    tasks.insert(arguments[0], arguments[1:])
+                elif name == 'remove_task':
+                    del tasks[arguments[0]]
+                elif name == 'replace_task':
+                    tasks[arguments[0]] = arguments[1:]
+                elif name == 'move_task':
+                    del tasks[arguments[0]]
+                    tasks.insert(arguments[1], arguments[2:])
+
+            writes.append(('write_tasks', (tasks,)))
+        else:
+            writes.extend(task_changes)
+
+        return writes
+
+class StorageFiles:
+    """
+    Class for the files of the schedule and to-do list in a directory, shared by the GUI and the command line
+
+    Opens the storage of the backend chosen; new binary files and databases start with the contents of the text files
+    """
+    # Storage of the schedule and to-do list, either 'text' files, 'journaled' text files, 'binary' files, or an 'sqlite' database
+    BACKEND = 'journaled'
+
+    def __init__(self, file_location='', backend=None):
+        """
+        Initializes the StorageFiles class
+
+        file_location: Directory of the files, string
+        backend: Either the strings 'text', 'journaled', 'binary', or 'sqlite', or None for BACKEND
+        """
+        self._file_location = file_location
+        self._backend = backend or self.BACKEND
+
+        # Name of schedule and tasks files
+        self._schedule_file_name = 'schedule.txt'
+        self._to_do_list_file_name = 'tasks.txt'
+
+        # Changes made since the schedule and to-do list files were last written, replayed when they are read
+        self._schedule_journal_file_name = 'schedule_journal.txt'
+        self._to_do_list_journal_file_name = 'tasks_journal.txt'
+
+        # Offset of the first line of each day in the schedule file
+        self._schedule_index_file_name = 'schedule_index.bin'
+
+        # Name of binary schedule and tasks files, and of the database
+        self._schedule_binary_file_name = 'schedule.bin'
+        self._to_do_list_binary_file_name = 'tasks.bin'
+        self._database_file_name = 'hourglass.db'
+
+    def new(self):
+        """
+        Returns whether the storage of the backend does not exist yet and starts with the contents of the text files
+
+        return: boolean
+        """
+        if self._backend == 'binary':
+            return not os.path.exists(os.path.join(self._file_location, self._schedule_binary_file_name))
+        elif self._backend == 'sqlite':
+            return not os.path.exists(os.path.join(self._file_location, self._database_file_name))
+
+        return False
+
+    def open(self, backend=None):
+        """
+        Opens the storage of the schedule and to-do list
+
+        backend: Either the strings 'text', 'journaled', 'binary', or 'sqlite', or None for the backend chosen
+        return: Storage
+        """
+        backend = backend or self._backend
+
+        if backend == 'text':
+            return TextStorage(os.path.join(self._file_location, self._schedule_file_name), os.path.join(self._file_location, self._to_do_list_file_name), os.path.join(self._file_location, self._schedule_index_file_name))
+        elif backend == 'journaled':
+            return JournaledStorage(os.path.join(self._file_location, self._schedule_file_name), os.path.join(self._file_location, self._to_do_list_file_name), os.path.join(self._file_location, self._schedule_journal_file_name), os.path.join(self._file_location, self._to_do_list_journal_file_name), os.path.join(self._file_location, self._schedule_index_file_name))
+        elif backend == 'binary':
+            return BinaryStorage(os.path.join(self._file_location, self._schedule_binary_file_name), os.path.join(self._file_location, self._to_do_list_binary_file_name))
+        else:
+            return SQLiteStorage(os.path.join(self._file_location, self._database_file_name))
+
+    def read(self, storage, schedule, to_do, new, first_day=None, last_day=None):
+        """
+        Reads the schedule and to-do list from the storage of the backend; new storage is read from the text files, then written with every event series and task
+
+        storage: Storage of the backend, opened by open
+        schedule: ScheduleStore
+        to_do: TaskStore
+        new: Whether the storage was new before it was opened, boolean
+        first_day: First day of the range of days whose events are read, date ordinal, or None to read every event series, int
+        last_day: Day after the last day of the range, date ordinal, int
+        """
+        source = self.open('journaled') if new else storage
+
+        # Migrated schedules are written back to the storage they are read from; new storage is written with every event series
+        if new:
+            schedule.read(source)
+        else:
+            schedule.read(source, first_day, last_day)
+
+        to_do.read(source)
+
+        # Write the contents of the text files into new storage
+        if new:
+            storage.write_schedule(schedule.series())
+            storage.write_tasks(to_do.tasks())
@@ -0,0 +1,90 @@
+# Libraries
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli import CommandLine
+
+class CommandLineTest(unittest.TestCase):
+    """
+    Tests for the command line interface
+    """
+    def setUp(self):
+        """
+        Creates a command line using files in a temporary directory
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        self._command_line = CommandLine(self._directory.name)
+
+    def _run(self, *arguments):
+        """
+        Runs a command, returning its exit status and output
+
+        arguments: Command line arguments, strings
+        return: Tuple, (exit status, output)
+        """
+        stdout = io.StringIO()
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            try:
+                status = self._command_line.run(list(arguments), stdout=stdout)
+            except SystemExit as exit:
+                status = exit.code
+
+        return (status, stdout.getvalue())
+
+    def test_amount_boundary(self):
+        """
+        Series of up to 999 occurrences are added, and larger amounts are rejected without changing the schedule
+        """
+        self.assertEqual(self._run('add', '2024-05-06', '09:30', '01:00', 'standup', '--frequency', 'daily', '--amount', '999')[0], 0)
+        self.assertEqual(self._run('add', '2024-05-06', '10:30', '01:00', 'review', '--frequency', 'daily', '--amount', '1000')[0], 2)
+
+        status, output = self._run('list')
+        self.assertEqual(status, 0)
+        self.assertIn('daily x999', output)
+        self.assertNotIn('review', output)
+
+    def test_until_before_date(self):
+        """
+        Series ending before their first occurrence are rejected without changing the schedule
+        """
+        self.assertEqual(self._run('add', '2024-05-06', '09:30', '01:00', 'standup', '--frequency', 'daily', '--amount', '0', '--until', '2024-05-05')[0], 1)
+        self.assertEqual(self._run('add', '2024-05-06', '09:30', '01:00', 'review', '--frequency', 'monthly', '--amount', '0', '--until', '2024-05-06')[0], 0)
+        self.assertEqual(self._run('add', '2024-05-06', '09:30', '01:00', 'report', '--frequency', 'monthly', '--month-day', 'last_day', '--amount', '0', '--until', '2024-05-30')[0], 1)
+
+        output = self._run('list')[1]
+        self.assertIn('review', output)
+        self.assertNotIn('standup', output)
+        self.assertNotIn('report', output)
+
+    def test_storage_backend(self):
+        """
+        The command line opens the storage the GUI opens, new binary files and databases starting with the contents of the text files
+        """
+        self.assertEqual(self._run('add', '2024-05-06', '09:30', '01:00', 'standup')[0], 0)
+
+        for backend, file_name in (('binary', 'schedule.bin'), ('sqlite', 'hourglass.db')):
+            self._command_line = CommandLine(self._directory.name, backend)
+            self.assertEqual(self._run('add', '2024-05-07', '09:30', '01:00', backend)[0], 0)
+            self.assertTrue(os.path.exists(os.path.join(self._directory.name, file_name)))
+
+            output = self._run('list')[1]
+            self.assertIn('standup', output)
+            self.assertIn(backend, output)
+
+        # Changes to the binary files and database are not made to the text files
+        self._command_line = CommandLine(self._directory.name)
+        output = self._run('list')[1]
+        self.assertIn('standup', output)
+        self.assertNotIn('binary', output)
+        self.assertNotIn('sqlite', output)
+
+if __name__ == '__main__':
+    unittest.main()
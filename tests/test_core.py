@@ -0,0 +1,194 @@
+# Libraries
+import os
+import sys
+import random
+import datetime
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ScheduleStore, IntervalIndex
+from storage import Event, JournaledStorage
+
+class ScheduleStoreTest(unittest.TestCase):
+    """
+    Tests for the schedule
+    """
+    def setUp(self):
+        """
+        Creates an empty schedule, starting on a Monday
+        """
+        self._schedule = ScheduleStore()
+        self._monday = datetime.date(2024, 5, 6).toordinal()
+
+    def _days(self, ordinals):
+        """
+        Returns days relative to the first day of the tests
+
+        ordinals: Days, iterable of date ordinals
+        return: Numbers of days after the first day, list of ints
+        """
+        return [ordinal - self._monday for ordinal in ordinals]
+
+    def test_expansion(self):
+        """
+        Series occur every interval of their frequency, for their number of occurrences, within the range asked for
+        """
+        daily = self._schedule.add(self._monday, 540, 30, 0, 'daily', frequency='daily', amount=5)
+        weekly = self._schedule.add(self._monday, 600, 30, 0, 'weekly', frequency='weekly', amount=3, interval=2)
+        unlimited = self._schedule.add(self._monday, 660, 30, 0, 'unlimited', frequency='daily', amount=0, interval=3)
+
+        self.assertEqual(self._days(self._schedule.occurrences(daily, self._monday, self._monday + 100)), [0, 1, 2, 3, 4])
+        self.assertEqual(self._days(self._schedule.occurrences(daily, self._monday + 2, self._monday + 4)), [2, 3])
+        self.assertEqual(self._days(self._schedule.occurrences(weekly, self._monday, self._monday + 100)), [0, 14, 28])
+        self.assertEqual(self._days(self._schedule.occurrences(unlimited, self._monday + 1000, self._monday + 1010)), [1002, 1005, 1008])
+
+    def test_window(self):
+        """
+        Windows hold the occurrences of each day, by series
+        """
+        daily = self._schedule.add(self._monday, 540, 30, 0, 'daily', frequency='daily', amount=3)
+        single = self._schedule.add(self._monday + 1, 600, 30, 0, 'single')
+        window = self._schedule.window(self._monday, 7)
+
+        self.assertEqual(sorted(self._days(window)), [0, 1, 2])
+        self.assertEqual(set(window[self._monday + 1]), {daily.recurrence_id, single.recurrence_id})
+
+        # Cached windows follow changes of the schedule
+        self._schedule.remove(single.recurrence_id)
+        self.assertEqual(set(self._schedule.window(self._monday, 7)[self._monday + 1]), {daily.recurrence_id})
+
+    def test_exceptions(self):
+        """
+        Excluded occurrences are skipped, and series without occurrences remaining are removed
+        """
+        series = self._schedule.add(self._monday, 540, 30, 0, 'daily', frequency='daily', amount=3)
+        self._schedule.exclude(series.recurrence_id, self._monday + 1)
+
+        series = self._schedule.get(series.recurrence_id)
+        self.assertEqual(self._days(self._schedule.occurrences(series, self._monday, self._monday + 7)), [0, 2])
+        self.assertNotIn(self._monday + 1, self._schedule.window(self._monday, 7))
+
+        self._schedule.exclude(series.recurrence_id, self._monday)
+        self._schedule.exclude(series.recurrence_id, self._monday + 2)
+        self.assertIsNone(self._schedule.get(series.recurrence_id))
+
+    def test_exceptions_of_unlimited_series(self):
+        """
+        Series without an end are kept whatever their exceptions
+        """
+        series = self._schedule.add(self._monday, 540, 30, 0, 'weekly', frequency='weekly', amount=0)
+        self._schedule.exclude(series.recurrence_id, self._monday)
+
+        series = self._schedule.get(series.recurrence_id)
+        self.assertEqual(self._days(self._schedule.occurrences(series, self._monday, self._monday + 15)), [7, 14])
+
+class WindowLoadingTest(unittest.TestCase):
+    """
+    Tests for schedules reading the events of a range of days, then the other days as they are queried
+    """
+    def setUp(self):
+        """
+        Writes a schedule with a journal of changes in a temporary directory
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        self._monday = datetime.date(2024, 5, 6).toordinal()
+
+        storage = self._storage()
+        storage.write_schedule([Event('1', self._monday - 98, 540, 30, 0, 'series', frequency='weekly', amount=0), Event('2', self._monday + 1, 600, 30, 0, 'this week'), Event('3', self._monday + 63, 600, 30, 0, 'later')])
+        storage.write_event(Event('4', self._monday + 2, 660, 30, 0, 'journaled'))
+        storage.remove_event('3')
+        storage.write_event(Event('5', self._monday - 60, 660, 30, 0, 'earlier'))
+
+    def _storage(self):
+        """
+        Returns a storage of the files in the temporary directory
+
+        return: JournaledStorage
+        """
+        location = self._directory.name
+        return JournaledStorage(os.path.join(location, 'schedule.txt'), os.path.join(location, 'tasks.txt'), os.path.join(location, 'schedule_journal.txt'), os.path.join(location, 'tasks_journal.txt'), os.path.join(location, 'schedule_index.bin'))
+
+    def test_lazy_loading(self):
+        """
+        Events of days not read are read once queried, including the changes in the journal
+        """
+        schedule = ScheduleStore()
+        schedule.read(self._storage(), self._monday, self._monday + 7)
+
+        self.assertIsNotNone(schedule.get('1'))
+        self.assertIsNotNone(schedule.get('4'))
+        self.assertIsNone(schedule.get('5'))
+
+        self.assertIn('5', schedule.window(self._monday - 60, 1).get(self._monday - 60, {}))
+        self.assertEqual(schedule.window(self._monday + 63, 1).get(self._monday + 63, {}).keys(), {'1'})
+
+    def test_series(self):
+        """
+        Every event series is read once asked for, without writing the journal into the schedule file
+        """
+        with open(os.path.join(self._directory.name, 'schedule.txt')) as opened_file:
+            contents = opened_file.read()
+
+        schedule = ScheduleStore()
+        schedule.read(self._storage(), self._monday, self._monday + 7)
+        schedule.remove('2')
+
+        self.assertEqual(sorted(event.recurrence_id for event in schedule.series()), ['1', '4', '5'])
+
+        with open(os.path.join(self._directory.name, 'schedule.txt')) as opened_file:
+            self.assertEqual(opened_file.read(), contents)
+
+class IntervalIndexTest(unittest.TestCase):
+    """
+    Tests for the interval index of the schedule
+    """
+    def test_overlapping(self):
+        """
+        Intervals overlap a range when they start before its end and end after its start
+        """
+        index = IntervalIndex()
+        index.add('a', 0, 10)
+        index.add('b', 10, 20)
+        index.add('c', 5, 1000)
+        index.add('d', 30, None)
+
+        self.assertEqual(sorted(index.overlapping(0, 10)), ['a', 'c'])
+        self.assertEqual(sorted(index.overlapping(9, 11)), ['a', 'b', 'c'])
+        self.assertEqual(sorted(index.overlapping(20, 30)), ['c'])
+        self.assertEqual(sorted(index.overlapping(999, 2000)), ['c', 'd'])
+        self.assertEqual(sorted(index.overlapping(1000, 2000)), ['d'])
+
+        index.remove('c')
+        index.remove('d')
+        index.remove('unknown')
+        self.assertEqual(sorted(index.overlapping(0, 2000)), ['a', 'b'])
+
+    def test_overlapping_matches_scan(self):
+        """
+        Queries find the same intervals as a scan of every interval
+        """
+        generator = random.Random(0)
+        index = IntervalIndex()
+        intervals = {}
+
+        for i in range(500):
+            start = generator.randrange(10000)
+            end = start + generator.choice([1, 2, 50, 1000, 5000]) if i % 50 else None
+            intervals[str(i)] = (start, end)
+            index.add(str(i), start, end)
+
+        for item_id in generator.sample(sorted(intervals), 100):
+            del intervals[item_id]
+            index.remove(item_id)
+
+        for _ in range(200):
+            start = generator.randrange(-100, 11000)
+            end = start + generator.randrange(1, 2000)
+            expected = sorted(item_id for item_id, (item_start, item_end) in intervals.items() if item_start < end and (item_end is None or item_end > start))
+            self.assertEqual(sorted(index.overlapping(start, end)), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# Libraries
+import io
+import os
+import sys
+import datetime
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ical import ICalendar
+from core import ScheduleStore, TaskStore
+
+class ICalendarTest(unittest.TestCase):
+    """
+    Tests for iCalendar files
+    """
+    def _import(self, start, rule):
+        """
+        Imports a calendar of one recurring event
+
+        start: DTSTART value, string
+        rule: RRULE value, string
+        return: Tuple, (ScheduleStore, imported event series, Event)
+        """
+        lines = ['BEGIN:VCALENDAR', 'BEGIN:VEVENT', 'UID:1', 'DTSTART:' + start, 'DTEND:' + start[:9] + '103000', 'RRULE:' + rule, 'SUMMARY:event', 'END:VEVENT', 'END:VCALENDAR']
+        schedule = ScheduleStore()
+        ICalendar().import_into(lines, schedule, TaskStore())
+
+        return (schedule, schedule.series()[0])
+
+    def _dates(self, schedule, event):
+        """
+        Returns the days on which an event series occurs
+
+        schedule: ScheduleStore
+        event: Event series, Event
+        return: Dates, list of strings, yyyy-mm-dd
+        """
+        return [datetime.date.fromordinal(ordinal).isoformat() for ordinal in schedule.occurrences(event, 1, datetime.date.max.toordinal() + 1)]
+
+    def _round_trip(self, schedule):
+        """
+        Exports a schedule and imports it again
+
+        schedule: ScheduleStore
+        return: Tuple, (ScheduleStore, imported event series, Event)
+        """
+        exported = io.StringIO()
+        ICalendar().write(exported, schedule.series(), [])
+        imported = ScheduleStore()
+        ICalendar().import_into(exported.getvalue().splitlines(), imported, TaskStore())
+
+        return (imported, imported.series()[0])
+
+    def test_count_of_monthly_date_skipping_months(self):
+        """
+        COUNT counts occurrences of rules on the 31st, rather than months
+        """
+        schedule, event = self._import('20240131T093000', 'FREQ=MONTHLY;COUNT=6')
+        expected = ['2024-01-31', '2024-03-31', '2024-05-31', '2024-07-31', '2024-08-31', '2024-10-31']
+        self.assertEqual(self._dates(schedule, event), expected)
+        self.assertEqual(self._dates(*self._round_trip(schedule)), expected)
+
+    def test_count_of_fifth_weekday(self):
+        """
+        COUNT counts occurrences of rules on the fifth weekday of the month, rather than months
+        """
+        schedule, event = self._import('20240129T093000', 'FREQ=MONTHLY;BYDAY=5MO;COUNT=4')
+        expected = ['2024-01-29', '2024-04-29', '2024-07-29', '2024-09-30']
+        self.assertEqual(event.month_day, 'weekday')
+        self.assertEqual(self._dates(schedule, event), expected)
+        self.assertEqual(self._dates(*self._round_trip(schedule)), expected)
+
+    def test_truncated(self):
+        """
+        Events longer than one day are shortened to one day and counted
+        """
+        lines = ['BEGIN:VCALENDAR',
+                 'BEGIN:VEVENT', 'UID:1', 'DTSTART:20240101T090000', 'DTEND:20240103T090000', 'SUMMARY:long', 'END:VEVENT',
+                 'BEGIN:VEVENT', 'UID:2', 'DTSTART;VALUE=DATE:20240105', 'DURATION:P1D', 'SUMMARY:day', 'END:VEVENT',
+                 'END:VCALENDAR']
+        schedule = ScheduleStore()
+        calendar = ICalendar()
+        calendar.import_into(lines, schedule, TaskStore())
+
+        self.assertEqual(calendar.truncated, 1)
+        self.assertEqual(sorted((event.description, event.duration) for event in schedule.series()), [('day', 24 * 60), ('long', 24 * 60)])
+
+        calendar.import_into(lines[:1] + lines[8:], ScheduleStore(), TaskStore())
+        self.assertEqual(calendar.truncated, 0)
+
+if __name__ == '__main__':
+    unittest.main()
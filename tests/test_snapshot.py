@@ -0,0 +1,134 @@
+# Libraries
+import datetime
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot import Snapshots
+from storage import Event
+
+class SnapshotsTest(unittest.TestCase):
+    """
+    Tests for the retention of snapshots
+    """
+    def setUp(self):
+        """
+        Creates a temporary directory for the snapshots
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def _snapshots(self, recent=0, daily=0, weekly=0, monthly=0):
+        """
+        Returns snapshots kept in the temporary directory
+
+        recent, daily, weekly, monthly: Retention policy, ints
+        return: Snapshots
+        """
+        return Snapshots(os.path.join(self._directory.name, 'snapshots'), recent, daily, weekly, monthly)
+
+    def _take(self, snapshots, *times):
+        """
+        Takes a snapshot at each time, of a schedule describing the time
+
+        snapshots: Snapshots
+        times: Times of the snapshots, datetime.datetime
+        return: Names of the snapshots, list of strings
+        """
+        return [snapshots.take([Event('1', 738000, 60, 30, 0x808080, str(now))], [('0', str(now))], now) for now in times]
+
+    def _objects(self, snapshots):
+        """
+        Returns the hashes of the chunks stored
+
+        snapshots: Snapshots
+        return: Set of strings
+        """
+        location = os.path.join(snapshots._directory, 'objects')
+
+        return {prefix + rest for prefix in os.listdir(location) for rest in os.listdir(os.path.join(location, prefix))}
+
+    def test_recent(self):
+        """
+        The most recent snapshots are kept
+        """
+        snapshots = self._snapshots(recent=2)
+        names = self._take(snapshots, *(datetime.datetime(2026, 10, 1, hour) for hour in range(4)))
+
+        self.assertEqual(snapshots.names(), names[2:])
+
+    def test_same_second(self):
+        """
+        Snapshots taken within the same second are numbered
+        """
+        snapshots = self._snapshots(recent=3)
+        now = datetime.datetime(2026, 10, 1, 12)
+
+        self.assertEqual(self._take(snapshots, now, now, now), ['20261001-120000', '20261001-120000-2', '20261001-120000-3'])
+
+    def test_daily(self):
+        """
+        The last snapshot of each of the most recent days is kept
+        """
+        snapshots = self._snapshots(recent=1, daily=2)
+        self._take(snapshots, datetime.datetime(2026, 10, 1, 10), datetime.datetime(2026, 10, 1, 12), datetime.datetime(2026, 10, 2, 9), datetime.datetime(2026, 10, 2, 18), datetime.datetime(2026, 10, 3, 8))
+
+        self.assertEqual(snapshots.names(), ['20261002-180000', '20261003-080000'])
+
+    def test_weekly(self):
+        """
+        The last snapshot of each of the most recent weeks is kept, weeks starting on Monday
+        """
+        snapshots = self._snapshots(weekly=2)
+        self._take(snapshots, datetime.datetime(2026, 9, 28), datetime.datetime(2026, 10, 5), datetime.datetime(2026, 10, 11), datetime.datetime(2026, 10, 13))
+
+        self.assertEqual(snapshots.names(), ['20261011-000000', '20261013-000000'])
+
+    def test_monthly(self):
+        """
+        The last snapshot of each of the most recent months is kept
+        """
+        snapshots = self._snapshots(monthly=2)
+        self._take(snapshots, datetime.datetime(2026, 1, 5), datetime.datetime(2026, 1, 20), datetime.datetime(2026, 2, 3), datetime.datetime(2026, 2, 28), datetime.datetime(2026, 3, 1))
+
+        self.assertEqual(snapshots.names(), ['20260228-000000', '20260301-000000'])
+
+    def test_prune_chunks(self):
+        """
+        Chunks of removed snapshots are removed unless a kept snapshot uses them, and kept snapshots still read
+        """
+        snapshots = self._snapshots(recent=2)
+        first, second = self._take(snapshots, datetime.datetime(2026, 10, 1, 10), datetime.datetime(2026, 10, 1, 11))
+        first_chunks = snapshots.open(first).chunks()
+
+        # A snapshot of the same schedule and to-do list shares its chunks with the second one
+        now = datetime.datetime(2026, 10, 1, 11)
+        third = snapshots.take([Event('1', 738000, 60, 30, 0x808080, str(now))], [('0', str(now))], datetime.datetime(2026, 10, 1, 12))
+
+        self.assertEqual(snapshots.names(), [second, third])
+        self.assertEqual(snapshots.open(second).chunks(), snapshots.open(third).chunks())
+        self.assertEqual(self._objects(snapshots), snapshots.open(third).chunks())
+        self.assertFalse(first_chunks & self._objects(snapshots))
+
+        for name in (second, third):
+            storage = snapshots.open(name)
+            self.assertEqual([event.description for event in storage.read_schedule()], [str(now)])
+            self.assertEqual(storage.read_tasks(), [('0', str(now))])
+
+    def test_prune_nothing(self):
+        """
+        Pruning keeps every snapshot and chunk the policy keeps
+        """
+        snapshots = self._snapshots(recent=5)
+        names = self._take(snapshots, datetime.datetime(2026, 10, 1, 10), datetime.datetime(2026, 10, 2, 10))
+        objects = self._objects(snapshots)
+
+        self.assertEqual(snapshots.prune(), [])
+        self.assertEqual(snapshots.names(), names)
+        self.assertEqual(self._objects(snapshots), objects)
+
+if __name__ == '__main__':
+    unittest.main()
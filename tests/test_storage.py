@@ -0,0 +1,514 @@
+# Libraries
+import os
+import sys
+import time
+import tempfile
+import unittest
+import threading
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import Event, StorageError, TextStorage, JournaledStorage, BinaryStorage, SQLiteStorage, AutosaveStorage
+
+def schedule():
+    """
+    Returns event series using every field stored
+
+    return: Event series, list of Event
+    """
+    return [Event('1', 738000, 540, 60, 0x123456, 'daily ünïcode', frequency='daily', amount=10, interval=2, exceptions={738002, 738004}),
+            Event('2', 738031, 0, 0, 0xffffff, 'monthly', frequency='monthly', amount=0, until=739000, month_day='last_day'),
+            Event('3', 737850, 1439, 1, 0x000000, 'yearly', frequency='yearly', amount=0, leap_years=False),
+            Event('4', 738002, 600, 30, 0x808080, 'replacing', series_id='1'),
+            Event('5', 738100, 720, 45, 0xabcdef, '')]
+
+def fields(event):
+    """
+    Returns the fields of an event series, for comparisons
+
+    event: Event series, Event
+    return: tuple
+    """
+    return (event.recurrence_id, event.date, event.start, event.duration, event.color, event.description, event.frequency, event.amount, event.interval, event.until, event.leap_years or event.frequency != 'yearly', event.month_day, sorted(event.exceptions), event.series_id)
+
+TASKS = [('0', 'first task'), ('1', 'second task ünïcode'), ('0', '')]
+
+class JournaledStorageTest(unittest.TestCase):
+    """
+    Tests for the schedule and to-do list stored as text files with a journal
+    """
+    def setUp(self):
+        """
+        Creates the files of the storage in a temporary directory
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def _storage(self):
+        """
+        Returns a storage of the files in the temporary directory
+
+        return: JournaledStorage
+        """
+        location = self._directory.name
+        return JournaledStorage(os.path.join(location, 'schedule.txt'), os.path.join(location, 'tasks.txt'), os.path.join(location, 'schedule_journal.txt'), os.path.join(location, 'tasks_journal.txt'), os.path.join(location, 'schedule_index.bin'))
+
+    def test_append_after_interrupted_record(self):
+        """
+        A record appended after a record interrupted while being appended is read back once the journal is read for a range of days
+        """
+        storage = self._storage()
+        storage.write_schedule([Event('1', 738000, 60, 30, 0x808080, 'first')])
+        storage.write_event(Event('2', 738001, 60, 30, 0x808080, 'second'))
+
+        # Record cut off while being appended
+        with open(os.path.join(self._directory.name, 'schedule_journal.txt'), 'a') as opened_file:
+            opened_file.write('+' + storage._format_event(Event('3', 738002, 60, 30, 0x808080, 'third'))[:30])
+
+        storage = self._storage()
+        self.assertTrue(storage.reads_windows())
+        storage.write_event(Event('4', 738003, 60, 30, 0x808080, 'fourth'))
+
+        events = self._storage().read_schedule()
+        self.assertEqual(sorted(event.description for event in events), ['first', 'fourth', 'second'])
+
+    def test_journal_replay(self):
+        """
+        Changes recorded in the journals are replayed once read, then written into the files
+        """
+        storage = self._storage()
+        storage.write_schedule([Event('1', 738000, 60, 30, 0x808080, 'first'), Event('2', 738001, 60, 30, 0x808080, 'second', frequency='daily', amount=3)])
+        storage.write_tasks([('0', 'first task'), ('0', 'second task')])
+
+        edited = Event('2', 738001, 90, 30, 0x808080, 'edited', frequency='daily', amount=3)
+        storage.write_event(edited)
+        storage.write_event(Event('3', 738002, 60, 30, 0x808080, 'third'))
+        storage.remove_event('1')
+        storage.insert_task(0, '0', 'new task')
+        storage.replace_task(1, '1', 'first task')
+        storage.move_task(2, 0, '0', 'second task')
+        storage.remove_task(2)
+
+        storage = self._storage()
+        events = sorted(storage.read_schedule(), key=lambda event: event.recurrence_id)
+        self.assertEqual([(event.recurrence_id, event.start, event.description) for event in events], [('2', 90, 'edited'), ('3', 60, 'third')])
+        self.assertEqual(storage.read_tasks(), [('0', 'second task'), ('0', 'new task')])
+
+        # Replayed journals are written into the files and started again
+        with open(os.path.join(self._directory.name, 'schedule_journal.txt')) as opened_file:
+            self.assertEqual(len(opened_file.readlines()), 1)
+
+        self.assertEqual(len(self._storage().read_schedule()), 2)
+
+    def test_journal_of_other_contents(self):
+        """
+        Journals applying to other contents of the file than those read are ignored
+        """
+        storage = self._storage()
+        storage.write_schedule([Event('1', 738000, 60, 30, 0x808080, 'first')])
+        storage.write_event(Event('2', 738001, 60, 30, 0x808080, 'second'))
+
+        # Schedule file written without resetting its journal
+        TextStorage(os.path.join(self._directory.name, 'schedule.txt'), os.path.join(self._directory.name, 'tasks.txt')).write_schedule([Event('1', 738000, 60, 30, 0x808080, 'rewritten')])
+
+        self.assertEqual([event.description for event in self._storage().read_schedule()], ['rewritten'])
+
+    def test_interrupted_write(self):
+        """
+        Files keep their previous contents when writing them is interrupted
+        """
+        storage = self._storage()
+        storage.write_schedule([Event('1', 738000, 60, 30, 0x808080, 'first')])
+
+        with mock.patch('os.replace', side_effect=OSError('interrupted')):
+            with self.assertRaises(StorageError):
+                storage.write_schedule([Event('2', 738001, 60, 30, 0x808080, 'second')])
+
+        self.assertEqual([event.description for event in self._storage().read_schedule()], ['first'])
+
+class TextStorageTest(unittest.TestCase):
+    """
+    Tests for the schedule and to-do list stored as text files
+    """
+    def setUp(self):
+        """
+        Creates the files of the storage in a temporary directory
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def _storage(self, indexed=True):
+        """
+        Returns a storage of the files in the temporary directory
+
+        indexed: Whether the schedule file is indexed, boolean
+        return: TextStorage
+        """
+        location = self._directory.name
+        return TextStorage(os.path.join(location, 'schedule.txt'), os.path.join(location, 'tasks.txt'), os.path.join(location, 'schedule_index.bin') if indexed else None)
+
+    def test_round_trip(self):
+        """
+        Event series and tasks written are read back unchanged
+        """
+        storage = self._storage()
+        storage.write_schedule(schedule())
+        storage.write_tasks(TASKS)
+
+        storage = self._storage()
+        self.assertEqual(sorted(fields(event) for event in storage.read_schedule()), sorted(fields(event) for event in schedule()))
+        self.assertEqual(storage.read_tasks(), TASKS)
+        self.assertFalse(storage.needs_migration)
+        self.assertEqual(storage.next_id, 6)
+
+    def test_windows(self):
+        """
+        Ranges of days read the recurring series and the other events of the range, with or without an index
+        """
+        self._storage().write_schedule(schedule())
+
+        for indexed in (True, False):
+            storage = self._storage(indexed)
+            self.assertTrue(storage.reads_windows())
+            self.assertEqual(sorted(event.recurrence_id for event in storage.read_series()), ['1', '2', '3'])
+            self.assertEqual([event.recurrence_id for event in storage.read_events(738002, 738100)], ['4'])
+            self.assertEqual([event.recurrence_id for event in storage.read_events(738002, 738101)], ['4', '5'])
+            self.assertEqual(storage.read_events(738003, 738100), [])
+
+    def test_stale_index(self):
+        """
+        Indexes of other contents of the schedule file than those read are not used
+        """
+        self._storage().write_schedule(schedule())
+        self.assertEqual([event.recurrence_id for event in self._storage().read_events(738100, 738101)], ['5'])
+
+        # Schedule file written without updating its index
+        self._storage(False).write_schedule(schedule()[:3] + [Event('6', 738100, 60, 30, 0x808080, 'unindexed'), Event('7', 738100, 90, 30, 0x808080, 'unindexed')])
+
+        self.assertEqual([event.recurrence_id for event in self._storage().read_events(738100, 738101)], ['6', '7'])
+
+class BinaryStorageTest(unittest.TestCase):
+    """
+    Tests for the schedule and to-do list stored as binary files
+    """
+    def setUp(self):
+        """
+        Creates the files of the storage in a temporary directory
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def _storage(self):
+        """
+        Returns a storage of the files in the temporary directory
+
+        return: BinaryStorage
+        """
+        return BinaryStorage(os.path.join(self._directory.name, 'schedule.bin'), os.path.join(self._directory.name, 'tasks.bin'))
+
+    def test_round_trip(self):
+        """
+        Event series and tasks written are read back unchanged, whatever their identifiers
+        """
+        renamed = [Event('8f14e45f-ceea-467f-a9e5-e1a6b2c3d4e5', 738000, 60, 30, 0x808080, 'uuid'), Event('custom', 738001, 60, 30, 0x808080, 'string')]
+
+        for events in (schedule(), schedule() + renamed):
+            storage = self._storage()
+            storage.write_schedule(events)
+            storage.write_tasks(TASKS)
+
+            storage = self._storage()
+            self.assertEqual(sorted(fields(event) for event in storage.read_schedule()), sorted(fields(event) for event in events))
+            self.assertEqual(storage.read_tasks(), TASKS)
+
+    def test_windows(self):
+        """
+        Ranges of days read the recurring series and the other events of the range
+        """
+        self._storage().write_schedule(schedule())
+        storage = self._storage()
+
+        self.assertTrue(storage.reads_windows())
+        self.assertEqual(sorted(fields(event) for event in storage.read_series()), sorted(fields(event) for event in schedule()[:3]))
+        self.assertEqual([fields(event) for event in storage.read_events(738002, 738100)], [fields(schedule()[3])])
+        self.assertEqual(storage.read_events(738003, 738100), [])
+        self.assertEqual(storage.next_id, 6)
+
+class SQLiteStorageTest(unittest.TestCase):
+    """
+    Tests for the schedule and to-do list stored in a SQLite database
+    """
+    def setUp(self):
+        """
+        Creates the database in a temporary directory
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        self._location = os.path.join(self._directory.name, 'hourglass.db')
+
+    def _storage(self):
+        """
+        Returns a storage of the database, closed once the test ends
+
+        return: SQLiteStorage
+        """
+        storage = SQLiteStorage(self._location)
+        self.addCleanup(storage.close)
+
+        return storage
+
+    def test_round_trip(self):
+        """
+        Event series and tasks written are read back unchanged, including changes recorded one at a time
+        """
+        storage = self._storage()
+        storage.write_schedule(schedule())
+        storage.write_tasks(TASKS)
+
+        edited = Event('5', 738101, 60, 15, 0x808080, 'edited')
+        storage.write_event(edited)
+        storage.remove_event('3')
+        storage.insert_task(1, '1', 'inserted')
+
+        expected = [fields(event) for event in schedule() if event.recurrence_id not in ('3', '5')] + [fields(edited)]
+        storage = self._storage()
+        self.assertEqual(sorted(fields(event) for event in storage.read_schedule()), sorted(expected))
+        self.assertEqual(storage.read_tasks(), [TASKS[0], ('1', 'inserted')] + TASKS[1:])
+
+    def test_windows(self):
+        """
+        Ranges of days read the recurring series and the other events of the range
+        """
+        storage = self._storage()
+        storage.write_schedule(schedule())
+        storage = self._storage()
+
+        self.assertTrue(storage.reads_windows())
+        self.assertEqual(sorted(event.recurrence_id for event in storage.read_series()), ['1', '2', '3'])
+        self.assertEqual([event.recurrence_id for event in storage.read_events(738002, 738100)], ['4'])
+        self.assertEqual(storage.next_id, 6)
+
+class FailingTextStorage(TextStorage):
+    """
+    Class for text files whose writes fail while asked to, counting the writes of the schedule
+    """
+    def __init__(self, *arguments):
+        """
+        Initializes the FailingTextStorage class
+
+        arguments: Arguments of TextStorage
+        """
+        super().__init__(*arguments)
+        self.failing = threading.Event()
+        self.writes = 0
+
+    def write_schedule(self, events):
+        """
+        Replaces all event series, unless failing
+
+        events: Event series, iterable of Event
+        """
+        if self.failing.is_set():
+            raise StorageError('unable to write to schedule file.')
+
+        self.writes = self.writes + 1
+        super().write_schedule(events)
+
+class FailingJournaledStorage(JournaledStorage):
+    """
+    Class for text files with journals whose appends fail while asked to
+    """
+    def __init__(self, *arguments):
+        """
+        Initializes the FailingJournaledStorage class
+
+        arguments: Arguments of JournaledStorage
+        """
+        super().__init__(*arguments)
+        self.failing = threading.Event()
+
+    def _journal_append(self, file_location, record, name):
+        """
+        Appends a record to a journal, unless failing
+
+        file_location: Location of the journal, string
+        record: Record, without line breaks, string
+        name: Name of the journaled file used in error messages, string
+        """
+        if self.failing.is_set():
+            raise StorageError('unable to record change to ' + name + '.')
+
+        super()._journal_append(file_location, record, name)
+
+class AutosaveStorageTest(unittest.TestCase):
+    """
+    Tests for storage whose changes are written by a worker thread
+    """
+    def setUp(self):
+        """
+        Creates the files of the storage in a temporary directory
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        location = self._directory.name
+        self._text = (os.path.join(location, 'schedule.txt'), os.path.join(location, 'tasks.txt'))
+        self._journaled = self._text + (os.path.join(location, 'schedule_journal.txt'), os.path.join(location, 'tasks_journal.txt'))
+
+    def _wait(self, storage):
+        """
+        Waits until the worker wrote the changes or failed to
+
+        storage: AutosaveStorage
+        """
+        for _ in range(200):
+            with storage._condition:
+                if storage._failed:
+                    return
+
+                waiting = bool(storage._changes)
+
+            # Changes taken by the worker are written once it releases the wrapped storage
+            if not waiting:
+                with storage._storage_lock:
+                    with storage._condition:
+                        if not storage._changes:
+                            return
+
+            time.sleep(0.01)
+
+    def _check_failure(self, wrapped):
+        """
+        Checks that changes whose write failed are written once writing succeeds again
+
+        wrapped: Storage whose writes fail while its failing event is set
+        """
+        wrapped.write_schedule([Event('1', 738000, 60, 30, 0x808080, 'first')])
+        wrapped.write_tasks([])
+        storage = AutosaveStorage(wrapped, delay=0.01, maximum_delay=0.05)
+
+        wrapped.failing.set()
+        storage.write_event(Event('2', 738001, 60, 30, 0x808080, 'second'))
+        storage.insert_task(0, '0', 'task')
+        self._wait(storage)
+
+        self.assertIsInstance(storage.take_error(), StorageError)
+        self.assertTrue(storage.dirty())
+
+        wrapped.failing.clear()
+        storage.remove_event('1')
+        storage.close()
+
+        self.assertIsNone(storage.take_error())
+        self.assertFalse(storage.dirty())
+        self.assertEqual([event.description for event in type(wrapped)(*self._storage_arguments(wrapped)).read_schedule()], ['second'])
+        self.assertEqual(type(wrapped)(*self._storage_arguments(wrapped)).read_tasks(), [('0', 'task')])
+
+    def _storage_arguments(self, wrapped):
+        """
+        Returns the arguments of a storage of the same files
+
+        wrapped: FailingTextStorage or FailingJournaledStorage
+        return: tuple
+        """
+        return self._journaled if isinstance(wrapped, JournaledStorage) else self._text
+
+    def test_failed_writes_of_full_storage(self):
+        """
+        Changes to storage written in full are kept until written
+        """
+        self._check_failure(FailingTextStorage(*self._text))
+
+    def test_coalescing(self):
+        """
+        Changes made within the delay are written at once, with only the last change of each event series
+        """
+        wrapped = FailingTextStorage(*self._text)
+        wrapped.write_schedule([])
+        wrapped.write_tasks([])
+        wrapped.writes = 0
+        storage = AutosaveStorage(wrapped, delay=10, maximum_delay=10)
+
+        storage.write_event(Event('1', 738000, 60, 30, 0x808080, 'first'))
+        storage.write_event(Event('1', 738000, 60, 30, 0x808080, 'renamed'))
+        storage.write_event(Event('2', 738001, 60, 30, 0x808080, 'second'))
+        storage.remove_event('2')
+        storage.insert_task(0, '0', 'first task')
+        storage.insert_task(1, '0', 'second task')
+        storage.move_task(1, 0, '1', 'second task')
+        storage.close()
+
+        self.assertEqual(wrapped.writes, 1)
+        self.assertEqual([(event.recurrence_id, event.description) for event in TextStorage(*self._text).read_schedule()], [('1', 'renamed')])
+        self.assertEqual(TextStorage(*self._text).read_tasks(), [('1', 'second task'), ('0', 'first task')])
+
+    def test_coalescing_of_journaled_storage(self):
+        """
+        Storage recording changes receives the last change of each event series and every task change
+        """
+        wrapped = JournaledStorage(*self._journaled)
+        wrapped.write_schedule([Event('1', 738000, 60, 30, 0x808080, 'first')])
+        wrapped.write_tasks([])
+        storage = AutosaveStorage(wrapped, delay=10, maximum_delay=10)
+
+        with mock.patch.object(wrapped, 'write_event', wraps=wrapped.write_event) as write_event:
+            storage.write_event(Event('2', 738001, 60, 30, 0x808080, 'second'))
+            storage.write_event(Event('2', 738001, 90, 30, 0x808080, 'moved'))
+            storage.remove_event('1')
+            storage.insert_task(0, '0', 'task')
+            storage.replace_task(0, '1', 'task')
+            storage.close()
+
+        self.assertEqual(write_event.call_count, 1)
+        reopened = JournaledStorage(*self._journaled)
+        self.assertEqual([(event.recurrence_id, event.start, event.description) for event in reopened.read_schedule()], [('2', 90, 'moved')])
+        self.assertEqual(reopened.read_tasks(), [('1', 'task')])
+
+    def test_failed_write_keeps_cache(self):
+        """
+        Event series kept to start later changes from are the ones last written, not the ones of a write that failed
+        """
+        wrapped = FailingTextStorage(*self._text)
+        wrapped.write_schedule([])
+        storage = AutosaveStorage(wrapped, delay=0.01, maximum_delay=0.05)
+
+        storage.write_event(Event('1', 738000, 60, 30, 0x808080, 'first'))
+        self._wait(storage)
+        self.assertEqual(sorted(storage._events), ['1'])
+
+        wrapped.failing.set()
+        storage.write_event(Event('2', 738001, 60, 30, 0x808080, 'second'))
+        self._wait(storage)
+
+        self.assertIsInstance(storage.take_error(), StorageError)
+        self.assertEqual(sorted(storage._events), ['1'])
+        self.assertEqual([event.recurrence_id for event in wrapped.read_schedule()], ['1'])
+
+        wrapped.failing.clear()
+        storage.close()
+
+        self.assertEqual(sorted(storage._events), ['1', '2'])
+        self.assertEqual(sorted(event.recurrence_id for event in TextStorage(*self._text).read_schedule()), ['1', '2'])
+
+    def test_failed_writes_of_journaled_storage(self):
+        """
+        Changes to storage recording changes are kept until written
+        """
+        self._check_failure(FailingJournaledStorage(*self._journaled))
+
+    def test_failed_write_on_close(self):
+        """
+        Closing raises the error of a write that failed, keeping the changes
+        """
+        wrapped = FailingTextStorage(*self._text)
+        storage = AutosaveStorage(wrapped, delay=10, maximum_delay=10)
+        wrapped.failing.set()
+        storage.write_event(Event('1', 738000, 60, 30, 0x808080, 'first'))
+
+        with self.assertRaises(StorageError):
+            storage.close()
+
+        self.assertTrue(storage.dirty())
+
+if __name__ == '__main__':
+    unittest.main()